@@ -0,0 +1,99 @@
+"""
+Excel reader backend benchmark.
+
+Builds synthetic ticket exports (a title block above the header, like the
+ticketing system's nightly files), reads each one with every available
+backend the way load_data does, and checks that all backends return the
+same frame. Run from the repository root:
+
+    python benchmarks/bench_excel_readers.py [--rows 2000 20000] [--repeat 3] [--json]
+"""
+import argparse
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from itautomationreports.data_loader import find_header_row  # noqa: E402
+from itautomationreports.readers import READER_BACKENDS, candidate_backends, open_workbook, read_excel  # noqa: E402
+
+
+def synthetic_export(rows, seed=0):
+    """An .xlsx export with `rows` tickets, fractional-second timestamps and open tickets."""
+    rng = np.random.default_rng(seed)
+    requested = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 300 * 86_400, rows), unit="s")
+    closed = pd.Series(requested + pd.to_timedelta(rng.exponential(3 * 86_400, rows), unit="s"))
+    closed[rng.random(rows) < 0.1] = pd.NaT
+    data = pd.DataFrame({
+        "#": np.arange(rows) + 1000,
+        "Request time": requested,
+        "Close time": closed,
+        "Due Date": requested + pd.Timedelta(days=2),
+        "SLA": rng.choice(["Met", "Fail"], rows),
+        "Category": rng.choice(["Network", "Email", "Access", "Hardware"], rows),
+        "Priority": rng.choice(["High", "Medium", "Low"], rows),
+        "Status": rng.choice(["Open", "Closed", "In Progress", "Resolved"], rows),
+        "Title": rng.choice(["VPN not working", "Outlook crash", "Password reset", "Laptop slow"], rows),
+        "Request user": rng.choice([f"user{i}" for i in range(50)], rows),
+    })
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        pd.DataFrame([["Report generated"], [None]]).to_excel(writer, sheet_name="Data", header=False, index=False)
+        data.to_excel(writer, sheet_name="Data", startrow=2, index=False)
+    return buffer.getvalue()
+
+
+def read_with(backend, data):
+    """Opens and reads the export's data sheet with one backend (header detection included)."""
+    xl = open_workbook(io.BytesIO(data), backend=backend)
+    raw = read_excel(xl, sheet_name="Data", header=None)
+    header_row = find_header_row(raw)
+    frame = raw.iloc[header_row + 1:].reset_index(drop=True)
+    frame.columns = raw.iloc[header_row].astype(str)
+    return frame
+
+
+def measure(backend, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frame = read_with(backend, data)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[2_000, 20_000], help="tickets per synthetic export")
+    parser.add_argument("--repeat", type=int, default=3, help="reads per backend (median is reported)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    args = parser.parse_args()
+
+    backends = [name for name, backend in READER_BACKENDS.items() if ".xlsx" in backend.extensions and backend.available()]
+    for rows in args.rows:
+        data = synthetic_export(rows)
+        chosen = candidate_backends(io.BytesIO(data))[0].name
+        reference = None
+        for name in backends:
+            seconds, frame = measure(name, data, args.repeat)
+            if reference is None:
+                reference = frame
+            identical = frame.equals(reference)
+            if args.json:
+                print(json.dumps({"rows": rows, "backend": name, "seconds": round(seconds, 4),
+                                  "identical": identical, "auto_selected": name == chosen}))
+            else:
+                marker = " (auto)" if name == chosen else ""
+                print(f"{rows:>8} rows  {name + marker:<26} {seconds * 1000:9.1f} ms   identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Cold-start import benchmark.
+
+Every measurement runs in a fresh interpreter so nothing is served from
+sys.modules. Run from the repository root:
+
+    python benchmarks/bench_import_time.py [--repeat 5] [--json]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# (label, import statement) pairs measured in a fresh interpreter each
+TARGETS = [
+    ("streamlit", "import streamlit"),
+    ("pandas", "import pandas"),
+    ("matplotlib.pyplot", "import matplotlib.pyplot"),
+    ("seaborn", "import seaborn"),
+    ("plotly.express", "import plotly.express"),
+    ("visualization", "import src.itautomationreports.visualization"),
+    ("main (app cold start)", "import main"),
+]
+
+HEAVY_MODULES = ["matplotlib.pyplot", "seaborn", "plotly.express"]
+
+_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(statement, repeat):
+    """Returns (median seconds, heavy modules loaded) for `statement` over `repeat` fresh interpreters."""
+    timings = []
+    loaded = ""
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _SNIPPET.format(statement=statement, heavy=HEAVY_MODULES)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip().splitlines()[-1]
+        elapsed, loaded = output.split(" ", 1) if " " in output else (output, "")
+        timings.append(float(elapsed))
+    return statistics.median(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per target (median is reported)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    args = parser.parse_args()
+
+    for label, statement in TARGETS:
+        seconds, loaded = measure(statement, args.repeat)
+        if args.json:
+            print(json.dumps({"target": label, "seconds": round(seconds, 4), "heavy_modules_loaded": loaded}))
+        else:
+            print(f"{label:<24} {seconds * 1000:8.1f} ms   heavy modules loaded: {loaded or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Matplotlib figure soak test.
+
+Renders the dashboard's matplotlib charts through st.pyplot (Streamlit bare
+mode) for many reruns and samples resident memory, live Figure objects
+and pyplot-registered figures along the way. With the managed figure layer
+all three stay flat; --unmanaged swaps in the old plt.subplots + st.pyplot
+pattern for comparison. Run from the repository root:
+
+    python benchmarks/soak_figures.py [--reruns 1000] [--every 100] [--unmanaged] [--json]
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import matplotlib  # noqa: E402
+
+matplotlib.use("Agg")
+import matplotlib.figure  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+import streamlit as st  # noqa: E402
+
+from itautomationreports import chart_renderers, visualization  # noqa: E402
+from itautomationreports.figures import get_figure_pool  # noqa: E402
+
+
+def synthetic_tickets(rows=2_000, seed=0):
+    """A cleaned ticket frame with the columns the soaked charts need."""
+    rng = np.random.default_rng(seed)
+    requested = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 300 * 86_400, rows), unit="s")
+    closed = pd.Series(requested + pd.to_timedelta(rng.exponential(3 * 86_400, rows), unit="s"))
+    closed[rng.random(rows) < 0.1] = pd.NaT
+    return pd.DataFrame({
+        "Request time": requested,
+        "Close time": closed,
+        "Category": rng.choice(["Network", "Email", "Access", "Hardware"], rows),
+        "Priority": rng.choice(["High", "Medium", "Low"], rows),
+        "Status": rng.choice(["Open", "Closed", "In Progress", "Resolved"], rows),
+        "Request user": rng.choice([f"user{i}" for i in range(50)], rows),
+        "Source": "soak.xlsx",
+    })
+
+
+# One chart per rerun, cycling through these
+CHARTS = [
+    ("ticket_trends", lambda df: visualization.plot_ticket_trends(df, "Week")),
+    ("time_of_day_heatmap", lambda df: visualization.plot_time_of_day_heatmap(df)),
+    ("requests_by_status", lambda df: visualization.plot_requests_by_status(df)),
+    ("requests_by_priority", lambda df: visualization.plot_requests_by_priority(df)),
+    ("user_request_analysis", lambda df: visualization.plot_user_request_analysis(df)),
+]
+
+
+def rss_mb():
+    """Current resident set size in MiB (Linux); peak RSS elsewhere."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def sample(rerun, start):
+    gc.collect()
+    return {
+        "rerun": rerun,
+        "rss_mb": round(rss_mb(), 1),
+        "live_figures": sum(isinstance(obj, matplotlib.figure.Figure) for obj in gc.get_objects()),
+        "pyplot_figures": len(plt.get_fignums()),
+        "seconds": round(time.perf_counter() - start, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=1_000, help="charts rendered (one per rerun)")
+    parser.add_argument("--every", type=int, default=100, help="sample memory every N reruns")
+    parser.add_argument("--unmanaged", action="store_true", help="use plt.subplots + st.pyplot without closing")
+    parser.add_argument("--json", action="store_true", help="print samples as JSON lines")
+    args = parser.parse_args()
+
+    # Bare-mode "missing ScriptRunContext" warnings and per-chart library warnings drown the samples
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
+    warnings.simplefilter("ignore")
+    if args.unmanaged:
+        chart_renderers.new_figure = lambda chart, figsize: plt.subplots(figsize=figsize)
+        chart_renderers.show_figure = st.pyplot
+
+    df = synthetic_tickets()
+    for _, chart in CHARTS:  # Warm-up: imports, font cache, pooled figures
+        chart(df)
+
+    start = time.perf_counter()
+    samples = [sample(0, start)]
+    for rerun in range(1, args.reruns + 1):
+        CHARTS[rerun % len(CHARTS)][1](df)
+        if rerun % args.every == 0:
+            samples.append(sample(rerun, start))
+
+    if args.json:
+        for row in samples:
+            print(json.dumps(row))
+        return
+
+    mode = "unmanaged (plt.subplots)" if args.unmanaged else "managed (FigurePool)"
+    print(f"Figure soak: {args.reruns} reruns, {mode}")
+    print(f"{'rerun':>6} {'RSS MiB':>9} {'live figs':>10} {'pyplot figs':>12} {'seconds':>8}")
+    for row in samples:
+        print(f"{row['rerun']:>6} {row['rss_mb']:>9} {row['live_figures']:>10} {row['pyplot_figures']:>12} {row['seconds']:>8}")
+    growth = samples[-1]["rss_mb"] - samples[1]["rss_mb"] if len(samples) > 2 else 0.0
+    pool = get_figure_pool()
+    print(f"RSS growth after the first sample: {growth:+.1f} MiB; pool created {pool.created}, reused {pool.reused}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,253 +1,573 @@
-from gc import get_stats
-import streamlit as st
 import pandas as pd
-from src.itautomationreports.data_loader import load_data, clean_data
-from src.itautomationreports.filters import filter_by_time
+import streamlit as st
+from src.itautomationreports.data_loader import load_data
+from src.itautomationreports.dataset_cache import get_dataset_cache
+from src.itautomationreports.ingest import get_ingestor
+from src.itautomationreports.shared_snapshots import load_shared_dataset
+from src.itautomationreports.filters import filter_by_time, time_filter_start
+from src.itautomationreports.backlog import BACKLOG_FREQUENCIES, BACKLOG_BREAKDOWNS
+from src.itautomationreports.resample import TREND_GRANULARITIES
+from src.itautomationreports.calendar_bins import CALENDAR_AXES, CALENDAR_LAYOUTS, CALENDAR_METRICS
+from src.itautomationreports.anomalies import ANOMALY_DIMENSIONS, ANOMALY_METHODS, ANOMALY_THRESHOLD
+from src.itautomationreports.drilldown import DRILLDOWN_DIMENSIONS, MAX_DRILLDOWN_ROWS, get_drilldown_index
+from src.itautomationreports.business_calendar import (
+    DEFAULT_BUSINESS_DAYS, DEFAULT_BUSINESS_HOURS, DEFAULT_HOLIDAYS, WEEKDAY_ABBREVIATIONS, BusinessCalendar)
+from src.itautomationreports.search import get_search_index
+from src.itautomationreports.pagination import AGING_VIEWS, BROWSER_COLUMNS, PAGE_SIZES, get_ticket_pager, page_count
+from src.itautomationreports.sketches import (
+    SKETCH_DIMENSIONS, SKETCH_RELATIVE_ACCURACY, SketchStore, get_sketch_store)
 from src.itautomationreports.visualization import (
     plot_priority_vs_resolution_time, plot_requests_by_priority, plot_sla_compliance, plot_ticket_trends, plot_time_of_day_heatmap,
     plot_response_time, plot_ticket_aging, plot_total_requests,
     plot_requests_by_category, plot_requests_by_process_manager,plot_user_request_analysis,
     plot_sla_performance, plot_avg_closure_time, plot_due_date_analysis,plot_time_taken_box_plot,
     plot_request_completion_status, plot_requests_by_status, plot_aging_report_table,
-    plot_urgent_requests,plot_request_volume_trend,plot_peak_request_times,plot_most_common_request_categories,plot_recurring_issues)
-
-
-from src.itautomationreports.comparision import compare_reports   
-
-def main():
-    st.set_page_config(page_title="IT Automation Reports", layout="wide")
-    st.title('📊 Multi-Report Ticket Analysis Dashboard')
-
-    # Sidebar - File Upload
-    uploaded_files = st.sidebar.file_uploader("Upload Excel files", type=["xlsx", "xls"], accept_multiple_files=True)
+    plot_urgent_requests,plot_request_volume_trend,plot_peak_request_times,plot_most_common_request_categories,plot_recurring_issues,
+    plot_open_backlog, plot_reopened_requests, plot_response_time_stats, plot_resolution_percentiles,
+    plot_volume_anomalies)
+from src.itautomationreports.aggregates import (
+    completion_counts, priority_breakdown, response_time_stats, status_breakdown, user_request_stats)
+from src.itautomationreports.caching import frame_key
+from src.itautomationreports.scheduler import get_scheduler
+
+
+from src.itautomationreports.comparision import compare_reports, read_reports, snapshot_uploads
+
+def show_dataset_cache_admin():
+    """Sidebar admin view of the datasets resident in the shared (cross-session) cache."""
+    cache = get_dataset_cache()
+    with st.sidebar.expander("🗄️ Shared Dataset Cache"):
+        st.markdown(
+            f"**Resident:** `{len(cache)}` datasets · "
+            f"`{cache.total_bytes / 1e6:,.1f}` / `{cache.budget_bytes / 1e6:,.0f}` MB · "
+            f"**Evictions:** `{cache.evictions}`"
+        )
+        st.dataframe(cache.summary(), use_container_width=True, hide_index=True)
+        if st.button("Clear cache", key="clear_dataset_cache"):
+            cache.clear()
+
+def choose_ingested_dataset():
+    """Sidebar picker for workbooks ingested from the watch folder (None when nothing is picked)."""
+    ingestor = get_ingestor()
+    if ingestor is None:
+        return None
+    datasets = ingestor.datasets()
+    if not datasets:
+        st.sidebar.caption(f"📥 Watching `{ingestor.watch_dir}`: no exports ingested yet.")
+        return None
+
+    labels = {
+        f"{entry.file_name} · {entry.rows:,} rows · {pd.Timestamp(entry.ingested, unit='s'):%Y-%m-%d %H:%M}": entry
+        for entry in datasets
+    }
+    choice = st.sidebar.selectbox("Or open an ingested export", ["None"] + list(labels), key="ingested_dataset")
+    return labels.get(choice)
+
+def show_debug_columns(df):
+    """Sidebar debugging view of the processed columns and categories (drawn on full reruns only)."""
+    # Debugging: Show available columns
+    st.sidebar.write("📋 **Final Processed Columns:**", list(df.columns))
+
+    # Debugging: Show unique Categories & Sub-Categories
+    if "Category" in df.columns and "Sub-Category" in df.columns:
+        st.sidebar.write("📌 **Unique Categories:**", df["Category"].dropna().unique())
+        st.sidebar.write("📌 **Unique Sub-Categories:**", df["Sub-Category"].dropna().unique())
+
+
+@st.fragment
+def trends_section(filtered_df):
+    """Ticket trends at the selected granularity (every trend chart bins the same sorted time index)."""
+    trend_granularity = st.selectbox(
+        "Trend granularity", TREND_GRANULARITIES,
+        index=TREND_GRANULARITIES.index("Month"), key="trend_granularity")
+    plot_ticket_trends(filtered_df, granularity=trend_granularity)
+
+    # ==================== 🗓️ NEW: Monthly/Quarterly Trends ====================
+    st.subheader(f"🗓️ Trends by {trend_granularity}")
+
+    col3, col4 = st.columns([1, 1])  # Equal width layout
+    with col3:
+        plot_request_volume_trend(filtered_df, granularity=trend_granularity)  # 📈 Line Chart: Request Volume Trend
+
+    with col4:
+        plot_peak_request_times(filtered_df, granularity=trend_granularity)  # 📊 Bar Chart: Peak Request Times
+
+
+@st.fragment
+def heatmap_section(filtered_df):
+    """Calendar heatmap (matrices are cached per filter state)."""
+    col7, col8 = st.columns([1, 1])
+    with col7:
+        heatmap_layout = st.selectbox("Heatmap layout", list(CALENDAR_LAYOUTS), key="heatmap_layout")
+    with col8:
+        heatmap_metric = st.selectbox("Heatmap value", CALENDAR_METRICS, key="heatmap_metric")
+    plot_time_of_day_heatmap(filtered_df, layout=heatmap_layout, metric=heatmap_metric)
+
+    # Tickets behind one heatmap cell
+    if "Request time" in filtered_df.columns:
+        with st.expander("🔎 Tickets in a heatmap cell"):
+            row_field, col_field = CALENDAR_LAYOUTS[heatmap_layout]
+            col_row, col_col = st.columns([1, 1])
+            with col_row:
+                row_label = st.selectbox(row_field.replace("_", " ").title(), CALENDAR_AXES[row_field], key=f"cell_row_{row_field}")
+            with col_col:
+                col_label = st.selectbox(col_field.replace("_", " ").title(), CALENDAR_AXES[col_field], key=f"cell_col_{col_field}")
+            index = get_drilldown_index(filtered_df)
+            show_drilldown_tickets(index, index.cell_positions(heatmap_layout, row_label, col_label))
+
+
+def show_drilldown_tickets(index, positions):
+    """Lists the tickets at the given row positions (capped at MAX_DRILLDOWN_ROWS)."""
+    st.caption(f"{len(positions):,} tickets" + (f" (showing the first {MAX_DRILLDOWN_ROWS:,})" if len(positions) > MAX_DRILLDOWN_ROWS else ""))
+    st.dataframe(index.tickets(positions[:MAX_DRILLDOWN_ROWS]), use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def drilldown_section(filtered_df):
+    """Tickets behind one bar of the category, status, priority or manager charts."""
+    dimensions = [dim for dim in DRILLDOWN_DIMENSIONS if dim in filtered_df.columns]
+    if not dimensions:
+        return
+
+    st.subheader("🔎 Drill-down")
+    index = get_drilldown_index(filtered_df)
+    col_dim, col_segment = st.columns([1, 2])
+    with col_dim:
+        dimension = st.selectbox("Breakdown", dimensions, key="drilldown_dimension")
+    segments = index.segments(dimension)
+    with col_segment:
+        segment = st.selectbox(
+            "Segment", segments.index, format_func=lambda value: f"{value} ({segments[value]:,})",
+            key=f"drilldown_segment_{dimension}")
+    show_drilldown_tickets(index, index.positions(dimension, segment))
+
+
+@st.fragment
+def ticket_browser_section(filtered_df):
+    """Paginated list of the filtered tickets: sorting and paging run server-side, only the visible page is sent."""
+    pager = get_ticket_pager(filtered_df)
+    default_columns = [col for col in BROWSER_COLUMNS if col in filtered_df.columns]
+
+    col_view, col_sort, col_dir, col_size = st.columns([1, 1, 1, 1])
+    with col_view:
+        view = st.selectbox("Show", list(AGING_VIEWS), key="browser_view")
+    with col_sort:
+        sort_column = st.selectbox("Sort by", ["(report order)"] + list(filtered_df.columns), key="browser_sort")
+    with col_dir:
+        direction = st.radio("Direction", ["Ascending", "Descending"], horizontal=True, key="browser_direction")
+    with col_size:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key="browser_page_size")
+    columns = st.multiselect("Columns", list(filtered_df.columns), default=default_columns, key="browser_columns")
+
+    rows = pager.rows(None if sort_column == "(report order)" else sort_column, direction == "Ascending", view)
+    n_pages = page_count(len(rows), page_size)
+    page = min(int(st.number_input("Page", min_value=1, value=1, step=1, key="browser_page")), n_pages)
+
+    first = (page - 1) * page_size
+    st.caption(f"Tickets {min(first + 1, len(rows)):,}–{min(first + page_size, len(rows)):,} of {len(rows):,} · page {page:,} of {n_pages:,}")
+    st.dataframe(pager.page(rows, page - 1, page_size, columns or default_columns), use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def backlog_section(backlog_df, since):
+    """Open backlog over every ticket of the selected source, so tickets opened before the window still count."""
+    st.subheader("📦 Open Backlog")
+
+    col5, col6 = st.columns([1, 1])
+    with col5:
+        backlog_freq = st.selectbox("Granularity", list(BACKLOG_FREQUENCIES), key="backlog_freq")
+    with col6:
+        backlog_by = st.selectbox("Breakdown", ["None"] + BACKLOG_BREAKDOWNS, key="backlog_by")
+
+    plot_open_backlog(
+        backlog_df,
+        freq=backlog_freq,
+        by=None if backlog_by == "None" else backlog_by,
+        since=since,
+    )
+
+
+@st.fragment
+def anomaly_section(history_df, since):
+    """Volume spikes per category, scored against baselines built from the full history of the selected source."""
+    st.subheader("🚨 Volume Anomalies")
+
+    dimensions = [dim for dim in ANOMALY_DIMENSIONS if dim in history_df.columns]
+    if not dimensions:
+        st.warning("⚠️ 'Category' or 'Sub-Category' column is missing from the dataset.")
+        return
+
+    col_by, col_method, col_threshold = st.columns([1, 1, 1])
+    with col_by:
+        anomaly_by = st.selectbox("Monitor", dimensions, key="anomaly_by")
+    with col_method:
+        anomaly_method = st.selectbox("Baseline", ANOMALY_METHODS, key="anomaly_method")
+    with col_threshold:
+        anomaly_threshold = st.slider("Score threshold", 2.0, 10.0, ANOMALY_THRESHOLD, 0.5, key="anomaly_threshold")
+
+    plot_volume_anomalies(history_df, by=anomaly_by, method=anomaly_method, since=since, threshold=anomaly_threshold)
+
+
+def business_calendar_settings():
+    """Working hours, days and holidays for business-time SLAs (defaults come from the ITAR_BUSINESS_* settings)."""
+    with st.expander("⚙️ Business Calendar"):
+        hours = st.text_input("Working hours", DEFAULT_BUSINESS_HOURS, key="business_hours")
+        days = st.multiselect(
+            "Working days", WEEKDAY_ABBREVIATIONS,
+            default=[day for day in WEEKDAY_ABBREVIATIONS if day in DEFAULT_BUSINESS_DAYS], key="business_days")
+        holidays = st.text_area("Holidays (YYYY-MM-DD, comma separated)", DEFAULT_HOLIDAYS, key="business_holidays")
+    try:
+        return BusinessCalendar.from_settings(hours, " ".join(days), holidays)
+    except ValueError as e:
+        st.warning(f"⚠️ Invalid business calendar ({e}); using the defaults.")
+        return BusinessCalendar.from_settings()
+
+
+@st.fragment
+def sla_section(filtered_df):
+    st.subheader("📑 SLA Performance Report")
+
+    # Wall-clock SLA numbers come from the export; business-hours numbers are recomputed from the due dates
+    sla_clock = st.radio("SLA clock", ["Wall clock", "Business hours"], horizontal=True, key="sla_clock")
+    calendar = business_calendar_settings() if sla_clock == "Business hours" else None
+
+    # Side-by-side layout for SLA Performance charts
+    col3, col4 = st.columns([1, 1])
+    with col3:
+        plot_sla_performance(filtered_df, calendar=calendar)  # ✅ Stacked Column Chart: SLA Met vs. SLA Breached
+
+    with col4:
+        plot_avg_closure_time(filtered_df, calendar=calendar)  # ✅ Card Visual: Average Time to Close Requests
+        plot_due_date_analysis(filtered_df, calendar=calendar)  # ✅ Bar Chart: Closed Before, On, or After Due Date
+
+
+@st.fragment
+def percentiles_section(sketch_store, sources, since):
+    """Resolution-time percentiles merged from the dataset's quantile sketches."""
+    st.subheader("📐 Resolution Time Percentiles")
+    percentile_by = st.selectbox("Breakdown", sketch_store.dimensions or SKETCH_DIMENSIONS, key="percentile_by")
+    plot_resolution_percentiles(sketch_store, dimension=percentile_by, sources=sources, since=since)
+    st.caption(
+        f"Percentiles are accurate to ±{SKETCH_RELATIVE_ACCURACY:.0%}; "
+        "time filters apply per calendar day.")
+
+
+@st.fragment
+def reopen_section(filtered_df):
+    st.subheader("🔁 Reopened Requests")
+
+    reopen_window = st.slider("Reopen window (days after previous close)", 1, 90, 7, key="reopen_window")
+    plot_reopened_requests(filtered_df, window_days=reopen_window)
+
+
+def schedule_comparison_reads(uploaded_files):
+    """
+    Starts reading the comparison uploads on the background pool and returns the job name (None without uploads).
+
+    The job is keyed by the uploaded file ids on its own scheduler, so filter changes never cancel it; the upload
+    buffers are only copied when the set of files is new.
+    """
+    if not uploaded_files:
+        return None
+    if not isinstance(uploaded_files, list):
+        uploaded_files = [uploaded_files]
+
+    scheduler = get_scheduler(st.session_state, key="comparison_scheduler")
+    comparison_job = ("comparison_reports", tuple(file.file_id for file in uploaded_files))
+    if scheduler.generation != comparison_job:
+        scheduler.schedule(comparison_job, {comparison_job: (read_reports, snapshot_uploads(uploaded_files))})
+    return comparison_job
+
+
+@st.fragment
+def comparison_section():
+    """Comparison tab: its uploads and widgets rerun this section only, never the dashboard."""
+    st.header("📈 Compare Multiple Reports")
+
+    # Allow user to upload multiple reports
+    allow_multiple = st.checkbox("Enable Multiple Report Comparison", value=True)
+
+    uploaded_files = st.file_uploader(
+        "Upload Excel Reports",
+        type=["xlsx"],
+        accept_multiple_files=allow_multiple,
+        key="comparison_files"
+    )
+    if uploaded_files and not allow_multiple:
+        uploaded_files = [uploaded_files]
 
     if uploaded_files:
-        try:
-            df, file_names = load_data(uploaded_files)
-            if df is not None and not df.empty:
-                df = clean_data(df)  # Clean and process the data
-
-                # Sidebar - Filters
-                st.sidebar.header("Filters")
-                source_filter = st.sidebar.selectbox("Select Report Source", ["All Reports"] + file_names)
-                time_filter = st.sidebar.selectbox("Time Period", ["All Time", "Last 90 Days", "Last 30 Days", "Last 7 Days"])
-
-                # Apply filters
-                filtered_df = filter_by_time(df, time_filter)
-                if source_filter != "All Reports":
-                    filtered_df = filtered_df[filtered_df['Source'] == source_filter]
-
-                # Display summary of applied filters
-                st.sidebar.markdown(f"✅ **Total Tickets After Filtering:** `{len(filtered_df)}`")
-                st.sidebar.markdown(f"📅 **Selected Time Period:** `{time_filter}`")
-                st.sidebar.markdown(f"📂 **Selected Report Source:** `{source_filter}`")
-
-                # Ensure data exists after filtering
-                if filtered_df.empty:
-                    st.warning("⚠️ No data available after applying filters.")
-                    return
-
-                            # Tabs for different analyses
-                tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        st.write("📂 **Uploaded Files:**", [file.name for file in uploaded_files])
+
+        # Reports are read (and their sheets validated) once per set of files, then reused on every rerun;
+        # on dashboard reruns the read was already started before the other tabs were drawn
+        comparison_job = schedule_comparison_reads(uploaded_files)
+        scheduler = get_scheduler(st.session_state, key="comparison_scheduler")
+        compare_reports(uploaded_files, loaded=scheduler.result(comparison_job, read_reports, uploaded_files))
+
+
+@st.fragment
+def dashboard(df, file_names, sketch_store):
+    """
+    Filters and analysis tabs.
+
+    Runs as a fragment: changing a filter reruns filtering and the charts
+    only, while the upload, load and cleaning steps in main() are skipped.
+    Sections with their own widgets are nested fragments, so their widgets
+    rerun just that section.
+    """
+    # Filters (in the main area, since fragments can't redraw the sidebar)
+    st.subheader("Filters")
+    col_source, col_time, col_search = st.columns([1, 1, 1])
+    with col_source:
+        source_filter = st.selectbox("Select Report Source", ["All Reports"] + file_names, key="source_filter")
+    with col_time:
+        time_filter = st.selectbox(
+            "Time Period", ["All Time", "Last 90 Days", "Last 30 Days", "Last 7 Days"], key="time_filter")
+    with col_search:
+        search_query = st.text_input(
+            "Search tickets", key="ticket_search", placeholder="vpn outlook* srv-01",
+            help="Every word must appear in the title (or another free-text column); end a word with * to match prefixes.")
+
+    # Full-text search narrows the dataset before the other filters (the index is built once per dataset)
+    matches = get_search_index(df).search(search_query)
+    if matches is not None:
+        df = df.iloc[matches]
+        # The dataset's sketches cover every ticket: search results get their own
+        sketch_store = SketchStore(df)
+
+    # Apply filters
+    filtered_df = filter_by_time(df, time_filter)
+    if source_filter != "All Reports":
+        filtered_df = filtered_df[filtered_df['Source'] == source_filter]
+
+    # Display summary of applied filters
+    st.markdown(
+        f"✅ **Total Tickets After Filtering:** `{len(filtered_df)}` · "
+        f"📅 **Selected Time Period:** `{time_filter}` · "
+        f"📂 **Selected Report Source:** `{source_filter}`"
+        + (f" · 🔍 **Search:** `{search_query.strip()}`" if matches is not None else "")
+    )
+
+    # Ensure data exists after filtering
+    if filtered_df.empty:
+        st.warning("⚠️ No data available after applying filters.")
+        return
+
+    # Start precomputing the other tabs' aggregates in the background (stale jobs are cancelled)
+    scheduler = get_scheduler(st.session_state)
+    snapshot_df = filtered_df.copy(deep=False)  # Own frame handle: the charts below add columns to filtered_df
+    background_jobs = {
+        "response_time_stats": (response_time_stats, snapshot_df),
+        "completion_counts": (completion_counts, snapshot_df),
+        "status_breakdown": (status_breakdown, snapshot_df),
+        "priority_breakdown": (priority_breakdown, snapshot_df),
+    }
+    if {"Request user", "Request time", "Close time"}.issubset(snapshot_df.columns):
+        background_jobs["user_request_stats"] = (user_request_stats, snapshot_df)
+
+    scheduler.schedule(frame_key(filtered_df), background_jobs)
+
+    # The comparison tab is drawn last: start reading its uploads now so the read overlaps the charts
+    schedule_comparison_reads(st.session_state.get("comparison_files"))
+
+    since = time_filter_start(time_filter)
+
+    # Tabs for different analyses
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
     "📊 Overall Insights", 
     "📉 Response Time & Ticket Aging", 
     "📌 Request Status Report", 
     "👤 User Request Analysis",  # ✅ New Tab for User Analysis
+    "🗂️ Ticket Browser",
     "🔄 Comparisons"  # ✅ Moved to last
 ])
 
 
-                with tab1:
-                    st.subheader("📊 Overall Ticket Insights")
+    with tab1:
+        st.subheader("📊 Overall Ticket Insights")
 
-                    # Display Total Requests & SLA Compliance side by side with better spacing
-                    col1, col2 = st.columns([1, 1])  # Equal width to minimize gap
+        # Display Total Requests & SLA Compliance side by side with better spacing
+        col1, col2 = st.columns([1, 1])  # Equal width to minimize gap
 
-                    with col1:
-                        plot_total_requests(filtered_df)  # ✅ Total request count
+        with col1:
+            plot_total_requests(filtered_df)  # ✅ Total request count
 
-                    with col2:
-                        plot_sla_compliance(filtered_df)  # ✅ SLA Compliance
+        with col2:
+            plot_sla_compliance(filtered_df)  # ✅ SLA Compliance
 
-                    # Reduce vertical spacing before the next visualizations
-                    st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
+        # Reduce vertical spacing before the next visualizations
+        st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
 
-                    # Keep other visualizations below
-                    plot_ticket_trends(filtered_df)
-                    plot_time_of_day_heatmap(filtered_df)
+        # Keep other visualizations below
+        trends_section(filtered_df)
+        heatmap_section(filtered_df)
+        drilldown_section(filtered_df)
 
-                    # ==================== 🗓️ NEW: Monthly/Quarterly Trends ====================
-                    st.subheader("🗓️ Monthly & Quarterly Trends")
+        # ==================== 📦 Open Backlog ====================
+        source_df = df if source_filter == "All Reports" else df[df['Source'] == source_filter]
+        backlog_section(source_df, since)
 
-                    col3, col4 = st.columns([1, 1])  # Equal width layout
-                    with col3:
-                        plot_request_volume_trend(filtered_df)  # 📈 Line Chart: Request Volume Trend
+        # ==================== 🚨 Volume Anomalies ====================
+        anomaly_section(source_df, since)
 
-                    with col4:
-                        plot_peak_request_times(filtered_df)  # 📊 Bar Chart: Peak Request Times
+        st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
+          # **📑 SLA Performance Report**
+        sla_section(filtered_df)
+
+        st.markdown("<hr style='margin-top: 10px; margin-bottom: 10px;'>", unsafe_allow_html=True)
 
-                    st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
-                      # **📑 SLA Performance Report**
-                    st.subheader("📑 SLA Performance Report")
+    with tab2:
+        st.subheader("📉 Response Time & Ticket Aging")
+
+        # Side-by-side layout for Response Time & Ticket Aging
+        col1, col2 = st.columns(2)
+        with col1:
+            plot_response_time(filtered_df)
+        with col2:
+            plot_ticket_aging(filtered_df)
+
+        plot_response_time_stats(
+            filtered_df, stats=scheduler.result("response_time_stats", response_time_stats, filtered_df))
+
+        # ==================== 📐 Resolution Time Percentiles ====================
+        percentiles_section(sketch_store, None if source_filter == "All Reports" else [source_filter], since)
+
+        # Ensure column names have no leading/trailing spaces
+        filtered_df.columns = filtered_df.columns.str.strip()
+
+        # Ensure 'Category' and 'Sub-Category' columns exist before plotting
+        if "Category" in filtered_df.columns and "Sub-Category" in filtered_df.columns and not filtered_df["Category"].dropna().empty:
+            plot_requests_by_category(filtered_df)
+        else:
+            st.warning("⚠️ 'Category' or 'Sub-Category' column is missing or contains no data.")
+
+        # Ensure 'Process manager' column exists before plotting
+        if "Process manager" in filtered_df.columns and filtered_df["Process manager"].dropna().any():
+            plot_requests_by_process_manager(filtered_df)
+
+            # ✅ Added: Box Plot for Time Taken by Process Managers
+            st.subheader("📦 Time Taken Distribution by Process Manager")
+            plot_time_taken_box_plot(filtered_df)
+
+        else:
+            st.warning("⚠️ 'Process manager' column is missing or contains no data.")
+
+        st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
+
+                                
+       
+    with tab3:
+        st.subheader("📌 Request Status Report")
+
+        # Donut Chart: Pending vs. Completed Requests
+        if "Status" in filtered_df.columns:
+            plot_request_completion_status(
+                filtered_df, counts=scheduler.result("completion_counts", completion_counts, filtered_df))  # ✅ Donut Chart
+        else:
+            st.warning("⚠️ 'Status' column is missing from the dataset.")
+
+        # Stacked Bar Chart: Requests by Status (Open, In Progress, Closed, etc.)
+        if "Status" in filtered_df.columns:
+            plot_requests_by_status(
+                filtered_df, status_counts=scheduler.result("status_breakdown", status_breakdown, filtered_df))  # ✅ Stacked Bar Chart
+        else:
+            st.warning("⚠️ 'Status' column is missing from the dataset.")
+
+        # Table: Aging Report (Requests Open for 30+, 60+, 90+ Days)
+        if "Ticket Aging" in filtered_df.columns:
+            plot_aging_report_table(filtered_df)  # ✅ Aging Table
+        else:
+            st.warning("⚠️ 'Ticket Aging' column is missing from the dataset.")
+
+                            # ==================== 🔥 Priority & Urgency Report ====================
+        st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
+        st.subheader("🔥 Priority & Urgency Report")
+
+        priority_stats = scheduler.result("priority_breakdown", priority_breakdown, filtered_df)
+        col1, col2 = st.columns(2)
+
+        with col1:
+            if "Priority" in filtered_df.columns:
+                plot_requests_by_priority(filtered_df, priority_counts=priority_stats["counts"])  # ✅ Bar Chart: High, Medium, Low
+            else:
+                st.warning("⚠️ 'Priority' column is missing from the dataset.")
+
+        with col2:
+            if "Urgency" in filtered_df.columns:
+                plot_urgent_requests(filtered_df)  # ✅ Pie Chart: Urgent Requests Breakdown
+            else:
+                st.warning("⚠️ 'Urgency' column is missing from the dataset.")
+
+        # Line Chart: Impact of Priority on Resolution Time
+        if "Priority" in filtered_df.columns and "Resolution Time" in filtered_df.columns:
+            plot_priority_vs_resolution_time(
+                filtered_df, avg_resolution_time=priority_stats["avg_response_time"])  # ✅ Line Chart
+        else:
+            st.warning("⚠️ 'Priority' or 'Resolution Time' column is missing from the dataset.")
+
+        # ==================== 🛠️ NEW: Root Cause Analysis ====================
+        st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
+        st.subheader("🛠️ Root Cause Analysis")
+
+        col3, col4 = st.columns([1, 1])  # Equal width layout
+        with col3:
+            if "Category" in filtered_df.columns:
+                plot_most_common_request_categories(filtered_df)  # 📊 Pie Chart: Most Common Categories
+            else:
+                st.warning("⚠️ 'Category' column is missing from the dataset.")
+
+        with col4:
+            if "Category" in filtered_df.columns and "Title" in filtered_df.columns:
+                plot_recurring_issues(filtered_df)  # 📊 Stacked Bar Chart: Recurring Issues
+            else:
+                st.warning("⚠️ 'Category' or 'Title' column is missing from the dataset.")
+
+        # ==================== 🔁 Reopened Requests ====================
+        st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
+        reopen_section(filtered_df)
+
+    with tab4:
+            st.header("👤 User Request & Resolution Analysis")
+            user_stats = None
+            if "user_request_stats" in background_jobs:
+                user_stats = scheduler.result("user_request_stats", user_request_stats, filtered_df)
+            plot_user_request_analysis(filtered_df, stats=user_stats)  # ✅ Respects the selected filters
+
+    with tab5:
+        st.subheader("🗂️ Ticket Browser")
+        ticket_browser_section(filtered_df)
+
+    with tab6:
+        comparison_section()
 
-                    # Side-by-side layout for SLA Performance charts
-                    col3, col4 = st.columns([1, 1])
-                    with col3:
-                        plot_sla_performance(filtered_df)  # ✅ Stacked Column Chart: SLA Met vs. SLA Breached
 
-                    with col4:
-                        plot_avg_closure_time(filtered_df)  # ✅ Card Visual: Average Time to Close Requests
-                        plot_due_date_analysis(filtered_df)  # ✅ Bar Chart: Closed Before, On, or After Due Date
-
-                    st.markdown("<hr style='margin-top: 10px; margin-bottom: 10px;'>", unsafe_allow_html=True)
+def main():
+    st.set_page_config(page_title="IT Automation Reports", layout="wide")
+    st.title('📊 Multi-Report Ticket Analysis Dashboard')
 
-                with tab2:
-                    st.subheader("📉 Response Time & Ticket Aging")
-
-                    # Side-by-side layout for Response Time & Ticket Aging
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        plot_response_time(filtered_df)
-                    with col2:
-                        plot_ticket_aging(filtered_df)
-
-                    # Debugging: Show available columns
-                    st.sidebar.write("📋 **Final Processed Columns:**", list(filtered_df.columns))
-
-                    # Ensure column names have no leading/trailing spaces
-                    filtered_df.columns = filtered_df.columns.str.strip()
-
-                    # Debugging: Show unique Categories & Sub-Categories
-                    if "Category" in filtered_df.columns and "Sub-Category" in filtered_df.columns:
-                        unique_categories = filtered_df["Category"].dropna().unique()
-                        unique_subcategories = filtered_df["Sub-Category"].dropna().unique()
-                        st.sidebar.write("📌 **Unique Categories:**", unique_categories)
-                        st.sidebar.write("📌 **Unique Sub-Categories:**", unique_subcategories)
-
-                    # Ensure 'Category' and 'Sub-Category' columns exist before plotting
-                    if "Category" in filtered_df.columns and "Sub-Category" in filtered_df.columns and not filtered_df["Category"].dropna().empty:
-                        plot_requests_by_category(filtered_df)
-                    else:
-                        st.warning("⚠️ 'Category' or 'Sub-Category' column is missing or contains no data.")
-
-                    # Ensure 'Process manager' column exists before plotting
-                    if "Process manager" in filtered_df.columns and filtered_df["Process manager"].dropna().any():
-                        plot_requests_by_process_manager(filtered_df)
-
-                        # ✅ Added: Box Plot for Time Taken by Process Managers
-                        st.subheader("📦 Time Taken Distribution by Process Manager")
-                        plot_time_taken_box_plot(filtered_df)
-
-                    else:
-                        st.warning("⚠️ 'Process manager' column is missing or contains no data.")
-
-                    st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
-
-                                            
-                   
-                with tab3:
-                    st.subheader("📌 Request Status Report")
-
-                    # Donut Chart: Pending vs. Completed Requests
-                    if "Status" in filtered_df.columns:
-                        plot_request_completion_status(filtered_df)  # ✅ Donut Chart
-                    else:
-                        st.warning("⚠️ 'Status' column is missing from the dataset.")
-
-                    # Stacked Bar Chart: Requests by Status (Open, In Progress, Closed, etc.)
-                    if "Status" in filtered_df.columns:
-                        plot_requests_by_status(filtered_df)  # ✅ Stacked Bar Chart
-                    else:
-                        st.warning("⚠️ 'Status' column is missing from the dataset.")
-
-                    # Table: Aging Report (Requests Open for 30+, 60+, 90+ Days)
-                    if "Ticket Aging" in filtered_df.columns:
-                        plot_aging_report_table(filtered_df)  # ✅ Aging Table
-                    else:
-                        st.warning("⚠️ 'Ticket Aging' column is missing from the dataset.")
-
-                                        # ==================== 🔥 Priority & Urgency Report ====================
-                    st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
-                    st.subheader("🔥 Priority & Urgency Report")
-
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        if "Priority" in filtered_df.columns:
-                            plot_requests_by_priority(filtered_df)  # ✅ Bar Chart: High, Medium, Low
-                        else:
-                            st.warning("⚠️ 'Priority' column is missing from the dataset.")
-
-                    with col2:
-                        if "Urgency" in filtered_df.columns:
-                            plot_urgent_requests(filtered_df)  # ✅ Pie Chart: Urgent Requests Breakdown
-                        else:
-                            st.warning("⚠️ 'Urgency' column is missing from the dataset.")
-
-                    # Line Chart: Impact of Priority on Resolution Time
-                    if "Priority" in filtered_df.columns and "Resolution Time" in filtered_df.columns:
-                        plot_priority_vs_resolution_time(filtered_df)  # ✅ Line Chart
-                    else:
-                        st.warning("⚠️ 'Priority' or 'Resolution Time' column is missing from the dataset.")
-
-                    # ==================== 🛠️ NEW: Root Cause Analysis ====================
-                    st.markdown("<hr style='margin-top: 5px; margin-bottom: 5px;'>", unsafe_allow_html=True)
-                    st.subheader("🛠️ Root Cause Analysis")
-
-                    col3, col4 = st.columns([1, 1])  # Equal width layout
-                    with col3:
-                        if "Category" in filtered_df.columns:
-                            plot_most_common_request_categories(filtered_df)  # 📊 Pie Chart: Most Common Categories
-                        else:
-                            st.warning("⚠️ 'Category' column is missing from the dataset.")
-
-                    with col4:
-                        if "Category" in filtered_df.columns and "Title" in filtered_df.columns:
-                            plot_recurring_issues(filtered_df)  # 📊 Stacked Bar Chart: Recurring Issues
-                        else:
-                            st.warning("⚠️ 'Category' or 'Title' column is missing from the dataset.")
-                
-                with tab4:
-                        st.header("👤 User Request & Resolution Analysis")
-                        plot_user_request_analysis(df)  # ✅ Uses the already loaded dataframe
-                     
-                with tab5:
-                    st.header("📈 Compare Multiple Reports")
-
-                    # Allow user to upload multiple reports
-                    allow_multiple = st.checkbox("Enable Multiple Report Comparison", value=True)
-
-                    uploaded_files = st.file_uploader(
-                        "Upload Excel Reports",
-                        type=["xlsx"],
-                        accept_multiple_files=allow_multiple
-                    )
-
-                    if uploaded_files:
-                        st.write("📂 **Uploaded Files:**", [file.name for file in uploaded_files])
-
-                        valid_files = []
-
-                        for file in uploaded_files:
-                            try:
-                                # Load Excel file and check for valid sheets
-                                xls = pd.ExcelFile(file, engine="openpyxl")
-                                valid_sheets = [sheet for sheet in xls.sheet_names if sheet.lower() in ["data", "report"]]
-
-                                if valid_sheets:
-                                    valid_files.append(file)
-                                else:
-                                    st.warning(f"⚠️ Skipping {file.name}: No valid sheets found (Data/Report).")
-
-                            except Exception as e:
-                                st.error(f"🚨 Error reading {file.name}: {e}")
-
-                        # Call function to process and compare reports if valid files exist
-                        if valid_files:
-                            compare_reports(valid_files)
-                        else:
-                            st.error("🚨 No valid reports found. Please upload correct Excel files.")
+    # Sidebar - File Upload
+    uploaded_files = st.sidebar.file_uploader("Upload Excel files", type=["xlsx", "xls"], accept_multiple_files=True)
+
+    ingested = None if uploaded_files else choose_ingested_dataset()
+
+    if uploaded_files or ingested is not None:
+        try:
+            if uploaded_files:
+                # Parsed and cleaned once per file content, then shared read-only across sessions
+                # (and across server processes, memory-mapped, when ITAR_SHARED_DIR is set)
+                df, file_names = load_shared_dataset(uploaded_files, load_data)
+            else:
+                # Already parsed by the watch-folder ingestor (pre-warmed in the shared cache)
+                df, file_names = get_ingestor().open(ingested)
+            show_dataset_cache_admin()
+            if df is not None and not df.empty:
+                # Resolution-time sketches per (Source, group, day), built once per dataset
+                sketch_store = get_sketch_store(df)
+                show_debug_columns(df)
 
+                # Filters and tabs rerun as a fragment: the steps above only run again when the uploads change
+                dashboard(df, file_names, sketch_store)
 
         except Exception as e:
             st.error(f"🚨 Error: {e}")
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from .topk import get_ranker
+
+# Status groups used by the completion donut chart
+COMPLETED_STATUSES = ["Closed", "Resolved", "Completed"]
+PENDING_STATUSES = ["Open", "In Progress", "Pending"]
+
+
+def closed_response_times(df):
+    """
+    "Response Time" (minutes) of closed tickets, NaN for open ones.
+
+    clean_data fills the response time of tickets without a close time
+    with 0; resolution-time statistics read the column through this
+    helper so those placeholders never count as instant resolutions.
+    """
+    values = pd.to_numeric(df["Response Time"], errors="coerce")
+    if "Close time" in df.columns:
+        values = values.where(df["Close time"].notna())
+    return values
+
+
+def response_time_stats(df):
+    """Summary statistics for "Response Time" (minutes, closed tickets) and "Ticket Aging" (days)."""
+    rows = {}
+    for col, label in (("Response Time", "Response Time (Minutes)"), ("Ticket Aging", "Ticket Aging (Days)")):
+        if col not in df.columns:
+            continue
+        values = closed_response_times(df) if col == "Response Time" else pd.to_numeric(df[col], errors="coerce")
+        values = values.dropna()
+        if values.empty:
+            continue
+        p50, p90 = np.percentile(values, [50, 90])
+        rows[label] = {
+            "Count": len(values),
+            "Mean": values.mean(),
+            "Median": p50,
+            "P90": p90,
+            "Max": values.max(),
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def completion_counts(df):
+    """Number of completed and pending requests (see COMPLETED_STATUSES / PENDING_STATUSES)."""
+    if "Status" not in df.columns:
+        return {"Completed": 0, "Pending": 0}
+    status = df["Status"]
+    return {
+        "Completed": int(status.isin(COMPLETED_STATUSES).sum()),
+        "Pending": int(status.isin(PENDING_STATUSES).sum()),
+    }
+
+
+def status_breakdown(df):
+    """Request counts per (Category, Status)."""
+    if "Status" not in df.columns or "Category" not in df.columns:
+        return pd.DataFrame(columns=["Category", "Status", "Request Count"])
+    return df.groupby(["Category", "Status"]).size().reset_index(name="Request Count")
+
+
+def priority_breakdown(df):
+    """Request counts and average response time (minutes, closed tickets) per Priority."""
+    if "Priority" not in df.columns:
+        return {"counts": pd.Series(dtype="int64"), "avg_response_time": pd.Series(dtype="float64")}
+
+    counts = df["Priority"].value_counts()
+    if "Response Time" in df.columns:
+        avg_response_time = closed_response_times(df).groupby(df["Priority"]).mean().sort_index()
+    else:
+        avg_response_time = pd.Series(dtype="float64")
+    return {"counts": counts, "avg_response_time": avg_response_time}
+
+
+def user_request_stats(df, top_n=10):
+    """
+    Top users by request count with their average resolution time (hours).
+
+    Returns (top_users, per_source), where per_source holds the top 5 users
+    of every report source (None when there is a single source).
+    """
+    resolution_time = (
+        pd.to_datetime(df["Close time"], errors="coerce") - pd.to_datetime(df["Request time"], errors="coerce")
+    ).dt.total_seconds() / 3600
+
+    # Select the top users by request count (partial selection, no full sort)
+    ranker = get_ranker(df)
+    user_counts = ranker.top_k("Request user", top_n)
+    top_users = pd.DataFrame({
+        "Request user": user_counts.index.astype(str),
+        "Total_Requests": user_counts.to_numpy(),
+        "Avg_Resolution_Time": ranker.group_mean("Request user", resolution_time).reindex(user_counts.index).to_numpy(),
+    })
+
+    per_source = None
+    if "Source" in df.columns and df["Source"].nunique() > 1:
+        per_source = ranker.top_k_per("Request user", 5, per="Source", other=True)
+    return top_users, per_source
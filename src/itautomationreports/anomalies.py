@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .caching import LRUCache, frame_key
+from .resample import bin_codes, bin_starts, to_int64
+
+# Columns whose daily volume is monitored
+ANOMALY_DIMENSIONS = ["Category", "Sub-Category"]
+
+# Baselines: rolling median / MAD over the previous BASELINE_DAYS days, or an EWMA with that span
+ANOMALY_METHODS = ["Rolling median / MAD", "EWMA"]
+BASELINE_DAYS = 28
+
+# A day is flagged when its score reaches the threshold and it has at least MIN_ANOMALY_COUNT tickets
+ANOMALY_THRESHOLD = 3.5
+MIN_ANOMALY_COUNT = 5
+
+_NAT = np.iinfo(np.int64).min
+_MAD_TO_SIGMA = 1.4826  # MAD of a normal distribution times this is its standard deviation
+
+# Rolling windows are medianed in chunks of groups holding at most this many values
+_MAX_WINDOW_VALUES = 8_000_000
+
+# Anomaly scores per (dataset + filter state, column, method)
+_score_cache = LRUCache(maxsize=16)
+
+
+def daily_counts(df, by):
+    """
+    Tickets per (group, calendar day) as a dense matrix, built with one bincount.
+
+    Returns (counts, labels, days): a groups x days int array covering every
+    day from the first to the last request, the group labels and the days.
+    """
+    ns = to_int64(df["Request time"])
+    groups = df[by].to_numpy(dtype=object)
+    valid = (ns != _NAT) & pd.notna(groups)
+    if not valid.any():
+        return np.zeros((0, 0), dtype=np.int64), pd.Index([], name=by), pd.DatetimeIndex([], name="Day")
+
+    days = bin_codes(ns[valid], "Day")
+    first = days.min()
+    n_days = int(days.max() - first) + 1
+    codes, labels = pd.factorize(groups[valid], sort=True)
+
+    counts = np.bincount(codes * n_days + (days - first), minlength=len(labels) * n_days)
+    return counts.reshape(len(labels), n_days), pd.Index(labels, name=by), bin_starts(np.arange(first, first + n_days), "Day")
+
+
+def rolling_median_baseline(counts, window=BASELINE_DAYS):
+    """
+    Median and MAD-based spread of the previous `window` days, for every group and day at once.
+
+    Day t is compared with days t - window .. t - 1 (NaN for the first
+    `window` days). Groups are processed in chunks so the strided window
+    view stays within _MAX_WINDOW_VALUES values.
+    """
+    n_groups, n_days = counts.shape
+    median = np.full((n_groups, n_days), np.nan)
+    spread = np.full((n_groups, n_days), np.nan)
+    if n_days <= window:
+        return median, spread
+
+    history = counts[:, :-1].astype(float)
+    chunk = max(1, _MAX_WINDOW_VALUES // ((n_days - window) * window))
+    for start in range(0, n_groups, chunk):
+        windows = sliding_window_view(history[start:start + chunk], window, axis=1)
+        chunk_median = np.median(windows, axis=2)
+        median[start:start + chunk, window:] = chunk_median
+        spread[start:start + chunk, window:] = _MAD_TO_SIGMA * np.median(np.abs(windows - chunk_median[..., None]), axis=2)
+    return median, spread
+
+
+def ewma_baseline(counts, span=BASELINE_DAYS):
+    """
+    Exponentially weighted mean and standard deviation of the days before each day.
+
+    The recursion steps over days with vector updates over every group
+    (no per-group loop). The first `span` days are a warm-up (NaN).
+    """
+    n_groups, n_days = counts.shape
+    mean = np.full((n_groups, n_days), np.nan)
+    spread = np.full((n_groups, n_days), np.nan)
+    if n_days == 0:
+        return mean, spread
+
+    alpha = 2 / (span + 1)
+    running_mean = counts[:, 0].astype(float)
+    running_var = np.zeros(n_groups)
+    for day in range(1, n_days):
+        if day >= span:
+            mean[:, day] = running_mean
+            spread[:, day] = np.sqrt(running_var)
+        delta = counts[:, day] - running_mean
+        running_mean = running_mean + alpha * delta
+        running_var = (1 - alpha) * (running_var + alpha * delta ** 2)
+    return mean, spread
+
+
+class VolumeAnomalies:
+    """
+    Daily volume scores of every group of a column against its own baseline.
+
+    The score is (count - baseline) / spread, where the spread is floored
+    at sqrt(max(baseline, 1)) (Poisson noise) so quiet groups with a flat
+    history do not flag every extra ticket.
+    """
+
+    def __init__(self, df, by, method=ANOMALY_METHODS[0], window=BASELINE_DAYS):
+        self.by = by
+        self.counts, self.labels, self.days = daily_counts(df, by)
+        if method == "EWMA":
+            self.baseline, spread = ewma_baseline(self.counts, window)
+        else:
+            self.baseline, spread = rolling_median_baseline(self.counts, window)
+        with np.errstate(invalid="ignore"):
+            floor = np.sqrt(np.maximum(self.baseline, 1))
+            self.scores = (self.counts - self.baseline) / np.fmax(spread, floor)
+
+    def top(self, since=None, threshold=ANOMALY_THRESHOLD, min_count=MIN_ANOMALY_COUNT, top_n=20):
+        """The highest-scoring flagged (group, day) cells from `since` onwards, as a table."""
+        with np.errstate(invalid="ignore"):
+            flagged = (self.scores >= threshold) & (self.counts >= min_count)
+        if since is not None:
+            flagged[:, self.days < pd.Timestamp(since).floor("D")] = False
+
+        groups, days = np.nonzero(flagged)
+        order = np.argsort(-self.scores[groups, days], kind="stable")[:top_n]
+        groups, days = groups[order], days[order]
+        return pd.DataFrame({
+            self.by: self.labels[groups],
+            "Day": self.days[days],
+            "Tickets": self.counts[groups, days],
+            "Baseline": np.round(self.baseline[groups, days], 1),
+            "Score": np.round(self.scores[groups, days], 1),
+        })
+
+    def series(self, group):
+        """Daily tickets and baseline of one group."""
+        position = self.labels.get_loc(group)
+        return pd.DataFrame({"Tickets": self.counts[position], "Baseline": self.baseline[position]}, index=self.days)
+
+
+def get_volume_anomalies(df, by, method=ANOMALY_METHODS[0]):
+    """Returns the cached VolumeAnomalies of this frame (same dataset + filter state) for a column and method."""
+    key = (frame_key(df, ["Request time", by]), by, method)
+    return _score_cache.get_or_compute(key, lambda: VolumeAnomalies(df, by, method))
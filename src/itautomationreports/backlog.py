@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from .resample import bin_codes, bin_starts, to_int64
+
+# Supported backlog granularities (label -> resample granularity)
+BACKLOG_FREQUENCIES = {
+    "Daily": "Day",
+    "Hourly": "Hour",
+    "Weekly": "Week",
+}
+
+# Columns the backlog can be broken down by
+BACKLOG_BREAKDOWNS = ["Process manager", "Category", "Priority"]
+
+
+def backlog_series(df, freq="Daily", by=None):
+    """
+    Computes the number of open tickets at the end of every period.
+
+    Each ticket contributes a +1 event at its "Request time" bin and a -1
+    event at its "Close time" bin. Events are counted per bin with
+    np.bincount and turned into open counts with a cumulative sum along the
+    (sorted) time axis, so the whole series is built in a single pass
+    without rescanning tickets per day. Tickets without a close time stay
+    open until the end of the series.
+
+    Returns a DataFrame indexed by period start with one column per group
+    of `by` (or a single "Open Tickets" column when `by` is None).
+    """
+    if "Request time" not in df.columns or df.empty:
+        return pd.DataFrame()
+
+    granularity = BACKLOG_FREQUENCIES[freq]
+    nat = np.iinfo(np.int64).min
+
+    start = to_int64(df["Request time"])
+    if "Close time" in df.columns:
+        close = to_int64(df["Close time"])
+    else:
+        close = np.full(len(start), nat, dtype=np.int64)
+
+    valid = start != nat
+    if not valid.any():
+        return pd.DataFrame()
+
+    start, close = start[valid], close[valid]
+    is_closed = close != nat
+
+    start_bin = bin_codes(start, granularity)
+    close_bin = np.where(is_closed, bin_codes(close, granularity), 0)
+    close_bin = np.maximum(close_bin, start_bin)  # Ignore closes logged before the request
+
+    first = start_bin.min()
+    last = max(start_bin.max(), close_bin[is_closed].max() if is_closed.any() else first)
+    n_bins = int(last - first + 1)
+
+    start_idx = start_bin - first
+    close_idx = close_bin - first
+
+    # Group codes (a single group when no breakdown is requested)
+    if by is not None and by in df.columns:
+        groups = df.loc[valid, by].astype(object).where(lambda s: s.notna(), "Unassigned")
+        codes, labels = pd.factorize(groups, sort=True)
+        labels = list(labels)
+    else:
+        codes = np.zeros(len(start_idx), dtype=np.int64)
+        labels = ["Open Tickets"]
+    n_groups = len(labels)
+
+    # +1 at request bin, -1 at close bin (open tickets never close within the series)
+    size = n_groups * n_bins
+    opened = np.bincount(codes * n_bins + start_idx, minlength=size)
+    closed = np.bincount(codes[is_closed] * n_bins + close_idx[is_closed], minlength=size)
+    open_counts = np.cumsum((opened - closed).reshape(n_groups, n_bins), axis=1)
+
+    index = bin_starts(first + np.arange(n_bins), granularity).rename("Period")
+    return pd.DataFrame(open_counts.T, index=index, columns=labels)
+
+
+def limit_groups(backlog, top_n=8):
+    """Keeps the `top_n` groups with the largest peak backlog and sums the rest into "Other"."""
+    if backlog.shape[1] <= top_n:
+        return backlog
+
+    peaks = backlog.max().to_numpy()
+    keep = np.argpartition(-peaks, top_n - 1)[:top_n]
+    keep = keep[np.argsort(-peaks[keep], kind="stable")]
+
+    limited = backlog.iloc[:, keep].copy()
+    rest = backlog.drop(columns=backlog.columns[keep]).sum(axis=1)
+    # A kept group that is itself called "Other" absorbs the rest instead of being overwritten
+    limited["Other"] = limited["Other"] + rest if "Other" in limited.columns else rest
+    return limited
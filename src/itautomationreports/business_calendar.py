@@ -0,0 +1,128 @@
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from .caching import LRUCache, frame_key
+from .resample import to_int64
+
+WEEKDAY_ABBREVIATIONS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+# Defaults (overridable per deployment): working hours "HH:MM-HH:MM", working days and holidays "YYYY-MM-DD,..."
+DEFAULT_BUSINESS_HOURS = os.environ.get("ITAR_BUSINESS_HOURS", "09:00-17:00")
+DEFAULT_BUSINESS_DAYS = os.environ.get("ITAR_BUSINESS_DAYS", "Mon Tue Wed Thu Fri")
+DEFAULT_HOLIDAYS = os.environ.get("ITAR_HOLIDAYS", "")
+
+_NAT = np.iinfo(np.int64).min
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_DAY = 86_400 * _NS_PER_SECOND
+
+# Business durations per (frame, calendar)
+_duration_cache = LRUCache(maxsize=16)
+
+
+def _parse_clock(value):
+    """"HH:MM" -> seconds after midnight."""
+    hours, minutes = value.strip().split(":")
+    return int(hours) * 3600 + int(minutes) * 60
+
+
+@dataclass(frozen=True)
+class BusinessCalendar:
+    """
+    Working hours, working days and holidays used for business-time SLAs.
+
+    Times are measured with a cumulative business clock f(t): the number of
+    business seconds between the epoch and t. It is np.busday_count of the
+    whole days before t times the working-day length, plus the part of t's
+    own day that falls inside working hours. A duration is f(end) - f(start),
+    so every ticket is handled with array arithmetic and no per-row loops.
+    """
+    start_seconds: int = 9 * 3600
+    end_seconds: int = 17 * 3600
+    weekdays: tuple = ("Mon", "Tue", "Wed", "Thu", "Fri")
+    holidays: tuple = field(default_factory=tuple)
+
+    def __post_init__(self):
+        if not 0 <= self.start_seconds < self.end_seconds <= 86_400:
+            raise ValueError("Working hours must start before they end, within one day.")
+        if not self.weekdays:
+            raise ValueError("At least one working day is required.")
+
+    @classmethod
+    def from_settings(cls, hours=DEFAULT_BUSINESS_HOURS, days=DEFAULT_BUSINESS_DAYS, holidays=DEFAULT_HOLIDAYS):
+        """Builds a calendar from "09:00-17:00", "Mon Tue ..." and "2025-12-25, 2025-12-26" style strings."""
+        start, end = hours.split("-")
+        weekdays = tuple(day for day in WEEKDAY_ABBREVIATIONS if day in days.replace(",", " ").split())
+        holiday_dates = tuple(sorted({str(pd.Timestamp(day.strip()).date()) for day in holidays.split(",") if day.strip()}))
+        return cls(_parse_clock(start), _parse_clock(end), weekdays, holiday_dates)
+
+    @property
+    def day_seconds(self):
+        """Length of one working day in seconds."""
+        return self.end_seconds - self.start_seconds
+
+    @property
+    def busdaycalendar(self):
+        weekmask = "".join("1" if day in self.weekdays else "0" for day in WEEKDAY_ABBREVIATIONS)
+        return np.busdaycalendar(weekmask=weekmask, holidays=list(self.holidays))
+
+    def business_clock(self, ns):
+        """Cumulative business seconds since the epoch for int64 nanosecond timestamps (NaN for NaT)."""
+        ns = np.asarray(ns, dtype=np.int64)
+        valid = ns != _NAT
+        clock = np.full(len(ns), np.nan)
+        if not valid.any():
+            return clock
+
+        t = ns[valid]
+        days = t // _NS_PER_DAY
+        seconds_into_day = (t - days * _NS_PER_DAY) / _NS_PER_SECOND
+
+        calendar = self.busdaycalendar
+        day_dates = days.astype("datetime64[D]")
+        full_days = np.busday_count(np.datetime64("1970-01-01"), day_dates, busdaycal=calendar)
+        partial = np.clip(seconds_into_day, self.start_seconds, self.end_seconds) - self.start_seconds
+        partial = np.where(np.is_busday(day_dates, busdaycal=calendar), partial, 0.0)
+
+        clock[valid] = full_days * float(self.day_seconds) + partial
+        return clock
+
+    def business_seconds(self, start, end):
+        """Business seconds between two aligned datetime arrays/Series (negative when end < start)."""
+        return self.business_clock(to_int64(end)) - self.business_clock(to_int64(start))
+
+
+def business_durations(df, calendar, now=None):
+    """
+    Business-time columns for every ticket, computed in one vectorised pass.
+
+    Returns a DataFrame aligned with `df` with:
+    - "Business Response Time" (minutes, closed tickets only),
+    - "Business Ticket Aging" (business days until close or `now`),
+    - "Business Due Delta" (business minutes closed past the due date; <= 0 is on time).
+    """
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    result = pd.DataFrame(index=df.index)
+    if "Request time" not in df.columns:
+        return result
+
+    start = df["Request time"]
+    close = df["Close time"] if "Close time" in df.columns else pd.Series(pd.NaT, index=df.index)
+    until = close.fillna(now)
+
+    result["Business Response Time"] = calendar.business_seconds(start, close) / 60
+    result["Business Ticket Aging"] = calendar.business_seconds(start, until) / calendar.day_seconds
+
+    if "Due Date" in df.columns:
+        result["Business Due Delta"] = calendar.business_seconds(df["Due Date"], close) / 60
+    return result
+
+
+def get_business_durations(df, calendar):
+    """Cached business_durations for this frame (same dataset + filter state) and calendar."""
+    columns = [col for col in ("Request time", "Close time", "Due Date") if col in df.columns]
+    now = pd.Timestamp.now().floor("h")  # Open-ticket aging is refreshed hourly
+    key = (frame_key(df, columns), calendar, now)
+    return _duration_cache.get_or_compute(key, lambda: business_durations(df, calendar, now=now))
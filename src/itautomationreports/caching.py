@@ -0,0 +1,95 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(*parts):
+    """
+    Returns a short, stable hex digest for the given parts.
+
+    Parts may be pandas objects (hashed with hash_pandas_object), numpy
+    arrays (hashed from their raw bytes) or anything with a stable str().
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, (pd.DataFrame, pd.Series, pd.Index)):
+            digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+            if isinstance(part, pd.DataFrame):
+                digest.update(str(list(part.columns)).encode("utf-8"))
+        elif isinstance(part, np.ndarray) and part.dtype != object:
+            digest.update(np.ascontiguousarray(part).tobytes())
+        elif isinstance(part, np.ndarray):
+            digest.update(pd.util.hash_array(part).tobytes())
+        else:
+            digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x1f")  # Separator so ("ab", "c") != ("a", "bc")
+    return digest.hexdigest()
+
+
+# DataFrame.attrs key holding the fingerprint of the loaded dataset (propagates through filtering)
+DATASET_FINGERPRINT_ATTR = "dataset_fingerprint"
+
+
+def frame_fingerprint(df, columns=None):
+    """Fingerprints the rows (index labels + selected columns) of a DataFrame."""
+    columns = [col for col in (columns or df.columns) if col in df.columns]
+    return fingerprint(df.index.to_numpy(), df[columns])
+
+
+def frame_key(df, columns=None):
+    """
+    Cheap cache key for a (possibly filtered) view of a loaded dataset.
+
+    When the frame carries the dataset fingerprint set by load_data, only
+    its index labels are hashed, which identifies the filter state. Other
+    frames fall back to hashing the selected columns.
+    """
+    token = df.attrs.get(DATASET_FINGERPRINT_ATTR)
+    if token is None:
+        return frame_fingerprint(df, columns)
+    return fingerprint(token, df.index.to_numpy())
+
+
+class LRUCache:
+    """A small thread-safe least-recently-used cache shared by the analysis engines."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached value for `key`, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+from .aggregates import closed_response_times
+from .caching import LRUCache, frame_key
+from .resample import to_int64
+
+# Heatmap layouts (label -> (row field, column field))
+CALENDAR_LAYOUTS = {
+    "Weekday × Hour": ("weekday", "hour"),
+    "Day of Month × Hour": ("day_of_month", "hour"),
+    "Week of Year × Weekday": ("week_of_year", "weekday"),
+}
+
+# Values a heatmap cell can show
+CALENDAR_METRICS = ["Ticket Count", "SLA Breach Rate (%)", "Mean Resolution (Hours)"]
+
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Labels of every calendar field (the position in the list is the field's integer code)
+CALENDAR_AXES = {
+    "hour": list(range(24)),
+    "weekday": WEEKDAY_NAMES,
+    "day_of_month": list(range(1, 32)),
+    "week_of_year": list(range(1, 54)),
+}
+
+_AXIS_TITLES = {"hour": "Hour", "weekday": "Weekday", "day_of_month": "Day of Month", "week_of_year": "Week of Year"}
+
+_NAT = np.iinfo(np.int64).min
+_NS_PER_HOUR = 3_600_000_000_000
+_NS_PER_DAY = 86_400_000_000_000
+
+# Calendar bins per (dataset + filter state)
+_calendar_cache = LRUCache(maxsize=16)
+
+
+def calendar_fields(ns):
+    """
+    Splits int64 nanosecond timestamps into zero-based calendar codes.
+
+    Returns a dict with "hour" (0-23), "weekday" (0 = Monday),
+    "day_of_month" (0-30) and "week_of_year" (ISO week, 0-52), all computed
+    with integer arithmetic on the day number.
+    """
+    days = ns // _NS_PER_DAY
+    weekday = (days + 3) % 7  # 1970-01-01 was a Thursday
+
+    month_start = days.astype("datetime64[D]").astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+    # ISO weeks belong to the year of their Thursday
+    thursday = days - weekday + 3
+    year_start = thursday.astype("datetime64[D]").astype("datetime64[Y]").astype("datetime64[D]").astype(np.int64)
+
+    return {
+        "hour": (ns - days * _NS_PER_DAY) // _NS_PER_HOUR,
+        "weekday": weekday,
+        "day_of_month": days - month_start,
+        "week_of_year": (thursday - year_start) // 7,
+    }
+
+
+class CalendarBins:
+    """
+    Calendar heatmap matrices for one filtered frame.
+
+    Request times are split into calendar codes once; every matrix is then
+    a single np.bincount over row * n_columns + column (with weights for
+    SLA breaches and resolution times). Matrices are memoised per
+    (layout, metric).
+    """
+
+    def __init__(self, df):
+        ns = to_int64(df["Request time"]) if "Request time" in df.columns else np.full(len(df), _NAT)
+        self.valid = ns != _NAT
+        self.fields = calendar_fields(ns[self.valid])
+        self.n_tickets = int(self.valid.sum())
+
+        if "SLA" in df.columns:
+            sla = df["SLA"].to_numpy(dtype=object)[self.valid]
+            self.sla_known = np.isin(sla, ["Met", "Fail"]).astype(float)
+            self.sla_failed = (sla == "Fail").astype(float)
+        else:
+            self.sla_known = self.sla_failed = None
+
+        if "Response Time" in df.columns:
+            resolution = closed_response_times(df).to_numpy(dtype=float)[self.valid]
+            self.resolution_known = (~np.isnan(resolution)).astype(float)
+            self.resolution_hours = np.where(np.isnan(resolution), 0.0, resolution / 60)
+        else:
+            self.resolution_known = self.resolution_hours = None
+
+        self._matrices = {}
+
+    def has_metric(self, metric):
+        if metric == "SLA Breach Rate (%)":
+            return self.sla_known is not None
+        if metric == "Mean Resolution (Hours)":
+            return self.resolution_known is not None
+        return metric == "Ticket Count"
+
+    def matrix(self, layout, metric="Ticket Count"):
+        """Returns the heatmap for a layout in CALENDAR_LAYOUTS as a DataFrame (NaN where a rate is undefined)."""
+        key = (layout, metric)
+        if key not in self._matrices:
+            self._matrices[key] = self._compute(layout, metric)
+        return self._matrices[key]
+
+    def _compute(self, layout, metric):
+        row_field, col_field = CALENDAR_LAYOUTS[layout]
+        n_rows, n_cols = len(CALENDAR_AXES[row_field]), len(CALENDAR_AXES[col_field])
+        size = n_rows * n_cols
+        cells = self.fields[row_field] * n_cols + self.fields[col_field]
+
+        if metric == "Ticket Count":
+            values = np.bincount(cells, minlength=size)
+        elif metric == "SLA Breach Rate (%)":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values = 100 * np.bincount(cells, self.sla_failed, minlength=size) / np.bincount(cells, self.sla_known, minlength=size)
+        elif metric == "Mean Resolution (Hours)":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values = np.bincount(cells, self.resolution_hours, minlength=size) / np.bincount(cells, self.resolution_known, minlength=size)
+        else:
+            raise ValueError(f"Unknown calendar metric: {metric}")
+
+        return pd.DataFrame(
+            values.reshape(n_rows, n_cols),
+            index=pd.Index(CALENDAR_AXES[row_field], name=_AXIS_TITLES[row_field]),
+            columns=pd.Index(CALENDAR_AXES[col_field], name=_AXIS_TITLES[col_field]),
+        )
+
+
+def get_calendar_bins(df):
+    """Returns the cached CalendarBins of this frame (same dataset + filter state)."""
+    columns = [col for col in ("Request time", "SLA", "Response Time", "Close time") if col in df.columns]
+    return _calendar_cache.get_or_compute(frame_key(df, columns), lambda: CalendarBins(df))
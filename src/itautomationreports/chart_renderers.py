@@ -0,0 +1,366 @@
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .lazy import lazy_import
+from .figures import get_figure_pool, new_figure, show_figure
+
+# Plotting libraries are imported when the first chart is drawn
+mpl = lazy_import("matplotlib")
+path_effects = lazy_import("matplotlib.patheffects")
+patches = lazy_import("matplotlib.patches")
+sns = lazy_import("seaborn")
+
+# Bar charts with more bars than this skip the in-bar numbers and thin out their tick labels
+MAX_LABELLED_BARS = 40
+
+# Chart name -> draw(fig, ax, **data)
+RENDERERS = {}
+
+_recorders = threading.local()
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    """
+    Everything needed to draw one matplotlib chart, without the source frame.
+
+    `data` holds the chart's aggregates (small Series, DataFrames, arrays
+    and labels) and styling options, passed as keyword arguments to the
+    chart's renderer. Chart functions in visualization.py compute the data;
+    the drawing code lives here, one registered function per chart.
+    """
+
+    chart: str
+    figsize: tuple
+    data: dict = field(default_factory=dict)
+
+
+def renderer(name):
+    """Registers a draw(fig, ax, **data) function under a chart name."""
+    def register(draw):
+        RENDERERS[name] = draw
+        return draw
+    return register
+
+
+def draw_chart(spec):
+    """Draws a spec onto a pooled figure and returns it (release it with the figure pool when done)."""
+    fig, ax = new_figure(spec.chart, figsize=spec.figsize)
+    try:
+        RENDERERS[spec.chart](fig, ax, **spec.data)
+    except Exception:
+        get_figure_pool().release(fig)
+        raise
+    return fig
+
+
+@contextmanager
+def recorded_charts():
+    """Collects the ChartSpecs of the charts rendered inside the block instead of drawing them (tests)."""
+    stack = _recorders.__dict__.setdefault("stack", [])
+    specs = []
+    stack.append(specs)
+    try:
+        yield specs
+    finally:
+        stack.pop()
+
+
+def render_chart(spec):
+    """Draws a chart and shows it with st.pyplot (or records its spec inside recorded_charts)."""
+    stack = getattr(_recorders, "stack", None)
+    if stack:
+        stack[-1].append(spec)
+    else:
+        show_figure(draw_chart(spec))
+
+
+def _outlined_bar_labels(ax, bars):
+    """Writes each non-empty bar's count in its middle, in white with a black outline."""
+    for bar in bars:
+        height = bar.get_height()
+        if height > 0:
+            ax.text(
+                bar.get_x() + bar.get_width() / 2,  # X position
+                height / 2,  # Y position (middle of the bar)
+                str(int(height)),  # Convert count to integer
+                ha="center", va="center", fontsize=12, color="white", fontweight="bold",
+                path_effects=[path_effects.withStroke(linewidth=3, foreground="black")],  # Black border
+            )
+
+
+def _boxed_labels(ax, xs, ys, texts, va="center"):
+    """Writes labels in white boxes with a black border."""
+    for x, y, text in zip(xs, ys, texts):
+        ax.text(x, y, text, ha="center", va=va, fontsize=12, color="black", fontweight="bold",
+                bbox=dict(facecolor="white", edgecolor="black", boxstyle="round,pad=0.3"))
+
+
+def _thin_tick_labels(ax, labels, max_ticks=MAX_LABELLED_BARS):
+    """Shows at most `max_ticks` evenly spaced category tick labels."""
+    step = max(1, int(np.ceil(len(labels) / max_ticks)))
+    positions = np.arange(0, len(labels), step)
+    ax.set_xticks(positions)
+    ax.set_xticklabels([labels[i] for i in positions], rotation=45, ha="right")
+
+
+@renderer("ticket_trends")
+def draw_ticket_trends(fig, ax, labels, counts, granularity):
+    bars = ax.bar(labels, counts, color="royalblue")
+
+    # Numbers inside bars (skipped when the bars get too thin to read)
+    if len(bars) <= MAX_LABELLED_BARS:
+        _outlined_bar_labels(ax, bars)
+
+    ax.set_title("📈 Ticket Trends Over Time", fontsize=14, fontweight="bold")
+    ax.set_xlabel(granularity, fontsize=12)
+    ax.set_ylabel("Ticket Count", fontsize=12)
+    _thin_tick_labels(ax, labels)
+
+
+@renderer("time_of_day_heatmap")
+def draw_time_of_day_heatmap(fig, ax, matrix, layout, metric):
+    # Annotate cells only when they are large enough to read
+    annotate = matrix.size <= 200
+    sns.heatmap(matrix, cmap="YlGnBu", annot=annotate, fmt="g" if metric == "Ticket Count" else ".0f", ax=ax)
+    ax.set_title(f"Tickets Raised by {layout} ({metric})")
+
+
+@renderer("response_time")
+def draw_response_time(fig, ax, values):
+    sns.boxplot(x=values, ax=ax, color="lightcoral")
+    ax.set_title("📊 Response Time Distribution", fontsize=14)
+    ax.set_xlabel("Response Time (Minutes)", fontsize=12)
+    ax.grid(True, linestyle="--", alpha=0.6)
+
+
+@renderer("ticket_aging")
+def draw_ticket_aging(fig, ax, values):
+    sns.violinplot(x=values, ax=ax, color="orange", inner="quartile")
+    ax.set_title("Ticket Aging Distribution", fontsize=14)
+    ax.set_xlabel("Ticket Age (Days)", fontsize=12)
+    ax.grid(True, linestyle="--", alpha=0.6)
+
+
+@renderer("sla_performance")
+def draw_sla_performance(fig, ax, sla_counts, business_hours=False):
+    bars = sla_counts.plot(kind="bar", stacked=True, color=["green", "red"], ax=ax)
+    _outlined_bar_labels(ax, bars.patches)
+
+    title = "Requests Meeting SLA vs. SLA Breached" + (" (Business Hours)" if business_hours else "")
+    ax.set_title(title, fontsize=14, fontweight="bold")
+    ax.set_xlabel("SLA Status", fontsize=12)
+    ax.set_ylabel("Number of Requests", fontsize=12)
+    ax.set_xticklabels(sla_counts.index, rotation=0)  # Keep labels horizontal
+
+
+@renderer("due_date_analysis")
+def draw_due_date_analysis(fig, ax, closure_counts):
+    bars = sns.barplot(x=closure_counts.index, y=closure_counts.values, palette=["green", "blue", "red"], ax=ax)
+    _outlined_bar_labels(ax, bars.patches)
+
+    ax.set_title("Requests Closed Before, On, or After the Due Date", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Closure Status", fontsize=12)
+    ax.set_ylabel("Number of Requests", fontsize=12)
+    ax.set_xticklabels(closure_counts.index, rotation=0)  # Keep labels horizontal
+
+
+@renderer("request_completion_status")
+def draw_request_completion_status(fig, ax, sizes):
+    labels = ["Completed", "Pending"]
+    colors = ["#4CAF50", "#FFC107"]  # Green for completed, Yellow for pending
+    ax.pie(sizes, labels=labels, autopct="%1.1f%%", colors=colors,
+           startangle=140, wedgeprops={"edgecolor": "black"})
+    ax.set_title("Pending vs. Completed Requests", fontsize=10)  # Reduce title size
+
+    # Add a circle at the center to make it a donut chart
+    ax.add_artist(patches.Circle((0, 0), 0.70, fc="white"))
+
+
+@renderer("requests_by_status")
+def draw_requests_by_status(fig, ax, status_counts):
+    sns.barplot(data=status_counts, x="Category", y="Request Count", hue="Status", ax=ax)
+
+    # Rotate x-axis labels if too many categories exist
+    if status_counts["Category"].nunique() > 8:
+        ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
+
+    ax.set_title("Requests by Status")
+    ax.set_xlabel("Category")
+    ax.set_ylabel("Number of Requests")
+
+
+@renderer("aging_report_table")
+def draw_aging_report_table(fig, ax, aging_summary):
+    """Candlestick-style chart of the request count per aging bracket."""
+    counts = aging_summary["Request Count"]
+    opens = counts.shift(1, fill_value=counts.iloc[0])
+    highs = counts
+    lows = counts.rolling(2).min().fillna(counts)
+
+    for x, (open_, high, low, close) in enumerate(zip(opens, highs, lows, counts)):
+        # Candlestick wick (vertical line)
+        ax.vlines(x, low, high, color="black", linewidth=2)
+
+        # Candlestick body (green if Close >= Open, red otherwise)
+        color = "green" if close >= open_ else "red"
+        ax.add_patch(patches.Rectangle((x - 0.2, min(open_, close)), 0.4, abs(close - open_), color=color, alpha=0.8))
+
+        # Count inside the candle with a black border
+        text = ax.text(x, (open_ + close) / 2, str(int(close)),
+                       ha="center", va="center", fontsize=12, color="white", fontweight="bold")
+        text.set_path_effects([path_effects.Stroke(linewidth=2, foreground="black"), path_effects.Normal()])
+
+    ax.set_xticks(range(len(aging_summary)))
+    ax.set_xticklabels(aging_summary["Aging Bracket"], rotation=0)
+    ax.set_ylabel("Number of Requests", fontsize=12)
+    ax.set_title("Request Aging Distribution (Minutes)", fontsize=14, fontweight="bold")
+
+
+@renderer("requests_by_priority")
+def draw_requests_by_priority(fig, ax, priority_counts):
+    bars = sns.barplot(x=priority_counts.index, y=priority_counts.values, palette=["red", "orange", "green"], ax=ax)
+    heights = [bar.get_height() for bar in bars.patches]
+    _boxed_labels(ax, [bar.get_x() + bar.get_width() / 2 for bar in bars.patches],
+                  [height / 2 for height in heights], [str(int(height)) for height in heights])
+
+    ax.set_title("Requests by Priority", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Priority", fontsize=12)
+    ax.set_ylabel("Number of Requests", fontsize=12)
+
+
+@renderer("urgent_requests")
+def draw_urgent_requests(fig, ax, urgency_counts):
+    wedges, texts, autotexts = ax.pie(
+        urgency_counts.values, labels=urgency_counts.index, autopct="%1.1f%%",
+        colors=["red", "gray"], startangle=90, textprops={"fontsize": 12, "fontweight": "bold"}
+    )
+
+    # Add black border to text
+    for text in autotexts:
+        text.set_bbox(dict(facecolor="white", edgecolor="black", boxstyle="round,pad=0.3"))
+
+    ax.set_title("Urgent Requests Breakdown", fontsize=14, fontweight="bold")
+
+
+@renderer("priority_vs_resolution_time")
+def draw_priority_vs_resolution_time(fig, ax, avg_resolution_time):
+    ax.plot(avg_resolution_time.index, avg_resolution_time.values, marker="o", linestyle="-", color="blue")
+    for i, value in enumerate(avg_resolution_time.values):
+        ax.text(i, value, f"{int(value)} min", ha="center", va="bottom", fontsize=12,
+                bbox=dict(facecolor="white", edgecolor="black", boxstyle="round,pad=0.3"))
+
+    ax.set_title("Impact of Priority on Resolution Time", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Priority", fontsize=12)
+    ax.set_ylabel("Avg. Resolution Time (minutes)", fontsize=12)
+
+
+@renderer("requests_by_process_manager")
+def draw_requests_by_process_manager(fig, ax, manager_counts):
+    bars = ax.bar(manager_counts.index, manager_counts.values, color="royalblue")
+    _boxed_labels(ax, [bar.get_x() + bar.get_width() / 2 for bar in bars],
+                  [bar.get_height() for bar in bars], [str(int(bar.get_height())) for bar in bars], va="bottom")
+
+    ax.set_title("Requests Handled by Each Process Manager", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Process Manager", fontsize=12)
+    ax.set_ylabel("Number of Requests", fontsize=12)
+    ax.set_xticklabels(manager_counts.index, rotation=45, ha="right")
+
+
+@renderer("request_volume_trend")
+def draw_request_volume_trend(fig, ax, request_trend, granularity, resolution=None):
+    ax.plot(request_trend.index, request_trend.values, marker="o", color="blue", label="Requests")
+    ax.set_title("📈 Request Volume Trend Over Time")
+    ax.set_xlabel(granularity)
+    ax.set_ylabel("Number of Requests")
+    ax.grid(True)
+
+    # Average resolution time per period on a secondary axis
+    if resolution is not None:
+        ax2 = ax.twinx()
+        ax2.plot(resolution.index, resolution.values, linestyle="--", color="orange", label="Avg Resolution (Hours)")
+        ax2.set_ylabel("Avg Resolution (Hours)")
+        ax.legend(handles=ax.get_lines() + ax2.get_lines(), loc="upper left")
+
+
+@renderer("peak_request_times")
+def draw_peak_request_times(fig, ax, peak_times, granularity):
+    peak_times.iloc[::-1].plot(kind="barh", color="orange", ax=ax)
+    ax.set_title(f"📊 Peak Request Times (Most Active {granularity}s)")
+    ax.set_xlabel("Number of Requests")
+    ax.set_ylabel(granularity)
+
+
+@renderer("most_common_request_categories")
+def draw_most_common_request_categories(fig, ax, category_counts):
+    category_counts.plot(kind="pie", autopct="%1.1f%%", colors=mpl.colormaps["Paired"].colors, ax=ax)
+    ax.set_title("📊 Most Common Request Categories")
+    ax.set_ylabel("")  # Hide y-axis label
+
+
+@renderer("recurring_issues")
+def draw_recurring_issues(fig, ax, heatmap_data):
+    sns.heatmap(heatmap_data, annot=True, fmt="g", cmap="Blues", linewidths=0.5, ax=ax)
+    ax.set_title("🔥 Top Recurring Issues (Category vs. Issue Cluster)")
+    ax.set_xlabel("Issue Cluster")
+    ax.set_ylabel("Category")
+
+
+@renderer("reopened_requests")
+def draw_reopened_requests(fig, ax, rates, by):
+    ax.barh(rates[by].astype(str)[::-1], rates["Reopen Rate (%)"][::-1], color="indianred")
+    ax.set_title(f"Reopen Rate by {by}", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Reopen Rate (%)", fontsize=12)
+    ax.set_ylabel(by, fontsize=12)
+
+
+@renderer("user_request_analysis")
+def draw_user_request_analysis(fig, ax, top_users):
+    # Bar chart for Total Requests (Primary Y-Axis)
+    sns.barplot(x="Request user", y="Total_Requests", data=top_users, palette="Blues_r", ax=ax)
+    ax.set_xlabel("User")
+    ax.set_ylabel("Total Requests", color="blue")
+    ax.tick_params(axis="y", labelcolor="blue")
+    ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
+
+    # Scatter plot for Avg Resolution Time (Secondary Y-Axis, Dots Only)
+    ax2 = ax.twinx()
+    ax2.scatter(top_users["Request user"], top_users["Avg_Resolution_Time"], color="red", label="Avg Resolution Time")
+    ax2.set_ylabel("Avg Resolution Time (hrs)", color="red")
+    ax2.tick_params(axis="y", labelcolor="red")
+
+
+@renderer("open_backlog")
+def draw_open_backlog(fig, ax, backlog, granularity, by=None):
+    if by is None:
+        ax.plot(backlog.index, backlog["Open Tickets"], color="royalblue")
+        ax.fill_between(backlog.index, backlog["Open Tickets"], color="royalblue", alpha=0.3)
+    else:
+        ax.stackplot(backlog.index, backlog.T.to_numpy(), labels=backlog.columns.astype(str), alpha=0.85)
+        ax.legend(loc="upper left", fontsize=8, ncol=2)
+
+    title = "📦 Open Ticket Backlog" + (f" by {by}" if by else "")
+    ax.set_title(title, fontsize=14, fontweight="bold")
+    ax.set_xlabel(granularity, fontsize=12)
+    ax.set_ylabel("Open Tickets", fontsize=12)
+    ax.grid(True, linestyle="--", alpha=0.6)
+    fig.autofmt_xdate()
+
+
+@renderer("volume_anomalies")
+def draw_volume_anomalies(fig, ax, groups, by):
+    """`groups`: (label, daily Tickets/Baseline frame, flagged days frame) of the most anomalous groups."""
+    for group, series, flagged in groups:
+        line, = ax.plot(series.index, series["Tickets"], label=str(group))
+        ax.plot(series.index, series["Baseline"], color=line.get_color(), linestyle="--", alpha=0.7)
+        ax.scatter(flagged["Day"], flagged["Tickets"], color=line.get_color(), marker="o", s=60, zorder=3)
+
+    ax.set_title(f"🚨 Daily Volume vs. Baseline (top {by} anomalies)", fontsize=14, fontweight="bold")
+    ax.set_xlabel("Day", fontsize=12)
+    ax.set_ylabel("Tickets", fontsize=12)
+    ax.legend(loc="upper left", fontsize=8)
+    ax.grid(True, linestyle="--", alpha=0.6)
+    fig.autofmt_xdate()
@@ -1,6 +1,19 @@
+import io
+
+import numpy as np
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+
+from .lazy import lazy_import
+from .caching import DATASET_FINGERPRINT_ATTR
+from .dataset_cache import content_key
+from .decimation import minmax_decimate, ticket_axis
+from .readers import open_workbook, read_excel
+from .snapshot_diff import DIFF_CLASSES, SnapshotChain
+
+# Imported when the first comparison chart renders
+px = lazy_import("plotly.express")
+go = lazy_import("plotly.graph_objects")
 
 def detect_header_row(df):
     """
@@ -12,76 +25,224 @@ def detect_header_row(df):
             return index
     return None  # Return None if no valid header is found
 
-def load_and_clean_data(uploaded_files):
-    """Load and clean data from valid sheets ('Data' or 'Report') in multiple Excel files."""
+def read_report(file):
+    """
+    Reads and cleans one report from a valid sheet ('Data' or 'Report').
+
+    Returns (df, None) on success or (None, (level, message)) when the file
+    is skipped, where level is "warning" or "error". Does not call
+    Streamlit, so it can run on a background thread.
+    """
+    try:
+        xls = open_workbook(file)
+
+        # Check if 'Data' or 'Report' sheet exists
+        valid_sheets = [sheet for sheet in xls.sheet_names if sheet.lower() in ["data", "report"]]
+
+        if not valid_sheets:
+            return None, ("warning", f"⚠️ Skipping {file.name}: No valid sheet ('Data' or 'Report') found.")
+
+        # Read the first valid sheet
+        df_raw = read_excel(xls, sheet_name=valid_sheets[0], header=None)
+
+        # Detect the correct header row dynamically
+        header_row = detect_header_row(df_raw)
+        if header_row is None:
+            return None, ("warning", f"⚠️ Skipping {file.name}: Could not detect a valid header row.")
+
+        # Read the data again with the correct header row
+        df = read_excel(xls, sheet_name=valid_sheets[0], header=header_row)
+
+        # Normalize column names (strip spaces, lowercase)
+        df.columns = df.columns.str.strip().str.lower()
+
+        # Rename columns if necessary
+        rename_map = {
+            "#": "ticket",
+            "ticket": "ticket",
+            "request user": "request_user",
+            "close time": "close_time",
+            "request time": "request_time"
+        }
+        df.rename(columns=rename_map, inplace=True)
+
+        # Ensure required columns exist
+        required_columns = {"request_user", "close_time", "request_time"}
+        if not required_columns.issubset(df.columns):
+            return None, ("warning", f"⚠️ Skipping {file.name}: Missing required columns {required_columns}.")
+
+        # Convert datetime columns
+        df["request_time"] = pd.to_datetime(df["request_time"], errors="coerce")
+        df["close_time"] = pd.to_datetime(df["close_time"], errors="coerce")
+
+        # Calculate Resolution Time in minutes
+        df["resolution_time"] = (df["close_time"] - df["request_time"]).dt.total_seconds() / 60
+
+        # Identifies the snapshot, so per-report engines (e.g. the diff) cache without hashing its rows
+        df.attrs[DATASET_FINGERPRINT_ATTR] = content_key([file])
+
+        return df, None
+
+    except Exception as e:
+        return None, ("error", f"🚨 Error loading {file.name}: {str(e)}")
+
+
+def read_reports(uploaded_files):
+    """Reads every report; returns ({file name: df}, [(level, message), ...]) without calling Streamlit."""
     reports = {}
+    problems = []
 
     for file in uploaded_files:
-        try:
-            xls = pd.ExcelFile(file, engine="openpyxl")
-
-            # Check if 'Data' or 'Report' sheet exists
-            valid_sheets = [sheet for sheet in xls.sheet_names if sheet.lower() in ["data", "report"]]
-
-            if not valid_sheets:
-                st.warning(f"⚠️ Skipping {file.name}: No valid sheet ('Data' or 'Report') found.")
-                continue
-
-            # Read the first valid sheet
-            df_raw = pd.read_excel(xls, sheet_name=valid_sheets[0], header=None)
-
-            # Detect the correct header row dynamically
-            header_row = detect_header_row(df_raw)
-            if header_row is None:
-                st.warning(f"⚠️ Skipping {file.name}: Could not detect a valid header row.")
-                continue
-
-            # Read the data again with the correct header row
-            df = pd.read_excel(xls, sheet_name=valid_sheets[0], header=header_row)
-
-            # Normalize column names (strip spaces, lowercase)
-            df.columns = df.columns.str.strip().str.lower()
-
-            # Rename columns if necessary
-            rename_map = {
-                "#": "ticket",
-                "ticket": "ticket",
-                "request user": "request_user",
-                "close time": "close_time",
-                "request time": "request_time"
-            }
-            df.rename(columns=rename_map, inplace=True)
-
-            # Ensure required columns exist
-            required_columns = {"request_user", "close_time", "request_time"}
-            if not required_columns.issubset(df.columns):
-                st.warning(f"⚠️ Skipping {file.name}: Missing required columns {required_columns}.")
-                continue
-
-            # Convert datetime columns
-            df["request_time"] = pd.to_datetime(df["request_time"], errors="coerce")
-            df["close_time"] = pd.to_datetime(df["close_time"], errors="coerce")
-
-            # Calculate Resolution Time in minutes
-            df["resolution_time"] = (df["close_time"] - df["request_time"]).dt.total_seconds() / 60
-
+        df, problem = read_report(file)
+        if problem is not None:
+            problems.append(problem)
+        else:
             reports[file.name] = df
 
-        except Exception as e:
-            st.error(f"🚨 Error loading {file.name}: {str(e)}")
+    return reports, problems
+
+
+def snapshot_uploads(uploaded_files):
+    """Copies uploaded files into independent named buffers that are safe to read from another thread."""
+    snapshots = []
+    for file in uploaded_files:
+        buffer = io.BytesIO(file.getvalue())
+        buffer.name = file.name
+        snapshots.append(buffer)
+    return snapshots
+
+
+def load_and_clean_data(uploaded_files, loaded=None):
+    """Load and clean data from valid sheets ('Data' or 'Report') in multiple Excel files.
+
+    `loaded` may hold the (reports, problems) result of a background read_reports call.
+    """
+    reports, problems = loaded if loaded is not None else read_reports(uploaded_files)
+
+    for level, message in problems:
+        getattr(st, level)(message)
+
+    # Keep only the files that were passed in (the background read may cover more)
+    names = {file.name for file in uploaded_files}
+    return {name: df for name, df in reports.items() if name in names}
+
+
+# Columns kept in the long comparison frame (when present in a report)
+COMPARISON_COLUMNS = ["ticket", "request_time", "close_time", "resolution_time", "sla", "status", "priority"]
+
+# Resolution-time quantiles computed per report
+COMPARISON_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.9, 0.95]
+
+# Aging buckets on resolution time (upper bounds in days); open tickets get their own bucket
+AGING_BUCKET_DAYS = [1, 7, 30]
+AGING_BUCKET_LABELS = ["0-1 Days", "1-7 Days", "7-30 Days", "30+ Days", "Open"]
+
+# Tickets listed per class in the snapshot diff
+MAX_DIFF_ROWS = 5_000
+
+# Aging scatter: WebGL above this many points, and at most this many points sent to the browser
+WEBGL_THRESHOLD = 5_000
+MAX_AGING_POINTS = 20_000
+
+
+def build_comparison_frame(reports):
+    """
+    Stacks every report into one long-format frame with a categorical "Report" key.
+
+    The categories keep the upload order, so all per-report metrics can be
+    computed from integer codes instead of looping over per-file frames.
+    """
+    if not reports:
+        return pd.DataFrame(columns=["Report"] + COMPARISON_COLUMNS)
+
+    frames = [df[[col for col in COMPARISON_COLUMNS if col in df.columns]] for df in reports.values()]
+    long_df = pd.concat(frames, keys=list(reports), names=["Report", None]).reset_index(level=0)
+    long_df["Report"] = pd.Categorical(long_df["Report"], categories=list(reports))
+    return long_df.reset_index(drop=True)
 
-    return reports
 
+def _grouped_quantiles(codes, values, n_groups, quantiles):
+    """
+    Linear-interpolated quantiles of `values` per group code (NaN values ignored).
 
-def plot_total_requests(reports):
+    One lexsort orders values within every group; each quantile is then a
+    direct lookup at its interpolated position inside the group's run.
+    """
+    valid = ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    order = np.lexsort((values, codes))
+    values = values[order]
+
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    result = np.full((n_groups, len(quantiles)), np.nan)
+
+    has_values = counts > 0
+    for j, q in enumerate(quantiles):
+        position = q * (counts[has_values] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        base = starts[has_values]
+        low_values, high_values = values[base + lower], values[base + upper]
+        result[has_values, j] = low_values + (high_values - low_values) * (position - lower)
+    return result
+
+
+def comparison_summary(long_df):
+    """
+    Computes every per-report metric from the long comparison frame in one grouped pass.
+
+    Counts, closed tickets, SLA rate and aging buckets are bincounts over the
+    categorical report codes. Resolution-time quantiles come from a single
+    sort by (report, resolution time). Returns one row per report.
+    """
+    reports = list(long_df["Report"].cat.categories)
+    n = len(reports)
+    codes = long_df["Report"].cat.codes.to_numpy().astype(np.int64)
+
+    summary = pd.DataFrame(index=pd.Index(reports, name="Report"))
+    summary["Total Requests"] = np.bincount(codes, minlength=n)
+
+    if "resolution_time" in long_df.columns:
+        resolution = pd.to_numeric(long_df["resolution_time"], errors="coerce").to_numpy(dtype=float)
+    else:
+        resolution = np.full(len(codes), np.nan)
+    closed = ~np.isnan(resolution)
+    summary["Closed"] = np.bincount(codes[closed], minlength=n)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        summary["Mean Resolution (Min)"] = np.bincount(codes[closed], weights=resolution[closed], minlength=n) / summary["Closed"]
+
+    quantiles = _grouped_quantiles(codes, resolution, n, COMPARISON_QUANTILES)
+    for j, q in enumerate(COMPARISON_QUANTILES):
+        summary[f"P{int(q * 100)} Resolution (Min)"] = quantiles[:, j]
+
+    if "sla" in long_df.columns:
+        sla = long_df["sla"].astype(str).str.extract(r"(Met|Fail)", expand=False)
+        known = sla.notna().to_numpy()
+        met = (sla == "Met").to_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            summary["SLA Met (%)"] = (
+                np.bincount(codes[met], minlength=n) / np.bincount(codes[known], minlength=n) * 100
+            )
+
+    # Aging buckets: resolution time in days for closed tickets, "Open" otherwise
+    days = resolution / 1440
+    bucket = np.where(closed, np.searchsorted(AGING_BUCKET_DAYS, days, side="right"), len(AGING_BUCKET_DAYS) + 1)
+    buckets = np.bincount(codes * len(AGING_BUCKET_LABELS) + bucket, minlength=n * len(AGING_BUCKET_LABELS))
+    for j, label in enumerate(AGING_BUCKET_LABELS):
+        summary[label] = buckets.reshape(n, len(AGING_BUCKET_LABELS))[:, j]
+
+    return summary
+
+
+def plot_total_requests(summary):
     """Interactive bar chart comparing total requests across multiple reports."""
-    total_counts = {name: len(df) for name, df in reports.items()}
-    
-    if not total_counts:
+    if summary.empty:
         st.warning("⚠️ No valid data for Total Requests comparison.")
         return
 
-    df_total = pd.DataFrame(list(total_counts.items()), columns=["Report", "Total Requests"])
+    df_total = summary["Total Requests"].reset_index()
 
     fig = px.bar(df_total, x="Report", y="Total Requests", text="Total Requests",
                  title="📊 Total Requests Comparison", color="Total Requests",
@@ -94,88 +255,198 @@ def plot_total_requests(reports):
     
     st.plotly_chart(fig, use_container_width=True)
 
-def plot_response_time(reports):
-    """Interactive box plot for response time distribution in minutes."""
-    all_data = []
-
-    for name, df in reports.items():
-        if "resolution_time" in df.columns and not df["resolution_time"].isna().all():
-            df_filtered = df[["resolution_time"]].dropna()
-            df_filtered["Report"] = name
-            all_data.append(df_filtered)
+def plot_response_time(summary):
+    """Box plot of response time per report, drawn from precomputed quantiles (whiskers at P5/P95)."""
+    summary = summary.dropna(subset=["P50 Resolution (Min)"])
 
-    if not all_data:
+    if summary.empty:
         st.warning("⚠️ No valid response time data available.")
         return
 
-    df_combined = pd.concat(all_data)
-
-    fig = px.box(df_combined, x="Report", y="resolution_time", 
-                 title="⏳ Response Time & Ticket Aging", 
-                 color="Report", points="all")
-
-    fig.update_traces(marker=dict(line=dict(color='black', width=1)))  # Add border
-    fig.update_layout(xaxis_title="", yaxis_title="Resolution Time (Minutes)")
+    # Precomputed boxes: the browser receives 5 numbers per report instead of every ticket
+    fig = go.Figure(go.Box(
+        x=summary.index.astype(str),
+        q1=summary["P25 Resolution (Min)"],
+        median=summary["P50 Resolution (Min)"],
+        q3=summary["P75 Resolution (Min)"],
+        lowerfence=summary["P5 Resolution (Min)"],
+        upperfence=summary["P95 Resolution (Min)"],
+        mean=summary["Mean Resolution (Min)"],
+        marker=dict(line=dict(color='black', width=1)),  # Add border
+        name="Resolution Time",
+    ))
+
+    fig.update_layout(title="⏳ Response Time & Ticket Aging", xaxis_title="", yaxis_title="Resolution Time (Minutes)")
     
     st.plotly_chart(fig, use_container_width=True)
 
-import plotly.express as px
-import streamlit as st
-import pandas as pd
+def plot_aging_buckets(summary):
+    """Small multiples: aging-bucket mix of every report as one compact stacked bar per report."""
+    if summary.empty:
+        st.warning("⚠️ No valid aging data available.")
+        return
 
-import plotly.express as px
-import streamlit as st
-import pandas as pd
+    buckets = summary[AGING_BUCKET_LABELS].reset_index().melt(id_vars="Report", var_name="Aging Bucket", value_name="Tickets")
 
-def plot_aging_report(reports):
-    """Interactive scatter plot for aging report (resolution time per ticket)."""
-    all_data = []
+    fig = px.bar(buckets, y="Report", x="Tickets", color="Aging Bucket", orientation="h",
+                 title="🗂️ Aging Buckets per Report", category_orders={"Aging Bucket": AGING_BUCKET_LABELS})
+    fig.update_layout(yaxis_title="", xaxis_title="Tickets", height=max(300, 22 * len(summary)))
 
-    for name, df in reports.items():
-        if "resolution_time" in df.columns and not df["resolution_time"].isna().all():
-            df_filtered = df[["ticket", "resolution_time"]].dropna()
-            df_filtered["Report"] = name
-            all_data.append(df_filtered)
+    st.plotly_chart(fig, use_container_width=True)
+
+def plot_comparison_summary(summary):
+    """Compact table with one row of metrics per report."""
+    st.dataframe(summary.style.format(precision=1), use_container_width=True)
+
+def plot_aging_report(long_df):
+    """
+    Interactive scatter plot for aging report (resolution time per ticket).
+
+    Large reports are decimated server-side (min/max resolution time per
+    ticket bin and report) and drawn with WebGL. Narrowing the ticket range
+    re-decimates only that range, so zooming in brings back full detail.
+    """
+    df_combined = long_df.dropna(subset=["ticket", "resolution_time"]) if "ticket" in long_df.columns else long_df.iloc[0:0]
 
-    if not all_data:
+    if df_combined.empty:
         st.warning("⚠️ No valid aging data available.")
         return
 
-    df_combined = pd.concat(all_data)
+    df_combined = df_combined.reset_index(drop=True)
+    axis = ticket_axis(df_combined["ticket"])
+    resolution = df_combined["resolution_time"].to_numpy(dtype=float)
+    report_codes = df_combined["Report"].cat.codes.to_numpy()
+    n_reports = len(df_combined["Report"].cat.categories)
+
+    # Zoom: the selected ticket range is re-fetched and re-decimated on every change
+    x_range = None
+    lo, hi = float(axis.min()), float(axis.max())
+    if len(df_combined) > MAX_AGING_POINTS and hi > lo:
+        x_range = st.slider("Ticket range", min_value=lo, max_value=hi, value=(lo, hi), step=1.0, key="aging_ticket_range")
+
+    shown = minmax_decimate(axis, resolution, n_bins=MAX_AGING_POINTS // (2 * n_reports), groups=report_codes, x_range=x_range)
+    in_range = len(df_combined) if x_range is None else int(((axis >= x_range[0]) & (axis <= x_range[1])).sum())
+    if in_range <= MAX_AGING_POINTS:
+        # Few enough points in view: show every ticket instead of the decimated subset
+        shown = np.flatnonzero((axis >= x_range[0]) & (axis <= x_range[1])) if x_range is not None else np.arange(len(df_combined))
 
     # High-contrast color palette
     contrast_colors = ["#FF0000", "#0000FF", "#00FF00", "#FFA500", "#800080", "#FFC0CB", "#8B0000"]
 
-    fig = px.scatter(df_combined, 
-                     x="ticket", 
-                     y="resolution_time", 
-                     color="Report",
-                     title="📋 Aging Report (Minutes)",
-                     labels={"ticket": "Ticket ID", "resolution_time": "Resolution Time (Minutes)"},
-                     color_discrete_sequence=contrast_colors)  # Apply high-contrast colors
-
-    # Add a border to points for visibility
-    fig.update_traces(marker=dict(line=dict(color='black', width=1)))  
+    use_webgl = len(shown) > WEBGL_THRESHOLD
+    trace_type = go.Scattergl if use_webgl else go.Scatter
+    # A border on points helps visibility but is expensive, so WebGL traces skip it
+    marker_line = dict(width=0) if use_webgl else dict(color="black", width=1)
+
+    fig = go.Figure()
+    for code, report in enumerate(df_combined["Report"].cat.categories):
+        points = shown[report_codes[shown] == code]
+        if len(points) == 0:
+            continue
+        fig.add_trace(trace_type(
+            x=axis[points],
+            y=resolution[points],
+            customdata=df_combined["ticket"].to_numpy()[points],
+            mode="markers",
+            name=report,
+            marker=dict(color=contrast_colors[code % len(contrast_colors)], line=marker_line),
+            hovertemplate="Ticket %{customdata}<br>%{y:.0f} min<extra>%{fullData.name}</extra>",
+        ))
 
     # Improve layout
-    fig.update_layout(xaxis_title="Ticket ID", yaxis_title="Resolution Time (Minutes)")
+    fig.update_layout(title="📋 Aging Report (Minutes)", xaxis_title="Ticket ID", yaxis_title="Resolution Time (Minutes)")
 
     st.plotly_chart(fig, use_container_width=True)
+    if len(shown) < in_range:
+        st.caption(f"Showing {len(shown):,} of {in_range:,} tickets (highest and lowest resolution time per ticket bin). "
+                   "Narrow the ticket range to see every ticket.")
 
 
-def compare_reports(uploaded_files):
-    """Main function to compare multiple reports."""
-    reports = load_and_clean_data(uploaded_files)
+def plot_snapshot_diff(reports):
+    """
+    Ticket-level diff across a chain of snapshots: per-step class counts, then for one step the
+    per-field changes, transitions and ticket list.
+    """
+    names = list(reports)
+    selected = st.multiselect("Snapshots (oldest first)", names, default=names, key="diff_chain")
+    if len(selected) < 2:
+        st.warning("⚠️ Pick at least two snapshots of the same queue to compare them ticket by ticket.")
+        return
+
+    missing = [name for name in selected if "ticket" not in reports[name].columns]
+    if missing:
+        st.warning(f"⚠️ Every snapshot needs a ticket ID column ('#' or 'Ticket'); missing in: {', '.join(missing)}.")
+        return
+
+    chain = SnapshotChain({name: reports[name] for name in selected})
+    if len(chain.steps) > 1:
+        steps = chain.summary()
+        fig = px.bar(steps.reset_index(), x="Step", y=DIFF_CLASSES, barmode="stack",
+                     title="🔀 Ticket Changes per Snapshot Step")
+        fig.update_layout(xaxis_title="", yaxis_title="Tickets", legend_title="Change")
+        st.plotly_chart(fig, use_container_width=True)
+
+        col_steps, col_step_fields = st.columns(2)
+        with col_steps:
+            st.markdown("**Tickets per class and step**")
+            st.dataframe(steps, use_container_width=True)
+        with col_step_fields:
+            st.markdown("**Changes per field and step**")
+            st.dataframe(chain.field_changes(), use_container_width=True)
+
+        step = st.selectbox("Show step", chain.steps, index=len(chain.steps) - 1, key="diff_step")
+    else:
+        step = chain.steps[0]
+
+    diff = chain.diffs[chain.steps.index(step)]
+    summary = diff.summary()
+    for column, change in zip(st.columns(len(DIFF_CLASSES)), DIFF_CLASSES):
+        column.metric(change, f"{summary[change]:,}")
+
+    col_fields, col_transitions = st.columns(2)
+    with col_fields:
+        st.markdown("**Changes per field**")
+        st.dataframe(diff.field_changes(), use_container_width=True)
+    with col_transitions:
+        changed_fields = [field for field, count in diff.field_changes().items() if count > 0 and field != "close_time"]
+        if changed_fields:
+            field = st.selectbox("Transitions of", changed_fields, key="diff_transition_field")
+            st.dataframe(diff.transitions(field), use_container_width=True, hide_index=True)
+
+    change = st.selectbox("List tickets", DIFF_CLASSES, index=DIFF_CLASSES.index("Changed"), key="diff_class")
+    details = diff.details(change, limit=MAX_DIFF_ROWS)
+    if summary[change] > MAX_DIFF_ROWS:
+        st.caption(f"Showing the first {MAX_DIFF_ROWS:,} of {summary[change]:,} tickets.")
+    st.dataframe(details, use_container_width=True, hide_index=True)
+
+
+def compare_reports(uploaded_files, loaded=None):
+    """Main function to compare multiple reports (`loaded` may hold a precomputed read_reports result)."""
+    reports = load_and_clean_data(uploaded_files, loaded=loaded)
 
     if not reports:
         st.error("🚨 No valid data found in the uploaded reports.")
         return
 
+    mode = st.radio("View", ["Report summary", "Snapshot diff"], horizontal=True, key="comparison_mode")
+    if mode == "Snapshot diff":
+        st.subheader("🔀 Snapshot Diff")
+        plot_snapshot_diff(reports)
+        return
+
+    # One long frame + one grouped pass for every per-report metric
+    long_df = build_comparison_frame(reports)
+    summary = comparison_summary(long_df)
+
+    st.subheader("📑 Report Summary")
+    plot_comparison_summary(summary)
+
     st.subheader("📊 Total Requests")
-    plot_total_requests(reports)
+    plot_total_requests(summary)
 
     st.subheader("⏳ Response Time & Ticket Aging")
-    plot_response_time(reports)
+    plot_response_time(summary)
+    plot_aging_buckets(summary)
 
     st.subheader("📋 Aging Report (Minutes)")
-    plot_aging_report(reports)
+    plot_aging_report(long_df)
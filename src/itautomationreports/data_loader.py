@@ -2,6 +2,24 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from .caching import DATASET_FINGERPRINT_ATTR, frame_fingerprint
+from .readers import open_workbook, read_excel
+from .reopen import reopen_key
+from .schema_registry import (
+    HEADER_PROBE_ROWS, get_schema_registry, header_fingerprint, learn_schema, read_projected)
+
+# Expected column name mappings (normalize variations)
+COLUMN_MAPPING = {
+    "Request time": ["Request time", "Request Date", "Created Time", "Timestamp"],
+    "Ticket": ["#", "Ticket", "Request ID", "Incident ID", "Case Number"],  
+    "SLA": ["SLA", "SLA Compliance", "Met SLA"],  
+    "Close time": ["Close time", "Resolved Time", "Completion Date"],
+    "Due Date": ["Due Date", "SLA Due Date", "Deadline"],
+    "Category": ["Category", "Request Category"],
+    "Sub-Category": ["Sub-Category", "Request Sub-Category"],
+    "Process Manager": ["Process Manager", "Assigned Manager"]
+}
+
 def find_header_row(df):
     """Finds the row number that contains '#' or 'Ticket' to set as the header."""
     for i, row in df.iterrows():
@@ -24,7 +42,7 @@ def load_data(uploaded_files):
 
         try:
             # Open the Excel file and check for available sheets
-            xl = pd.ExcelFile(file)
+            xl = open_workbook(file)
             available_sheets = xl.sheet_names
 
             # Try loading "Data" or "Report" sheet (whichever is found first)
@@ -33,28 +51,17 @@ def load_data(uploaded_files):
                 print(f"🚨 No 'Data' or 'Report' sheet found in {file.name}! Available sheets: {available_sheets}")
                 continue  # Skip this file
 
-            df = pd.read_excel(xl, sheet_name=sheet_name, header=None)
-            print(f"✅ Loaded sheet: {sheet_name}")
+            df = read_sheet(xl, sheet_name)
+            print(f"✅ Loaded sheet: {sheet_name} (reader: {xl.engine})")
 
         except Exception as e:
             print(f"🚨 Error loading {file.name}: {e}")
             continue  # Skip this file if an error occurs
 
-        print("📊 First 10 rows before processing:\n", df.head(10))  # Debugging output
-
-        # Identify the row where "#" or "Ticket" is present as the header row
-        header_row = find_header_row(df)
-        if header_row is not None:
-            print(f"✅ Using row {header_row} as header in {file.name}.")
-            df.columns = df.iloc[header_row]  # Set the correct header
-            df = df.iloc[header_row + 1:].reset_index(drop=True)  # Remove extra rows
-        else:
+        if df is None:
             print(f"🚨 No '#' or 'Ticket' found in {file.name}! Skipping file.")
             continue  # Skip file if no header found
 
-        # Normalize column names (strip spaces and replace multiple spaces)
-        df.columns = df.columns.astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
-
         # Debugging: Verify cleaned column names
         print(f"📂 Available columns AFTER cleaning: {list(df.columns)}")
 
@@ -74,11 +81,56 @@ def load_data(uploaded_files):
     # Pass the combined data to cleaning function
     cleaned_df = clean_data(combined_df)
 
+    # Tag the dataset so engines can cache per dataset / filter state
+    cleaned_df.attrs[DATASET_FINGERPRINT_ATTR] = frame_fingerprint(cleaned_df)
+
     return cleaned_df, file_names
 
 
-import pandas as pd
-import numpy as np
+def read_sheet(xl, sheet_name):
+    """
+    Reads the data rows of a sheet with named columns (None when no header row is found).
+
+    The header is located in the first rows only and fingerprinted. Known
+    layouts go straight to a projected read of the dashboard's columns;
+    a new layout is read in full once, registered, then projected the same way.
+    """
+    registry = get_schema_registry()
+
+    probe = read_excel(xl, sheet_name=sheet_name, header=None, nrows=HEADER_PROBE_ROWS)
+    header_row = find_header_row(probe)
+    if header_row is not None:
+        fingerprint = header_fingerprint(sheet_name, header_row, probe.iloc[header_row])
+        entry = registry.get(fingerprint)
+        if entry is not None:
+            try:
+                df = read_projected(xl, entry)
+                print(f"✅ Known layout {fingerprint[:12]}: read {len(entry.usecols)} columns below row {header_row}.")
+                return df
+            except Exception as e:
+                print(f"🚨 Projected read failed for layout {fingerprint[:12]} ({e}); re-learning it.")
+                registry.forget(fingerprint)
+
+    df = read_excel(xl, sheet_name=sheet_name, header=None)
+    print("📊 First 10 rows before processing:\n", df.head(10))  # Debugging output
+
+    # Identify the row where "#" or "Ticket" is present as the header row
+    header_row = find_header_row(df)
+    if header_row is None:
+        return None
+    print(f"✅ Using row {header_row} as header.")
+
+    header = df.iloc[header_row]
+    data = df.iloc[header_row + 1:].reset_index(drop=True)  # Remove extra rows
+    entry = learn_schema(header_fingerprint(sheet_name, header_row, header), sheet_name, header_row, header, COLUMN_MAPPING, data)
+    registry.put(entry)
+    print(f"✅ Registered layout {entry.fingerprint[:12]} ({len(entry.usecols)} of {len(header)} columns used).")
+
+    # Same projection as later reads of this layout
+    data = data.iloc[:, entry.usecols].infer_objects()
+    data.columns = entry.names
+    return data.astype(entry.dtypes)
+
 
 def clean_data(df):
     """
@@ -97,21 +149,9 @@ def clean_data(df):
     # Debugging: Print available columns before renaming
     print("📂 Available columns BEFORE renaming:", df.columns)
 
-    # Expected column name mappings (normalize variations)
-    column_mapping = {
-        "Request time": ["Request time", "Request Date", "Created Time", "Timestamp"],
-        "Ticket": ["#", "Ticket", "Request ID", "Incident ID", "Case Number"],  
-        "SLA": ["SLA", "SLA Compliance", "Met SLA"],  
-        "Close time": ["Close time", "Resolved Time", "Completion Date"],
-        "Due Date": ["Due Date", "SLA Due Date", "Deadline"],
-        "Category": ["Category", "Request Category"],
-        "Sub-Category": ["Sub-Category", "Request Sub-Category"],
-        "Process Manager": ["Process Manager", "Assigned Manager"]
-    }
-
     # Rename columns to standard format
     new_columns = {}
-    for standard_name, variations in column_mapping.items():
+    for standard_name, variations in COLUMN_MAPPING.items():
         for variant in variations:
             if variant in df.columns:
                 new_columns[variant] = standard_name
@@ -168,6 +208,12 @@ def clean_data(df):
     # Drop completely empty rows
     df.dropna(how="all", inplace=True)
 
+    # ✅ Precompute the 64-bit reopen key (Request user, Category, Sub-Category, Title)
+    keys = reopen_key(df)
+    if keys is not None:
+        df["Reopen Key"] = keys
+        print("✅ 'Reopen Key' calculated successfully.")
+
     # Debugging: Final check of available columns
     print("📊 Final Processed Columns (After Adding Derived Columns):", list(df.columns))
 
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from .caching import DATASET_FINGERPRINT_ATTR
+
+# Global memory budget for cleaned datasets shared by all sessions of the server process
+DEFAULT_BUDGET_MB = int(os.environ.get("ITAR_DATASET_CACHE_MB", "1024"))
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    frame: pd.DataFrame
+    file_names: list
+    size_bytes: int
+    created: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    hits: int = 0
+
+
+def frame_nbytes(df):
+    """Deep memory usage of a DataFrame in bytes (object columns included)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def content_key(uploaded_files):
+    """Hashes the bytes of the uploaded files (in upload order) into a cache key."""
+    digest = hashlib.blake2b(digest_size=16)
+    for file in uploaded_files:
+        if hasattr(file, "getvalue"):
+            data = file.getvalue()
+        else:
+            position = file.tell()
+            data = file.read()
+            file.seek(position)
+        digest.update(hashlib.blake2b(data, digest_size=16).digest())
+        digest.update(file.name.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """
+    Process-wide LRU cache of cleaned datasets with a global memory budget.
+
+    Entries are keyed by the content hash of the source files, so analysts
+    uploading the same export share one copy. The size of every entry is
+    accounted when it is inserted, and least-recently-used entries are
+    evicted until the total fits the budget. Callers receive shallow copies,
+    so adding or replacing columns never touches the shared frame.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @property
+    def total_bytes(self):
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def get(self, key):
+        """Returns a shallow copy of the cached frame and its file names, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            entry.last_access = time.time()
+            return entry.frame.copy(deep=False), list(entry.file_names)
+
+    def put(self, key, frame, file_names):
+        """Stores a frame, evicting least-recently-used entries to stay within the budget."""
+        size = frame_nbytes(frame)
+        if size > self.budget_bytes:
+            print(f"🚨 Dataset {key[:12]} ({size / 1e6:.1f} MB) exceeds the cache budget; not cached.")
+            return False
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = CacheEntry(key=key, frame=frame, file_names=list(file_names), size_bytes=size)
+            while self.total_bytes > self.budget_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self.evictions += 1
+                print(f"♻️ Evicted dataset {evicted_key[:12]} ({evicted.size_bytes / 1e6:.1f} MB) from the cache.")
+        return True
+
+    def evict(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def summary(self):
+        """One row per resident dataset, most recently used first (for the admin view)."""
+        with self._lock:
+            rows = [
+                {
+                    "Key": entry.key[:12],
+                    "Files": ", ".join(entry.file_names),
+                    "Rows": len(entry.frame),
+                    "Size (MB)": round(entry.size_bytes / 1e6, 2),
+                    "Hits": entry.hits,
+                    "Last Access": pd.Timestamp(entry.last_access, unit="s").floor("s"),
+                }
+                for entry in reversed(self._entries.values())
+            ]
+        return pd.DataFrame(rows, columns=["Key", "Files", "Rows", "Size (MB)", "Hits", "Last Access"])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+
+_shared_cache = DatasetCache()
+
+
+def get_dataset_cache():
+    """Returns the dataset cache shared by every session of this process."""
+    return _shared_cache
+
+
+def load_cached_dataset(uploaded_files, loader, cache=None):
+    """
+    Returns (df, file_names) for the uploaded files, parsing them only on a cache miss.
+
+    `loader` is called as loader(uploaded_files) -> (cleaned df, file_names)
+    (e.g. data_loader.load_data) and its result is shared read-only with
+    every other session uploading the same files.
+    """
+    cache = _shared_cache if cache is None else cache
+    key = content_key(uploaded_files)
+
+    cached = cache.get(key)
+    if cached is not None:
+        print(f"✅ Dataset {key[:12]} served from the shared cache.")
+        return cached
+
+    df, file_names = loader(uploaded_files)
+    if df is None:
+        return df, file_names
+
+    df.attrs[DATASET_FINGERPRINT_ATTR] = key
+    cache.put(key, df, file_names)
+    return df.copy(deep=False), list(file_names)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+
+def ticket_axis(tickets):
+    """
+    Returns a numeric position for every ticket ID.
+
+    Numeric IDs are used as-is, IDs like "REQ0012345" use their digits, and
+    IDs without digits fall back to their rank in sorted order.
+    """
+    tickets = pd.Series(tickets).reset_index(drop=True)
+    numeric = pd.to_numeric(tickets, errors="coerce")
+    if numeric.notna().all():
+        return numeric.to_numpy(dtype=float)
+
+    digits = pd.to_numeric(tickets.astype(str).str.extract(r"(\d+)", expand=False), errors="coerce")
+    if digits.notna().all():
+        return digits.to_numpy(dtype=float)
+
+    codes, _ = pd.factorize(tickets.astype(str), sort=True)
+    return codes.astype(float)
+
+
+def minmax_decimate(x, y, n_bins, groups=None, x_range=None):
+    """
+    Picks at most 2 * n_bins points per group that preserve the shape of a scatter.
+
+    The x range is split into `n_bins` equal-width bins and, for every
+    (group, bin), the points with the smallest and the largest y are kept,
+    so spikes and dips survive while dense stretches are thinned. Points
+    outside `x_range` (lo, hi) are dropped. Returns the positions of the
+    kept points, sorted.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    groups = np.zeros(len(x), dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+
+    keep = ~(np.isnan(x) | np.isnan(y))
+    if x_range is not None:
+        keep &= (x >= x_range[0]) & (x <= x_range[1])
+    positions = np.flatnonzero(keep)
+    if len(positions) == 0 or n_bins <= 0:
+        return positions
+
+    xs = x[positions]
+    lo, hi = (x_range if x_range is not None else (xs.min(), xs.max()))
+    width = (hi - lo) or 1.0
+    bins = np.minimum(((xs - lo) / width * n_bins).astype(np.int64), n_bins - 1)
+    cells = groups[positions] * n_bins + bins
+
+    # Sort by (cell, y): the first and last point of every cell run are its min and max
+    order = np.lexsort((y[positions], cells))
+    sorted_cells = cells[order]
+    boundaries = np.flatnonzero(sorted_cells[1:] != sorted_cells[:-1])
+    firsts = np.r_[0, boundaries + 1]
+    lasts = np.r_[boundaries, len(order) - 1]
+    return np.unique(positions[order[np.r_[firsts, lasts]]])
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from .caching import LRUCache, frame_key
+from .calendar_bins import CALENDAR_AXES, CALENDAR_LAYOUTS, get_calendar_bins
+
+# Chart segments that can be drilled into
+DRILLDOWN_DIMENSIONS = ["Category", "Status", "Priority", "Process manager"]
+
+# Columns listed for the tickets of a segment (when present)
+DRILLDOWN_COLUMNS = [
+    "Ticket", "Request time", "Close time", "Status", "Priority", "Category", "Sub-Category",
+    "Process manager", "Request user", "Title", "Source",
+]
+
+# Tickets sent to the browser per drill-down table
+MAX_DRILLDOWN_ROWS = 5_000
+
+# Drill-down indexes per (dataset + filter state)
+_drilldown_cache = LRUCache(maxsize=16)
+
+
+class SegmentIndex:
+    """
+    Row positions of every segment, grouped CSR-style.
+
+    `positions` holds the row positions sorted by segment code (stable, so
+    rows keep their frame order) and segment i owns
+    positions[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, codes, n_segments, rows=None):
+        codes = np.asarray(codes, dtype=np.int64)
+        rows = np.arange(len(codes)) if rows is None else np.asarray(rows)
+        order = np.argsort(codes, kind="stable")
+        self.positions = rows[order]
+        self.offsets = np.r_[0, np.cumsum(np.bincount(codes, minlength=n_segments))]
+
+    @property
+    def counts(self):
+        return np.diff(self.offsets)
+
+    def take(self, segment):
+        return self.positions[self.offsets[segment]:self.offsets[segment + 1]]
+
+
+class DrillDownIndex:
+    """
+    Chart segment -> ticket row positions for one filtered frame.
+
+    Each breakdown column is factorized once (missing values become
+    "Unassigned") and grouped into a SegmentIndex; heatmap cells reuse the
+    calendar codes of the frame's CalendarBins. Listing a segment's tickets
+    is then a slice of precomputed positions and a single df.iloc take,
+    with no mask over the frame. Indexes are built on first use per
+    breakdown or layout.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._segments = {}
+        self._labels = {}
+        self._cells = {}
+
+    def _segment_index(self, dimension):
+        if dimension not in self._segments:
+            values = self.df[dimension].astype(object).where(lambda s: s.notna(), "Unassigned").to_numpy()
+            codes, labels = pd.factorize(values, sort=True)
+            self._labels[dimension] = pd.Index(labels, name=dimension)
+            self._segments[dimension] = SegmentIndex(codes, len(labels))
+        return self._segments[dimension]
+
+    def segments(self, dimension):
+        """Ticket count of every segment of `dimension`, largest first."""
+        index = self._segment_index(dimension)
+        counts = pd.Series(index.counts, index=self._labels[dimension], name="Tickets")
+        return counts.sort_values(ascending=False, kind="stable")
+
+    def positions(self, dimension, value):
+        """Row positions of the tickets in one segment (empty for an unknown value)."""
+        index = self._segment_index(dimension)
+        labels = self._labels[dimension]
+        if value not in labels:
+            return np.array([], dtype=np.int64)
+        return index.take(labels.get_loc(value))
+
+    def cell_positions(self, layout, row_label, col_label):
+        """Row positions of the tickets in one heatmap cell of a layout in CALENDAR_LAYOUTS."""
+        row_field, col_field = CALENDAR_LAYOUTS[layout]
+        n_cols = len(CALENDAR_AXES[col_field])
+        if layout not in self._cells:
+            calendar = get_calendar_bins(self.df)
+            cells = calendar.fields[row_field] * n_cols + calendar.fields[col_field]
+            n_cells = len(CALENDAR_AXES[row_field]) * n_cols
+            self._cells[layout] = SegmentIndex(cells, n_cells, rows=np.flatnonzero(calendar.valid))
+        cell = CALENDAR_AXES[row_field].index(row_label) * n_cols + CALENDAR_AXES[col_field].index(col_label)
+        return self._cells[layout].take(cell)
+
+    def tickets(self, positions, columns=DRILLDOWN_COLUMNS):
+        """The listed columns of the tickets at `positions`."""
+        return self.df.iloc[positions][[col for col in columns if col in self.df.columns]]
+
+
+def get_drilldown_index(df):
+    """Returns the cached DrillDownIndex of this frame (same dataset + filter state)."""
+    columns = [col for col in DRILLDOWN_DIMENSIONS + ["Request time"] if col in df.columns]
+    return _drilldown_cache.get_or_compute(frame_key(df, columns), lambda: DrillDownIndex(df))
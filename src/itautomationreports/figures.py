@@ -0,0 +1,91 @@
+import os
+import threading
+
+import streamlit as st
+
+from .lazy import lazy_import
+
+# Loaded with the first chart, like the plotting libraries in visualization.py
+mpl_figure = lazy_import("matplotlib.figure")
+backend_agg = lazy_import("matplotlib.backends.backend_agg")
+
+# Idle figures kept per chart type for reuse (0 disables pooling)
+FIGURE_POOL_SIZE = int(os.environ.get("ITAR_FIGURE_POOL_SIZE", "2"))
+
+
+class FigurePool:
+    """
+    Matplotlib figures for Streamlit charts, rendered and recycled deterministically.
+
+    plt.subplots registers every figure in pyplot's global figure manager,
+    which keeps it alive until plt.close; charts passed to st.pyplot were
+    never closed, so each rerun leaked its figures. Figures handed out here
+    are plain Figure objects on an Agg canvas, never registered with pyplot.
+    After rendering, a figure is cleared (axes, artists, subplot params)
+    and parked for the next chart of the same type, keeping its canvas and
+    renderer buffers; beyond `per_chart` idle figures it is simply dropped
+    and freed by the garbage collector.
+
+    Axes are created fresh on every acquire: charts add colorbars, twin
+    axes and date formatting that ax.clear() does not fully undo.
+    """
+
+    def __init__(self, per_chart=FIGURE_POOL_SIZE):
+        self.per_chart = per_chart
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, chart, figsize, nrows=1, ncols=1):
+        """Returns (fig, axes) for one render of `chart`, like plt.subplots(nrows, ncols, figsize=figsize)."""
+        with self._lock:
+            idle = self._idle.get(chart)
+            fig = idle.pop() if idle else None
+            if fig is None:
+                self.created += 1
+            else:
+                self.reused += 1
+        if fig is None:
+            fig = mpl_figure.Figure(figsize=figsize)
+            backend_agg.FigureCanvasAgg(fig)
+            fig._itar_chart = chart
+        else:
+            fig.set_size_inches(figsize)
+        return fig, fig.subplots(nrows, ncols)
+
+    def release(self, fig):
+        """Clears a figure and parks it for reuse (or drops it when the pool for its chart is full)."""
+        fig.clear()
+        chart = getattr(fig, "_itar_chart", None)
+        if chart is None:
+            return
+        with self._lock:
+            idle = self._idle.setdefault(chart, [])
+            if len(idle) < self.per_chart:
+                idle.append(fig)
+
+    def idle_count(self):
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+
+_pool = FigurePool()
+
+
+def get_figure_pool():
+    """Returns the process-wide figure pool."""
+    return _pool
+
+
+def new_figure(chart, figsize, nrows=1, ncols=1):
+    """Drop-in for plt.subplots(figsize=...) in chart functions; pair every call with show_figure."""
+    return _pool.acquire(chart, figsize, nrows, ncols)
+
+
+def show_figure(fig):
+    """Renders a figure with st.pyplot, then releases it (even when rendering fails)."""
+    try:
+        st.pyplot(fig)
+    finally:
+        _pool.release(fig)
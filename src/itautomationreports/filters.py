@@ -1,10 +1,21 @@
 import pandas as pd
 
+# Look-back window (in days) for each time period option
+TIME_PERIOD_DAYS = {
+    "Last 90 Days": 90,
+    "Last 30 Days": 30,
+    "Last 7 Days": 7,
+}
+
+def time_filter_start(period):
+    """Returns the earliest 'Request time' kept by the given period (None for 'All Time')."""
+    days = TIME_PERIOD_DAYS.get(period)
+    if days is None:
+        return None
+    return pd.Timestamp.now() - pd.Timedelta(days=days)
+
 def filter_by_time(df, period):
-    if period == "Last 90 Days":
-        return df[df['Request time'] >= pd.Timestamp.now() - pd.Timedelta(days=90)]
-    elif period == "Last 30 Days":
-        return df[df['Request time'] >= pd.Timestamp.now() - pd.Timedelta(days=30)]
-    elif period == "Last 7 Days":
-        return df[df['Request time'] >= pd.Timestamp.now() - pd.Timedelta(days=7)]
+    start = time_filter_start(period)
+    if start is not None:
+        return df[df['Request time'] >= start]
     return df
@@ -0,0 +1,268 @@
+import argparse
+import io
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+import pandas as pd
+
+from .caching import DATASET_FINGERPRINT_ATTR
+from .calendar_bins import get_calendar_bins
+from .data_loader import load_data
+from .dataset_cache import content_key, get_dataset_cache
+from .resample import get_time_index
+from .search import get_search_index
+from .shared_snapshots import arrow_compatible
+from .sketches import get_sketch_store
+from .topk import get_ranker
+
+# Directory the ticketing system drops its exports into (ingestion is off when unset)
+WATCH_DIR = os.environ.get("ITAR_WATCH_DIR", "")
+
+# Where the columnar snapshots and the manifest are written (defaults to <watch dir>/.snapshots)
+SNAPSHOT_DIR = os.environ.get("ITAR_SNAPSHOT_DIR", "")
+
+POLL_SECONDS = float(os.environ.get("ITAR_WATCH_POLL_SECONDS", "30"))
+
+# A file must be left unchanged this long before it is ingested (exports may still be being written)
+SETTLE_SECONDS = float(os.environ.get("ITAR_WATCH_SETTLE_SECONDS", "5"))
+
+WATCHED_EXTENSIONS = (".xlsx", ".xls")
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass
+class SnapshotEntry:
+    """One ingested workbook and the snapshot it was written to."""
+    file_name: str
+    key: str  # Content key of the workbook (same key the upload cache uses)
+    mtime_ns: int
+    size: int
+    rows: int
+    snapshot: str  # Snapshot file name inside the snapshot directory
+    ingested: float
+
+
+def _upload(path):
+    """Reads a workbook into an in-memory file that looks like a Streamlit upload."""
+    with open(path, "rb") as handle:
+        buffer = io.BytesIO(handle.read())
+    buffer.name = os.path.basename(path)
+    return buffer
+
+
+def prewarm(df):
+    """Builds the engine indexes the dashboard's default view (all sources, all time) reads first."""
+    get_sketch_store(df)
+    get_calendar_bins(df)
+    get_time_index(df)
+    get_ranker(df)
+    get_search_index(df)
+
+
+class WatchFolderIngestor:
+    """
+    Ingests workbooks dropped into a directory into Parquet snapshots.
+
+    Every poll lists the directory and compares each workbook's
+    (mtime, size) with the manifest. New or changed files that have
+    settled are parsed once with load_data/clean_data, written to
+    `<content key>.parquet` and recorded in the manifest. A snapshot is
+    loaded into the shared DatasetCache with its engine indexes
+    pre-warmed, so opening it from the dashboard skips parsing entirely.
+    The manifest lives next to the snapshots, so a restarted server (or
+    a separate ingestion process) picks up earlier work.
+    """
+
+    def __init__(self, watch_dir, snapshot_dir=None, cache=None, poll_seconds=POLL_SECONDS,
+                 settle_seconds=SETTLE_SECONDS):
+        self.watch_dir = watch_dir
+        self.snapshot_dir = snapshot_dir or os.path.join(watch_dir, ".snapshots")
+        self.cache = cache if cache is not None else get_dataset_cache()
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+        self._entries = self._read_manifest()
+        self._failed = {}  # File name -> (mtime_ns, size) of a version that failed or held no tickets
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.snapshot_dir, MANIFEST_NAME)
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as handle:
+                return {name: SnapshotEntry(**entry) for name, entry in json.load(handle).items()}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, TypeError) as e:
+            print(f"🚨 Ignoring unreadable ingestion manifest {self.manifest_path}: {e}")
+            return {}
+
+    def _write_manifest(self):
+        # Written to a temporary file and renamed, so readers never see a partial manifest
+        temporary = self.manifest_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump({name: asdict(entry) for name, entry in self._entries.items()}, handle, indent=2)
+        os.replace(temporary, self.manifest_path)
+
+    def pending(self):
+        """Workbooks in the watch directory that are new or changed since their last ingestion."""
+        if not os.path.isdir(self.watch_dir):
+            print(f"🚨 Watch directory {self.watch_dir} does not exist.")
+            return []
+        now = time.time()
+        pending = []
+        for name in sorted(os.listdir(self.watch_dir)):
+            path = os.path.join(self.watch_dir, name)
+            if not name.lower().endswith(WATCHED_EXTENSIONS) or name.startswith("~$") or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            if now - stat.st_mtime < self.settle_seconds:
+                continue  # Still being written
+            if self._failed.get(name) == (stat.st_mtime_ns, stat.st_size):
+                continue  # Not retried until the file changes
+            entry = self._entries.get(name)
+            if entry is None or (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+                pending.append(path)
+        return pending
+
+    def ingest(self, path):
+        """Parses one workbook, writes its snapshot and pre-warms it (None when the file holds no tickets)."""
+        stat = os.stat(path)
+        upload = _upload(path)
+        key = content_key([upload])
+
+        df, _ = load_data([upload])
+        if df is None or df.empty:
+            print(f"🚨 No tickets found in {upload.name}; nothing ingested.")
+            return None
+
+        # Cached in the form read back from the snapshot (e.g. after a restart), so both serve one frame
+        df = arrow_compatible(df)
+        snapshot = f"{key}.parquet"
+        temporary = os.path.join(self.snapshot_dir, snapshot + ".tmp")
+        df.to_parquet(temporary, index=False)
+        os.replace(temporary, os.path.join(self.snapshot_dir, snapshot))
+
+        entry = SnapshotEntry(upload.name, key, stat.st_mtime_ns, stat.st_size, len(df), snapshot, time.time())
+        with self._lock:
+            previous = self._entries.get(upload.name)
+            self._entries[upload.name] = entry
+            self._write_manifest()
+        if previous is not None and previous.snapshot != snapshot:
+            self.cache.evict(previous.key)
+            if not any(other.snapshot == previous.snapshot for other in self._entries.values()):
+                try:
+                    os.remove(os.path.join(self.snapshot_dir, previous.snapshot))
+                except FileNotFoundError:
+                    pass
+
+        df.attrs[DATASET_FINGERPRINT_ATTR] = key
+        self._warm(entry, df)
+        print(f"✅ Ingested {upload.name}: {len(df)} rows -> {snapshot}")
+        return entry
+
+    def poll_once(self):
+        """Ingests every pending workbook and returns the new manifest entries."""
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        with self._lock:
+            self._entries = self._read_manifest()  # Picks up files ingested by another process
+        ingested = []
+        for path in self.pending():
+            stat = os.stat(path)
+            try:
+                entry = self.ingest(path)
+            except Exception as e:
+                print(f"🚨 Error ingesting {path}: {e}")
+                entry = None
+            if entry is None:
+                self._failed[os.path.basename(path)] = (stat.st_mtime_ns, stat.st_size)
+            else:
+                ingested.append(entry)
+        return ingested
+
+    def _warm(self, entry, df):
+        self.cache.put(entry.key, df, [entry.file_name])
+        prewarm(df)
+
+    def datasets(self):
+        """Ingested workbooks, most recently ingested first."""
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda entry: entry.ingested, reverse=True)
+
+    def open(self, entry):
+        """Returns (df, file_names) for an ingested workbook, reading its snapshot only if it is not cached."""
+        cached = self.cache.get(entry.key)
+        if cached is not None:
+            return cached
+
+        df = pd.read_parquet(os.path.join(self.snapshot_dir, entry.snapshot))
+        df.attrs[DATASET_FINGERPRINT_ATTR] = entry.key
+        self._warm(entry, df)
+        return df.copy(deep=False), [entry.file_name]
+
+    def run(self):
+        """Polls until stop() is called."""
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"🚨 Ingestion poll failed: {e}")
+            self._stop.wait(self.poll_seconds)
+
+    def start(self):
+        """Starts polling on a daemon thread (no-op when already running)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="itar-ingest", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+_ingestor = None
+_ingestor_lock = threading.Lock()
+
+
+def get_ingestor():
+    """Returns the process-wide ingestor watching ITAR_WATCH_DIR, started on first use (None when unset)."""
+    global _ingestor
+    if not WATCH_DIR:
+        return None
+    with _ingestor_lock:
+        if _ingestor is None:
+            _ingestor = WatchFolderIngestor(WATCH_DIR, SNAPSHOT_DIR or None).start()
+        return _ingestor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest ticket exports from a watch directory into snapshots.")
+    parser.add_argument("watch_dir", nargs="?", default=WATCH_DIR, help="Directory to watch (default: $ITAR_WATCH_DIR)")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR or None, help="Snapshot directory (default: <watch_dir>/.snapshots)")
+    parser.add_argument("--poll-seconds", type=float, default=POLL_SECONDS)
+    parser.add_argument("--once", action="store_true", help="Ingest pending files once and exit")
+    args = parser.parse_args(argv)
+    if not args.watch_dir:
+        parser.error("a watch directory is required (argument or ITAR_WATCH_DIR)")
+
+    ingestor = WatchFolderIngestor(args.watch_dir, args.snapshot_dir, poll_seconds=args.poll_seconds)
+    if args.once:
+        ingestor.poll_once()
+        return
+    try:
+        ingestor.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+    `plt = LazyModule("matplotlib.pyplot")` behaves like
+    `import matplotlib.pyplot as plt`, except that the import cost is only
+    paid when a chart actually uses `plt.<something>`.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Returns a LazyModule for `name` (the module is imported on first use)."""
+    return LazyModule(name)
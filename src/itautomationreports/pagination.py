@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from .caching import LRUCache, frame_key
+from .drilldown import DRILLDOWN_COLUMNS
+
+# Columns shown by default in the ticket browser (when present)
+BROWSER_COLUMNS = DRILLDOWN_COLUMNS + ["Ticket Aging", "Response Time"]
+
+# Rows per page offered by the browser
+PAGE_SIZES = [25, 50, 100, 250]
+
+# Row subsets offered by the browser: open tickets, optionally older than N days
+AGING_VIEWS = {"All tickets": None, "Open tickets": 0, "Open > 30 days": 30, "Open > 60 days": 60, "Open > 90 days": 90}
+
+# Pagers per (dataset + filter state)
+_pager_cache = LRUCache(maxsize=16)
+
+
+class TicketPager:
+    """
+    Sorted, paginated access to the rows of one filtered frame.
+
+    Sorting a column factorizes it once (sorted labels, missing values last)
+    and argsorts the integer codes; the resulting row order is cached per
+    (column, direction), so flipping pages or switching back to an earlier
+    sort costs a slice. Only the rows and columns of the visible page are
+    taken from the frame.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._codes = {}
+        self._orders = {}
+        self._subsets = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def _sort_codes(self, column):
+        if column not in self._codes:
+            values = self.df[column]
+            try:
+                codes, labels = pd.factorize(values, sort=True)
+            except TypeError:  # Mixed types (e.g. numeric and text ticket IDs) sort as text
+                codes, labels = pd.factorize(values.where(values.isna(), values.astype(str)), sort=True)
+            self._codes[column] = (codes, len(labels))
+        return self._codes[column]
+
+    def order(self, column=None, ascending=True):
+        """Row positions sorted by `column` (frame order when None); ties keep frame order, missing values last."""
+        if column is None:
+            return np.arange(len(self.df))
+        key = (column, ascending)
+        if key not in self._orders:
+            codes, n_labels = self._sort_codes(column)
+            ranks = codes if ascending else n_labels - 1 - codes
+            ranks = np.where(codes < 0, n_labels, ranks)
+            self._orders[key] = np.argsort(ranks, kind="stable")
+        return self._orders[key]
+
+    def subset(self, view):
+        """Boolean row mask of one of AGING_VIEWS (None for every row)."""
+        min_age = AGING_VIEWS[view]
+        if min_age is None or "Close time" not in self.df.columns:
+            return None
+        if view not in self._subsets:
+            mask = self.df["Close time"].isna().to_numpy().copy()
+            if min_age > 0 and "Ticket Aging" in self.df.columns:
+                mask &= self.df["Ticket Aging"].to_numpy() > min_age
+            self._subsets[view] = mask
+        return self._subsets[view]
+
+    def rows(self, column=None, ascending=True, view="All tickets"):
+        """Sorted row positions of a view."""
+        order = self.order(column, ascending)
+        mask = self.subset(view)
+        return order if mask is None else order[mask[order]]
+
+    def page(self, rows, page, page_size, columns=None):
+        """The requested columns of page `page` (0-based) of `rows`."""
+        columns = [col for col in (columns or self.df.columns) if col in self.df.columns]
+        positions = rows[page * page_size:(page + 1) * page_size]
+        return self.df.iloc[positions][columns]
+
+
+def page_count(n_rows, page_size):
+    """Number of pages needed for `n_rows` (at least one, so an empty view still has a page)."""
+    return max(1, -(-n_rows // page_size))
+
+
+def get_ticket_pager(df):
+    """Returns the cached TicketPager of this frame (same dataset + filter state)."""
+    return _pager_cache.get_or_compute(frame_key(df), lambda: TicketPager(df))
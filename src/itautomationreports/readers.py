@@ -0,0 +1,132 @@
+import importlib.util
+import os
+from datetime import datetime
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+# Forces one backend for every workbook (e.g. "openpyxl-readonly"); empty for automatic selection
+FORCED_BACKEND = os.environ.get("ITAR_EXCEL_READER", "")
+
+# Excel stores timestamps as fractional days, which backends convert with different sub-second
+# rounding; every timestamp read is rounded to this resolution so all backends agree
+DATETIME_RESOLUTION = "s"
+
+# Cell types of the timestamps backends return in object (mixed) columns
+DATETIME_TYPES = [datetime, pd.Timestamp]
+
+_ZIP_MAGIC = b"PK\x03\x04"  # .xlsx / .xlsm
+_OLE_MAGIC = b"\xd0\xcf\x11\xe0"  # Legacy .xls
+
+
+@dataclass(frozen=True)
+class ExcelBackend:
+    """A pandas Excel engine plus the options it is opened with."""
+    name: str
+    engine: str
+    module: str  # Module that must be importable for the backend to be available
+    extensions: tuple
+    engine_kwargs: dict = field(default_factory=dict)
+
+    def available(self):
+        return importlib.util.find_spec(self.module) is not None
+
+    def open(self, source):
+        return pd.ExcelFile(source, engine=self.engine, engine_kwargs=dict(self.engine_kwargs))
+
+
+# Fastest first: the first available backend that handles a file type is used for it
+READER_BACKENDS = {
+    "calamine": ExcelBackend("calamine", "calamine", "python_calamine", (".xlsx", ".xlsm", ".xls")),
+    "openpyxl-readonly": ExcelBackend(
+        "openpyxl-readonly", "openpyxl", "openpyxl", (".xlsx", ".xlsm"), {"read_only": True}),
+    "openpyxl": ExcelBackend("openpyxl", "openpyxl", "openpyxl", (".xlsx", ".xlsm"), {"read_only": False}),
+    "xlrd": ExcelBackend("xlrd", "xlrd", "xlrd", (".xls",)),
+}
+
+
+def file_extension(source):
+    """Extension of a workbook, from its leading bytes when readable (uploads may be misnamed), else its name."""
+    head = b""
+    if hasattr(source, "read"):
+        position = source.tell()
+        head = source.read(len(_ZIP_MAGIC))
+        source.seek(position)
+    elif isinstance(source, (str, os.PathLike)) and os.path.isfile(source):
+        with open(source, "rb") as handle:
+            head = handle.read(len(_ZIP_MAGIC))
+
+    if head == _ZIP_MAGIC:
+        return ".xlsx"
+    if head == _OLE_MAGIC:
+        return ".xls"
+    name = getattr(source, "name", source)
+    return os.path.splitext(str(name))[1].lower() or ".xlsx"
+
+
+def candidate_backends(source, forced=FORCED_BACKEND):
+    """Available backends for this workbook's type, fastest first (a forced backend is tried first)."""
+    extension = file_extension(source)
+    candidates = [
+        backend for backend in READER_BACKENDS.values()
+        if extension in backend.extensions and backend.available()
+    ]
+    if forced in READER_BACKENDS:
+        candidates.sort(key=lambda backend: backend.name != forced)
+    return candidates
+
+
+def open_workbook(source, backend=None):
+    """
+    Opens a workbook as a pd.ExcelFile with the fastest backend that can read it.
+
+    `backend` names an entry of READER_BACKENDS to use instead of the
+    automatic choice. When a backend fails to open the file, the next one
+    is tried.
+    """
+    backends = [READER_BACKENDS[backend]] if backend is not None else candidate_backends(source)
+    if not backends:
+        return pd.ExcelFile(source)  # No known backend: let pandas pick (and raise a helpful error)
+
+    for position, candidate in enumerate(backends):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        try:
+            return candidate.open(source)
+        except Exception as e:
+            if position == len(backends) - 1:
+                raise
+            print(f"🚨 {candidate.name} could not open {getattr(source, 'name', 'workbook')} ({e}); trying the next reader.")
+
+
+def _round_timestamps(values):
+    """
+    Rounds the datetime cells of an object column (other cells are left untouched).
+
+    The datetime cells are found by cell type, so numbers and digit strings
+    that happen to parse as dates (2024, "20250101") are never converted;
+    only those cells go through one vectorized pd.to_datetime pass.
+    """
+    is_timestamp = values.map(type).isin(DATETIME_TYPES).to_numpy()
+    if not is_timestamp.any():
+        return values
+    rounded = values.to_numpy(copy=True)
+    stamps = pd.to_datetime(values[is_timestamp])
+    rounded[is_timestamp] = stamps.dt.round(DATETIME_RESOLUTION).astype(object).to_numpy()
+    return pd.Series(rounded, index=values.index, name=values.name, dtype=object)
+
+
+def normalize_timestamps(df):
+    """Rounds datetime columns and datetime cells of mixed columns to DATETIME_RESOLUTION."""
+    for col in df.columns:
+        values = df[col]
+        if values.dtype.kind == "M":
+            df[col] = values.dt.round(DATETIME_RESOLUTION)
+        elif values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ("datetime", "mixed", "mixed-integer"):
+            df[col] = _round_timestamps(values)
+    return df
+
+
+def read_excel(xl, **kwargs):
+    """pd.read_excel on an opened workbook, with timestamps normalized so every backend returns the same frame."""
+    return normalize_timestamps(pd.read_excel(xl, **kwargs))
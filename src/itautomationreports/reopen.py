@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# Columns identifying "the same request" raised again by the same user
+REOPEN_KEY_COLUMNS = ["Request user", "Category", "Sub-Category", "Title"]
+
+_NAT = np.iinfo(np.int64).min
+_NS_PER_DAY = 86_400_000_000_000
+
+
+def reopen_key(df):
+    """
+    Hashes the reopen key columns into a single 64-bit key per row.
+
+    Values are stripped and lower-cased first so that trivial formatting
+    differences do not split a request into several keys. Returns None
+    when any of the key columns is missing.
+    """
+    if not set(REOPEN_KEY_COLUMNS).issubset(df.columns):
+        return None
+
+    normalized = pd.DataFrame({
+        col: df[col].astype(str).str.strip().str.lower() for col in REOPEN_KEY_COLUMNS
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+def detect_reopens(df, window_days=7):
+    """
+    Links tickets that were raised again within `window_days` after the
+    previous ticket with the same key was closed.
+
+    Rows are sorted once by (key, "Request time") and every ticket is
+    compared with its predecessor only, so the cost is one sort plus a
+    linear pass. Uses the precomputed "Reopen Key" column when present.
+
+    Returns a copy of `df` with:
+    - "Reopened": the ticket reopens the previous ticket of its chain
+    - "Reopen Chain": id shared by all tickets of a chain
+    - "Chain Position": 0 for the original ticket, 1 for the first reopen, ...
+    """
+    keys = df["Reopen Key"].to_numpy(dtype=np.uint64) if "Reopen Key" in df.columns else reopen_key(df)
+    if keys is None or "Request time" not in df.columns:
+        return None
+
+    start = pd.to_datetime(df["Request time"], errors="coerce").to_numpy(dtype="datetime64[ns]").view("i8")
+    if "Close time" in df.columns:
+        close = pd.to_datetime(df["Close time"], errors="coerce").to_numpy(dtype="datetime64[ns]").view("i8")
+    else:
+        close = np.full(len(df), _NAT, dtype=np.int64)
+
+    # Single sort: by key, then by request time within each key
+    order = np.lexsort((start, keys))
+    k, s, c = keys[order], start[order], close[order]
+
+    reopened = np.zeros(len(order), dtype=bool)
+    if len(order) > 1:
+        prev_close = c[:-1]
+        gap = s[1:] - prev_close
+        reopened[1:] = (
+            (k[1:] == k[:-1])
+            & (prev_close != _NAT)
+            & (s[1:] != _NAT)
+            & (gap >= 0)
+            & (gap <= window_days * _NS_PER_DAY)
+        )
+
+    # Every non-reopened ticket starts a new chain
+    chain_start = ~reopened
+    chain_id = np.cumsum(chain_start) - 1
+    positions = np.arange(len(order))
+    chain_position = positions - np.maximum.accumulate(np.where(chain_start, positions, 0))
+
+    # Scatter the sorted results back to the original row order
+    result = df.copy()
+    for col, values in (("Reopened", reopened), ("Reopen Chain", chain_id), ("Chain Position", chain_position)):
+        column = np.empty_like(values)
+        column[order] = values
+        result[col] = column
+    return result
+
+
+def reopen_chains(reopens, min_length=2):
+    """Summarises every chain with at least `min_length` tickets, longest first."""
+    chain_sizes = reopens["Reopen Chain"].map(reopens["Reopen Chain"].value_counts())
+    chained = reopens[chain_sizes >= min_length]
+    if chained.empty:
+        return pd.DataFrame(columns=["Reopen Chain", "Tickets", "Reopens", "First Request", "Last Close"])
+
+    agg = {
+        "Tickets": ("Reopen Chain", "size"),
+        "Reopens": ("Reopened", "sum"),
+        "First Request": ("Request time", "min"),
+    }
+    if "Close time" in chained.columns:
+        agg["Last Close"] = ("Close time", "max")
+    for col in REOPEN_KEY_COLUMNS:
+        agg[col] = (col, "first")
+    if "Ticket" in chained.columns:
+        agg["Ticket IDs"] = ("Ticket", lambda s: ", ".join(s.astype(str)))
+
+    chains = chained.sort_values("Request time").groupby("Reopen Chain").agg(**agg).reset_index()
+    return chains.sort_values(["Tickets", "First Request"], ascending=[False, True]).reset_index(drop=True)
+
+
+def reopen_rates(reopens, by):
+    """Share of tickets per `by` group that reopen a previously closed request."""
+    if by not in reopens.columns:
+        return pd.DataFrame(columns=[by, "Tickets", "Reopened", "Reopen Rate (%)"])
+
+    rates = reopens.groupby(reopens[by].fillna("Unassigned")).agg(
+        Tickets=("Reopened", "size"),
+        Reopened=("Reopened", "sum"),
+    ).reset_index()
+    rates["Reopen Rate (%)"] = rates["Reopened"] / rates["Tickets"] * 100
+    return rates.sort_values("Reopen Rate (%)", ascending=False).reset_index(drop=True)
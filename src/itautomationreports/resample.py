@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from .caching import LRUCache, frame_key
+
+# Granularities offered by the trend charts (hourly bins are used by the backlog engine)
+TREND_GRANULARITIES = ["Day", "Week", "Month", "Quarter"]
+GRANULARITIES = ["Hour"] + TREND_GRANULARITIES
+
+_NAT = np.iinfo(np.int64).min
+_NS_PER_HOUR = 3_600_000_000_000
+_NS_PER_DAY = 86_400_000_000_000
+_WEEK_OFFSET_DAYS = 3  # 1970-01-01 is a Thursday; shifting by 3 days starts weeks on Monday
+
+# Time indexes per (dataset + filter state, column)
+_index_cache = LRUCache(maxsize=16)
+
+
+def to_int64(values):
+    """Returns datetime values as int64 nanoseconds since the epoch (NaT stays as the int64 minimum)."""
+    return pd.to_datetime(values, errors="coerce").to_numpy(dtype="datetime64[ns]").view("i8")
+
+
+def bin_codes(ns, granularity):
+    """
+    Maps int64 nanosecond timestamps to integer bin ids with integer arithmetic only.
+
+    Hours and days are floor divisions, weeks are Monday-aligned day groups,
+    and months/quarters come from the datetime64[M] cast, so no strings or
+    Period objects are created per row.
+    """
+    if granularity == "Hour":
+        return ns // _NS_PER_HOUR
+    if granularity == "Day":
+        return ns // _NS_PER_DAY
+    if granularity == "Week":
+        return (ns // _NS_PER_DAY + _WEEK_OFFSET_DAYS) // 7
+    months = ns.view("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+    if granularity == "Month":
+        return months
+    if granularity == "Quarter":
+        return months // 3
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def bin_starts(codes, granularity):
+    """Returns the start timestamp of every bin id as a DatetimeIndex."""
+    codes = np.asarray(codes, dtype=np.int64)
+    if granularity == "Hour":
+        starts = (codes * _NS_PER_HOUR).view("datetime64[ns]")
+    elif granularity == "Day":
+        starts = (codes * _NS_PER_DAY).view("datetime64[ns]")
+    elif granularity == "Week":
+        starts = ((codes * 7 - _WEEK_OFFSET_DAYS) * _NS_PER_DAY).view("datetime64[ns]")
+    elif granularity == "Month":
+        starts = codes.astype("datetime64[M]").astype("datetime64[ns]")
+    elif granularity == "Quarter":
+        starts = (codes * 3).astype("datetime64[M]").astype("datetime64[ns]")
+    else:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    return pd.DatetimeIndex(starts, name=granularity)
+
+
+def bin_labels(index, granularity):
+    """Short axis labels for bin start timestamps."""
+    if granularity == "Hour":
+        return index.strftime("%Y-%m-%d %H:00")
+    if granularity in ("Day", "Week"):
+        return index.strftime("%Y-%m-%d")
+    if granularity == "Month":
+        return index.strftime("%Y-%m")
+    return [f"{ts.year}Q{(ts.month - 1) // 3 + 1}" for ts in index]
+
+
+class TimeSeriesIndex:
+    """
+    One sorted int64 timestamp array reused for every granularity.
+
+    Timestamps are sorted once. Because binning is monotonic, the bins of
+    a sorted array are contiguous runs, so counts and per-bin aggregates
+    are run boundaries plus np.add.reduceat, without regrouping the rows.
+    """
+
+    def __init__(self, timestamps):
+        ns = to_int64(timestamps)
+        valid = np.flatnonzero(ns != _NAT)
+        order = np.argsort(ns[valid], kind="stable")
+        self.rows = valid[order]  # Original row positions in sorted order
+        self.sorted_ns = ns[self.rows]
+        self._runs = {}
+
+    def __len__(self):
+        return len(self.sorted_ns)
+
+    def _bin_runs(self, granularity):
+        """Returns (bin ids, run starts) of the sorted timestamps for a granularity."""
+        if granularity not in self._runs:
+            codes = bin_codes(self.sorted_ns, granularity)
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=np.int64)
+            self._runs[granularity] = (codes[starts], starts)
+        return self._runs[granularity]
+
+    def _full_range(self, bins, values, fill_value):
+        """Spreads per-bin values over a continuous range of bins (gaps get `fill_value`)."""
+        if len(bins) == 0:
+            return np.array([], dtype=np.int64), np.array([])
+        all_bins = np.arange(bins[0], bins[-1] + 1)
+        full = np.full(len(all_bins), fill_value, dtype=np.result_type(values, type(fill_value)))
+        full[bins - bins[0]] = values
+        return all_bins, full
+
+    def counts(self, granularity, fill_gaps=True):
+        """Number of timestamps per bin, indexed by bin start."""
+        bins, starts = self._bin_runs(granularity)
+        counts = np.diff(np.r_[starts, len(self.sorted_ns)])
+        if fill_gaps:
+            bins, counts = self._full_range(bins, counts, 0)
+        return pd.Series(counts, index=bin_starts(bins, granularity), name="Count")
+
+    def aggregate(self, values, granularity, how="mean", fill_gaps=True):
+        """
+        Aggregates `values` (aligned with the original rows) per bin.
+
+        `how` is "sum" or "mean"; NaN values are ignored.
+        """
+        bins, starts = self._bin_runs(granularity)
+        if len(bins) == 0:
+            return pd.Series(dtype=float, index=bin_starts(bins, granularity))
+
+        sorted_values = np.asarray(values, dtype=float)[self.rows]
+        known = ~np.isnan(sorted_values)
+        sums = np.add.reduceat(np.where(known, sorted_values, 0.0), starts)
+        if how == "sum":
+            result = sums
+        elif how == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result = sums / np.add.reduceat(known.astype(np.int64), starts)
+        else:
+            raise ValueError(f"Unsupported aggregation: {how}")
+
+        if fill_gaps:
+            bins, result = self._full_range(bins, result, 0.0 if how == "sum" else np.nan)
+        return pd.Series(result, index=bin_starts(bins, granularity))
+
+
+def get_time_index(df, column="Request time"):
+    """Returns the cached TimeSeriesIndex of `column` for this frame (same dataset + filter state)."""
+    key = (frame_key(df, [column]), column)
+    return _index_cache.get_or_compute(key, lambda: TimeSeriesIndex(df[column]))
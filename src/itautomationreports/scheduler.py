@@ -0,0 +1,112 @@
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+
+# Worker threads shared by every session of the server process
+MAX_WORKERS = int(os.environ.get("ITAR_SCHEDULER_WORKERS", "4"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="itar-precompute")
+        return _executor
+
+
+class BackgroundScheduler:
+    """
+    Precomputes aggregates for off-screen sections on a shared thread pool.
+
+    Jobs belong to a generation (the filter state they were computed for).
+    Scheduling a new generation cancels every job of the previous one that
+    has not started yet, and results of stale jobs are never returned.
+    Jobs must be pure functions: they run without a Streamlit script
+    context, so they must not call st.* themselves.
+    """
+
+    def __init__(self, executor=None):
+        self._executor = executor
+        self.generation = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        return self._executor or _get_executor()
+
+    def schedule(self, generation, jobs):
+        """
+        Submits `jobs` ({name: (fn, *args)}) for the given generation.
+
+        Jobs already submitted for the same generation are not resubmitted,
+        so calling this on every rerun is cheap.
+        """
+        with self._lock:
+            if generation != self.generation:
+                self._cancel_all()
+                self.generation = generation
+
+            for name, (fn, *args) in jobs.items():
+                if name not in self._futures:
+                    self._futures[name] = self.executor.submit(fn, *args)
+
+    def result(self, name, fn, *args):
+        """
+        Returns the precomputed result for `name`, or computes it inline.
+
+        A job that is already running is waited for, since that is faster
+        than starting over. A job that has not started yet is cancelled and
+        computed on the calling thread instead; that result is kept for the
+        job, so later calls in the same generation do not compute it again.
+        """
+        with self._lock:
+            future = self._futures.get(name)
+
+        if future is not None and (future.running() or future.done() or not future.cancel()):
+            try:
+                return future.result()
+            except CancelledError:
+                pass
+            except Exception as e:
+                print(f"🚨 Background job '{name}' failed, recomputing: {e}")
+                future = None
+
+        value = fn(*args)
+        if future is not None:
+            with self._lock:
+                if self._futures.get(name) is future:
+                    self._futures[name] = _completed(value)
+        return value
+
+    def is_ready(self, name):
+        """True when the job for `name` has finished successfully."""
+        future = self._futures.get(name)
+        return future is not None and future.done() and not future.cancelled() and future.exception() is None
+
+    def cancel(self):
+        """Cancels every pending job (running jobs finish but their results are dropped)."""
+        with self._lock:
+            self._cancel_all()
+            self.generation = None
+
+    def _cancel_all(self):
+        for future in self._futures.values():
+            future.cancel()
+        self._futures = {}
+
+
+def _completed(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def get_scheduler(session_state, key="background_scheduler"):
+    """Returns the session's BackgroundScheduler, creating it on first use."""
+    if key not in session_state:
+        session_state[key] = BackgroundScheduler()
+    return session_state[key]
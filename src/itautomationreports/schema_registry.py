@@ -0,0 +1,130 @@
+import hashlib
+import threading
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+from .readers import read_excel
+from .search import SEARCH_COLUMNS
+
+# Columns the dashboard reads (after renaming); every other column is skipped at read time
+DASHBOARD_COLUMNS = [
+    "Ticket", "Request time", "Close time", "Due Date", "SLA", "Category", "Sub-Category",
+    "Process manager", "Process Manager", "Priority", "Urgency", "Status", "Title", "Request user",
+] + [col for col in SEARCH_COLUMNS if col != "Title"]
+
+# Rows read to locate the header of a new file (the header must be within them)
+HEADER_PROBE_ROWS = 30
+
+
+def normalize_header(values):
+    """Header cells as column names: stripped, with runs of whitespace collapsed."""
+    return pd.Index(values).astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+
+
+def header_fingerprint(sheet_name, header_row, header):
+    """Identifies a layout by its sheet, header offset and normalized header cells."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{sheet_name}\x1e{header_row}\x1e".encode("utf-8"))
+    digest.update("\x1f".join(normalize_header(header)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class SchemaEntry:
+    """What a projected read of a known layout needs."""
+    fingerprint: str
+    sheet_name: str
+    header_row: int
+    usecols: list  # Positions of the needed columns in the sheet
+    names: list  # Final (renamed) names of those columns
+    dtypes: dict  # Column name -> dtype of the text columns
+    hits: int = field(default=0)
+
+
+def learn_schema(fingerprint, sheet_name, header_row, header, column_mapping, sample):
+    """
+    Builds a SchemaEntry for a new layout.
+
+    `column_mapping` is {standard name: [variants]} and `sample` holds the
+    data rows of the file (columns in sheet order) used to record dtypes.
+    """
+    names = list(normalize_header(header))
+    renames = {variant: standard for standard, variants in column_mapping.items() for variant in variants}
+
+    usecols, final_names, seen = [], [], set()
+    for position, name in enumerate(names):
+        final = renames.get(name, name)
+        if final in DASHBOARD_COLUMNS and final not in seen:
+            usecols.append(position)
+            final_names.append(final)
+            seen.add(final)
+
+    # Text columns are pinned to object so later files never re-infer them (numbers and dates are left to the reader)
+    dtypes = {}
+    for position, name in zip(usecols, final_names):
+        dtype = sample.iloc[:, position].infer_objects().dtype
+        if dtype.kind not in "iufbmM":
+            dtypes[name] = "object"
+
+    return SchemaEntry(fingerprint, sheet_name, header_row, usecols, final_names, dtypes)
+
+
+class SchemaRegistry:
+    """
+    Known export layouts keyed by header fingerprint.
+
+    The first file of a layout pays for header detection and column
+    mapping; later files with the same header skip straight to a projected
+    read of the needed columns with known dtypes.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint):
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                entry.hits += 1
+            return entry
+
+    def put(self, entry):
+        with self._lock:
+            self._entries[entry.fingerprint] = entry
+
+    def forget(self, fingerprint):
+        with self._lock:
+            self._entries.pop(fingerprint, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._entries
+
+
+def read_projected(xl, entry):
+    """Reads only the columns of a known layout, skipping the rows above and including the header."""
+    return read_excel(
+        xl,
+        sheet_name=entry.sheet_name,
+        header=None,
+        skiprows=entry.header_row + 1,
+        usecols=entry.usecols,
+        names=entry.names,
+        dtype=entry.dtypes,
+    )
+
+
+_registry = SchemaRegistry()
+
+
+def get_schema_registry():
+    """Returns the schema registry shared by every session of this process."""
+    return _registry
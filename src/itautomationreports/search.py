@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from .caching import DATASET_FINGERPRINT_ATTR, LRUCache, frame_fingerprint
+from .drilldown import SegmentIndex
+from .title_clusters import normalize_titles, title_tokens
+
+# Free-text columns searched (when present)
+SEARCH_COLUMNS = ["Title", "Short Description", "Description", "Resolution", "Comments"]
+
+# Search indexes per dataset (built once per upload, shared by every filter state)
+_search_cache = LRUCache(maxsize=8)
+
+_LAST_CHAR = "\U0010ffff"  # Sorts after every character, closing a prefix range
+
+
+def tokenize(texts):
+    """Splits texts into a flat Series of distinct lower-case words (stopwords included), indexed by text position."""
+    return title_tokens(normalize_titles(pd.Series(texts)), stopwords=())
+
+
+def parse_query(query):
+    """Splits a query into (word, is_prefix) terms; "vpn outlook*" -> [("vpn", False), ("outlook", True)]."""
+    terms = []
+    for raw in query.split():
+        words = tokenize([raw.rstrip("*")]).tolist()
+        for position, word in enumerate(words):
+            terms.append((word, raw.endswith("*") and position == len(words) - 1))
+    return terms
+
+
+class SearchIndex:
+    """
+    Inverted index over the free-text columns of a dataset.
+
+    Every column is dictionary-encoded, so each distinct text (a
+    "document") is tokenised once, however many tickets share it. Word ->
+    document postings are stored CSR-style against a sorted vocabulary,
+    which makes both an exact word and a prefix one contiguous slice found
+    with searchsorted. A query marks the matching documents, maps them to
+    rows through the dictionary codes and ANDs the terms with boolean masks.
+    """
+
+    def __init__(self, df, columns=SEARCH_COLUMNS):
+        self.n_rows = len(df)
+        self.columns = [col for col in columns if col in df.columns]
+
+        documents, encoded = [], []
+        for col in self.columns:
+            codes, texts = pd.factorize(df[col].astype(object).to_numpy())
+            encoded.append((codes, len(documents)))
+            documents.extend(texts.astype(str))
+        self.n_documents = len(documents)
+
+        # Per column: the document id of every row (missing text points at the empty slot n_documents)
+        self._row_documents = [
+            np.where(codes < 0, self.n_documents, codes + offset).astype(np.int64) for codes, offset in encoded
+        ]
+
+        tokens = tokenize(documents)
+        token_codes, vocabulary = pd.factorize(tokens.to_numpy(dtype=object), sort=True)
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        self.postings = SegmentIndex(token_codes, len(self.vocabulary), rows=tokens.index.to_numpy())
+
+    def term_documents(self, word, prefix=False):
+        """Ids of the documents containing `word` (or a word starting with it)."""
+        lo = np.searchsorted(self.vocabulary, word, side="left")
+        hi = np.searchsorted(self.vocabulary, word + _LAST_CHAR if prefix else word, side="right")
+        return self.postings.positions[self.postings.offsets[lo]:self.postings.offsets[hi]]
+
+    def term_rows(self, word, prefix=False):
+        """Boolean mask of the rows with `word` in any searched column."""
+        hits = np.zeros(self.n_documents + 1, dtype=bool)  # Last slot: the never-matching empty document
+        hits[self.term_documents(word, prefix)] = True
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for row_documents in self._row_documents:
+            mask |= hits[row_documents]
+        return mask
+
+    def search(self, query):
+        """Row positions matching every term of `query` (see parse_query); None for an empty query."""
+        terms = parse_query(query)
+        if not terms:
+            return None
+        mask = np.ones(self.n_rows, dtype=bool)
+        for word, prefix in terms:
+            mask &= self.term_rows(word, prefix)
+        return np.flatnonzero(mask)
+
+
+def get_search_index(df):
+    """Returns the SearchIndex of a loaded dataset, building it on first use."""
+    key = df.attrs.get(DATASET_FINGERPRINT_ATTR) or frame_fingerprint(df)
+    return _search_cache.get_or_compute(key, lambda: SearchIndex(df))
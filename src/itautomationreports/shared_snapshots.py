@@ -0,0 +1,268 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .caching import DATASET_FINGERPRINT_ATTR
+from .dataset_cache import content_key, get_dataset_cache, load_cached_dataset
+from .sketches import SketchStore, get_sketch_store, prime_sketch_store
+
+# Directory shared by every server process on this machine (publishing is off when unset)
+SHARED_DIR = os.environ.get("ITAR_SHARED_DIR", "")
+
+# Eviction, applied whenever a snapshot is published: at most this many snapshots are kept, and
+# snapshots nobody attached or published for this many hours are removed (0 disables either limit)
+MAX_SNAPSHOTS = int(os.environ.get("ITAR_SHARED_MAX_SNAPSHOTS", "16"))
+MAX_AGE_HOURS = float(os.environ.get("ITAR_SHARED_MAX_AGE_HOURS", "168"))
+
+FRAME_FILE = "frame.arrow"
+META_FILE = "meta.json"
+SKETCH_COLUMNS = ["source", "group", "day", "key", "count"]
+
+
+def arrow_compatible(df):
+    """Stores object columns mixing types (e.g. numeric and text ticket IDs) as text, so Arrow can hold them."""
+    mixed = [
+        col for col in df.columns
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return df
+    df = df.copy(deep=False)
+    for col in mixed:
+        df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def _write_table(path, table):
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _map_table(path):
+    """Memory-maps an Arrow IPC file; the table's buffers point straight into the mapping."""
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+class SharedSnapshotStore:
+    """
+    Cleaned datasets published as Arrow IPC files for every server process.
+
+    A dataset is published once under its content key: the cleaned frame
+    in `frame.arrow`, one file per SketchStore breakdown with its sparse
+    partitions, and `meta.json` with the file names and sketch labels.
+    Other processes memory-map the files read-only, so the OS page cache
+    keeps a single physical copy and attaching costs no parsing. Numeric
+    columns without gaps and text columns (Arrow-backed strings) reference
+    the mapping directly; columns with missing values are materialised.
+
+    Publishing writes into a private directory and renames it into place,
+    so readers only ever see complete snapshots and concurrent publishers
+    of the same dataset keep whichever rename lands first.
+
+    Each publish also evicts snapshots beyond `max_snapshots` and those
+    unused for `max_age_hours`, least recently used first (attaching a
+    snapshot refreshes the modification time of its meta.json).
+    """
+
+    def __init__(self, root, max_snapshots=MAX_SNAPSHOTS, max_age_hours=MAX_AGE_HOURS):
+        self.root = root
+        self.max_snapshots = max_snapshots
+        self.max_age_hours = max_age_hours
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.root, key)
+
+    def __contains__(self, key):
+        return os.path.isfile(os.path.join(self.path(key), META_FILE))
+
+    def publish(self, key, df, file_names, sketch_store=None):
+        """Writes a dataset (and its sketch store) under `key`; returns False when it was already published."""
+        if key in self:
+            return False
+
+        staging = os.path.join(self.root, f".{key}.{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            _write_table(os.path.join(staging, FRAME_FILE), pa.Table.from_pandas(arrow_compatible(df), preserve_index=False))
+
+            meta = {"file_names": list(file_names), "rows": len(df), "sketches": None}
+            if sketch_store is not None:
+                state = sketch_store.state()
+                for dim, partitions in state["partitions"].items():
+                    table = pa.table({column: partitions[column] for column in SKETCH_COLUMNS})
+                    _write_table(os.path.join(staging, f"sketch_{dim}.arrow"), table)
+                meta["sketches"] = {
+                    "relative_accuracy": state["relative_accuracy"],
+                    "keys": state["keys"].tolist(),
+                    "sources": state["sources"],
+                    "labels": state["labels"],
+                }
+
+            with open(os.path.join(staging, META_FILE), "w", encoding="utf-8") as handle:
+                json.dump(meta, handle, default=str)
+
+            try:
+                os.rename(staging, self.path(key))
+            except OSError:
+                return False  # Another process published the same dataset first
+            print(f"✅ Published dataset {key[:12]} to {self.root}.")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self.evict(keep=key)
+        return True
+
+    def attach(self, key):
+        """Returns (df, file_names, sketch_store or None) memory-mapped from a published snapshot, or None."""
+        if key not in self:
+            return None
+        directory = self.path(key)
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as handle:
+            meta = json.load(handle)
+
+        self._touch(key)  # Recently attached snapshots are evicted last
+        df = _map_table(os.path.join(directory, FRAME_FILE)).to_pandas(split_blocks=True)
+        df.attrs[DATASET_FINGERPRINT_ATTR] = key
+
+        sketch_store = None
+        if meta["sketches"] is not None:
+            sketches = meta["sketches"]
+            partitions = {}
+            for dim in sketches["labels"]:
+                table = _map_table(os.path.join(directory, f"sketch_{dim}.arrow"))
+                partitions[dim] = {column: table.column(column).to_numpy() for column in SKETCH_COLUMNS}
+            sketch_store = SketchStore.from_state({
+                "relative_accuracy": sketches["relative_accuracy"],
+                "keys": np.asarray(sketches["keys"], dtype=np.int64),
+                "sources": sketches["sources"],
+                "labels": sketches["labels"],
+                "partitions": partitions,
+            })
+        return df, meta["file_names"], sketch_store
+
+    def published(self):
+        """Keys of every complete snapshot."""
+        return sorted(name for name in os.listdir(self.root) if not name.startswith(".") and name in self)
+
+    def remove(self, key):
+        """Deletes a snapshot (processes that already mapped it keep their mapping)."""
+        shutil.rmtree(self.path(key), ignore_errors=True)
+
+    def last_used(self, key):
+        """Time (epoch seconds) the snapshot was last published or attached."""
+        return os.path.getmtime(os.path.join(self.path(key), META_FILE))
+
+    def evict(self, keep=None, now=None):
+        """
+        Removes snapshots unused for longer than `max_age_hours`, then the least
+        recently used ones beyond `max_snapshots`; returns the removed keys.
+
+        `keep` (the snapshot just published) is never removed. Staging
+        directories left behind by crashed publishers expire with the age limit.
+        """
+        now = time.time() if now is None else now
+        used = {}
+        for key in self.published():
+            try:
+                used[key] = self.last_used(key)
+            except OSError:
+                continue  # Removed by another process meanwhile
+
+        expired = []
+        if self.max_age_hours > 0:
+            cutoff = now - self.max_age_hours * 3600
+            expired = [key for key, last in used.items() if last < cutoff and key != keep]
+            for name in os.listdir(self.root):
+                staging = os.path.join(self.root, name)
+                if name.startswith(".") and os.path.isdir(staging) and os.path.getmtime(staging) < cutoff:
+                    shutil.rmtree(staging, ignore_errors=True)
+
+        remaining = sorted((key for key in used if key not in expired), key=used.get)
+        if self.max_snapshots > 0 and len(remaining) > self.max_snapshots:
+            excess = len(remaining) - self.max_snapshots
+            expired += [key for key in remaining if key != keep][:excess]
+
+        for key in expired:
+            self.remove(key)
+        if expired:
+            print(f"🧹 Evicted {len(expired)} shared snapshot(s) from {self.root}.")
+        return expired
+
+    def _touch(self, key):
+        try:
+            os.utime(os.path.join(self.path(key), META_FILE))
+        except OSError:
+            pass  # Read-only share: eviction falls back to publish times
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_shared_store():
+    """Returns the snapshot store in ITAR_SHARED_DIR (None when sharing is not configured)."""
+    global _store
+    if not SHARED_DIR:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = SharedSnapshotStore(SHARED_DIR)
+        return _store
+
+
+def _compatible_loader(loader):
+    """Wraps a dataset loader so it returns the frame as published (see arrow_compatible)."""
+    def load(uploaded_files):
+        df, file_names = loader(uploaded_files)
+        return (df if df is None else arrow_compatible(df)), file_names
+    return load
+
+
+def load_shared_dataset(uploaded_files, loader, cache=None, store=None):
+    """
+    load_cached_dataset that also shares datasets between server processes.
+
+    Lookup order: this process's DatasetCache, then a snapshot published by
+    any process (memory-mapped, no parsing), then `loader`. A freshly parsed
+    dataset is published together with its sketch store.
+    """
+    store = get_shared_store() if store is None else store
+    if store is None:
+        return load_cached_dataset(uploaded_files, loader, cache)
+
+    cache = get_dataset_cache() if cache is None else cache
+    key = content_key(uploaded_files)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        attached = store.attach(key)
+    except Exception as e:
+        print(f"🚨 Could not attach shared dataset {key[:12]} ({e}); parsing the files instead.")
+        attached = None
+    if attached is not None:
+        df, file_names, sketch_store = attached
+        print(f"✅ Dataset {key[:12]} attached from the shared snapshot.")
+        cache.put(key, df, file_names)
+        if sketch_store is not None:
+            prime_sketch_store(df, sketch_store)
+        return df.copy(deep=False), list(file_names)
+
+    # Cached in the form other processes attach, so every process serves the same frame
+    df, file_names = load_cached_dataset(uploaded_files, _compatible_loader(loader), cache)
+    if df is not None:
+        try:
+            store.publish(key, df, file_names, get_sketch_store(df))
+        except Exception as e:
+            print(f"🚨 Could not publish dataset {key[:12]}: {e}")
+    return df, file_names
@@ -0,0 +1,239 @@
+import numpy as np
+import pandas as pd
+
+from .aggregates import closed_response_times
+from .caching import DATASET_FINGERPRINT_ATTR, LRUCache, frame_fingerprint
+from .resample import bin_codes, to_int64
+
+# Every reported percentile is within this relative error of an exact rank
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Columns the resolution-time percentiles can be broken down by
+SKETCH_DIMENSIONS = ["Priority", "Category", "Process manager"]
+SKETCH_QUANTILES = [0.5, 0.9, 0.99]
+
+_NAT = np.iinfo(np.int64).min
+_ZERO_KEY = np.iinfo(np.int64).min  # Bucket of values <= 0 (sorts before every other bucket)
+
+# Sketch stores per dataset (built once per upload, shared by every filter state)
+_store_cache = LRUCache(maxsize=8)
+
+
+def _gamma(relative_accuracy):
+    return (1 + relative_accuracy) / (1 - relative_accuracy)
+
+
+def bucket_keys(values, relative_accuracy=SKETCH_RELATIVE_ACCURACY):
+    """Maps positive values to log-spaced bucket keys (values <= 0 share the zero bucket)."""
+    values = np.asarray(values, dtype=float)
+    keys = np.full(len(values), _ZERO_KEY, dtype=np.int64)
+    positive = values > 0
+    keys[positive] = np.ceil(np.log(values[positive]) / np.log(_gamma(relative_accuracy))).astype(np.int64)
+    return keys
+
+
+def bucket_values(keys, relative_accuracy=SKETCH_RELATIVE_ACCURACY):
+    """Representative value of every bucket key (the value with the smallest relative error)."""
+    gamma = _gamma(relative_accuracy)
+    keys = np.asarray(keys, dtype=np.int64)
+    values = np.zeros(len(keys))
+    nonzero = keys != _ZERO_KEY
+    values[nonzero] = 2 * np.power(gamma, keys[nonzero].astype(float)) / (gamma + 1)
+    return values
+
+
+def _ranked_values(cumulative, totals, quantiles, key_values):
+    """Looks up each quantile's bucket in cumulative counts (one row per sketch)."""
+    result = np.full((cumulative.shape[0], len(quantiles)), np.nan)
+    filled = totals > 0
+    for j, q in enumerate(quantiles):
+        rank = q * (totals[filled] - 1)
+        positions = (cumulative[filled] > rank[:, None]).argmax(axis=1)
+        result[filled, j] = key_values[positions]
+    return result
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative-error guarantees (DDSketch-style).
+
+    Values are counted in logarithmically spaced buckets, so any quantile is
+    answered within `relative_accuracy` of the exact value. Merging two
+    sketches adds their bucket counts, which makes the result identical to
+    a sketch built from the concatenated values.
+    """
+
+    def __init__(self, relative_accuracy=SKETCH_RELATIVE_ACCURACY, keys=None, counts=None):
+        self.relative_accuracy = relative_accuracy
+        self.keys = np.array([], dtype=np.int64) if keys is None else np.asarray(keys, dtype=np.int64)
+        self.counts = np.array([], dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def from_values(cls, values, relative_accuracy=SKETCH_RELATIVE_ACCURACY):
+        values = np.asarray(values, dtype=float)
+        keys, counts = np.unique(bucket_keys(values[~np.isnan(values)], relative_accuracy), return_counts=True)
+        return cls(relative_accuracy, keys, counts)
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def merge(self, other):
+        """Returns a new sketch holding the values of both sketches."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged.")
+        keys, inverse = np.unique(np.concatenate([self.keys, other.keys]), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate([self.counts, other.counts]), minlength=len(keys))
+        return QuantileSketch(self.relative_accuracy, keys, counts.astype(np.int64))
+
+    def quantile(self, quantiles):
+        """Returns the value at each quantile in `quantiles` (NaN for an empty sketch)."""
+        quantiles = np.atleast_1d(np.asarray(quantiles, dtype=float))
+        values = bucket_values(self.keys, self.relative_accuracy)
+        cumulative = np.cumsum(self.counts)[None, :]
+        return _ranked_values(cumulative, np.array([self.count]), quantiles, values)[0]
+
+
+class SketchStore:
+    """
+    Resolution-time sketches partitioned by (Source, group, day).
+
+    Built in one pass when a dataset is loaded and stored as sparse
+    (partition, bucket) -> count rows per breakdown column. A percentile
+    query keeps the partitions matching the filters and merges their
+    buckets with a single bincount, so no ticket rows are touched. Days
+    are calendar days of "Request time", so a time filter is applied with
+    day resolution.
+    """
+
+    def __init__(self, df, value_column="Response Time", dimensions=SKETCH_DIMENSIONS,
+                 relative_accuracy=SKETCH_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.dimensions = [dim for dim in dimensions if dim in df.columns]
+
+        if value_column not in df.columns:
+            values = np.full(len(df), np.nan)
+        elif value_column == "Response Time":
+            values = closed_response_times(df).to_numpy(dtype=float)
+        else:
+            values = pd.to_numeric(df[value_column], errors="coerce").to_numpy(dtype=float)
+        known = ~np.isnan(values)
+
+        keys = bucket_keys(values[known], relative_accuracy)
+        self.keys, key_idx = np.unique(keys, return_inverse=True)
+        self.key_values = bucket_values(self.keys, relative_accuracy)
+
+        sources = df["Source"] if "Source" in df.columns else pd.Series("All Reports", index=df.index)
+        source_codes, self.sources = pd.factorize(sources.to_numpy()[known])
+
+        days = to_int64(df["Request time"])[known] if "Request time" in df.columns else np.full(known.sum(), _NAT)
+        day_codes = np.where(days == _NAT, _NAT, bin_codes(days, "Day"))
+
+        self._partitions = {}
+        self._labels = {}
+        for dim in self.dimensions:
+            groups = df[dim].astype(object).where(lambda s: s.notna(), "Unassigned").to_numpy()[known]
+            group_codes, labels = pd.factorize(groups, sort=True)
+            self._labels[dim] = pd.Index(labels, name=dim)
+            self._partitions[dim] = self._coalesce(source_codes, group_codes, day_codes, key_idx)
+
+    @staticmethod
+    def _coalesce(source_codes, group_codes, day_codes, key_idx):
+        """Collapses rows into unique (source, group, day, bucket) partitions with counts."""
+        order = np.lexsort((key_idx, day_codes, group_codes, source_codes))
+        columns = [source_codes[order], group_codes[order], day_codes[order], key_idx[order]]
+        if len(order) == 0:
+            return {"source": columns[0], "group": columns[1], "day": columns[2], "key": columns[3],
+                    "count": np.array([], dtype=np.int64)}
+        changed = np.zeros(len(order), dtype=bool)
+        changed[0] = True
+        for column in columns:
+            changed[1:] |= column[1:] != column[:-1]
+        starts = np.flatnonzero(changed)
+        counts = np.diff(np.r_[starts, len(order)])
+        return {
+            "source": columns[0][starts], "group": columns[1][starts], "day": columns[2][starts],
+            "key": columns[3][starts], "count": counts,
+        }
+
+    def _selected(self, partitions, sources=None, since=None):
+        """Mask of the partitions matching a source list and a start time."""
+        mask = np.ones(len(partitions["count"]), dtype=bool)
+        if sources is not None:
+            wanted = np.flatnonzero(np.isin(self.sources, list(sources)))
+            mask &= np.isin(partitions["source"], wanted)
+        if since is not None:
+            since_day = pd.Timestamp(since).value // 86_400_000_000_000
+            mask &= partitions["day"] >= since_day
+        return mask
+
+    def percentiles(self, dimension, sources=None, since=None, quantiles=SKETCH_QUANTILES):
+        """
+        Returns a table of Count and percentiles per group of `dimension`.
+
+        `sources` restricts the report sources (None for all) and `since`
+        keeps requests from that day onwards (None for all time).
+        """
+        columns = ["Count"] + [f"P{q * 100:g}" for q in quantiles]
+        if dimension not in self._partitions:
+            return pd.DataFrame(columns=columns)
+
+        partitions = self._partitions[dimension]
+        mask = self._selected(partitions, sources, since)
+        labels = self._labels[dimension]
+        n_keys = len(self.keys)
+
+        cells = partitions["group"][mask] * n_keys + partitions["key"][mask]
+        counts = np.bincount(cells, weights=partitions["count"][mask], minlength=len(labels) * n_keys)
+        counts = counts.reshape(len(labels), n_keys)
+        totals = counts.sum(axis=1)
+
+        values = _ranked_values(np.cumsum(counts, axis=1), totals, quantiles, self.key_values)
+        table = pd.DataFrame(values, index=labels, columns=columns[1:])
+        table.insert(0, "Count", totals.astype(np.int64))
+        return table[table["Count"] > 0]
+
+    def sketch(self, dimension, group=None, sources=None, since=None):
+        """Merges the matching partitions of one group (or all groups) into a QuantileSketch."""
+        partitions = self._partitions[dimension]
+        mask = self._selected(partitions, sources, since)
+        if group is not None:
+            mask &= partitions["group"] == self._labels[dimension].get_loc(group)
+        counts = np.bincount(partitions["key"][mask], weights=partitions["count"][mask], minlength=len(self.keys))
+        present = counts > 0
+        return QuantileSketch(self.relative_accuracy, self.keys[present], counts[present].astype(np.int64))
+
+    def state(self):
+        """Arrays and labels that fully describe the store (inverse of from_state)."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "keys": self.keys,
+            "sources": list(self.sources),
+            "labels": {dim: list(labels) for dim, labels in self._labels.items()},
+            "partitions": self._partitions,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuilds a store from state() without touching any ticket rows."""
+        store = cls.__new__(cls)
+        store.relative_accuracy = state["relative_accuracy"]
+        store.keys = np.asarray(state["keys"], dtype=np.int64)
+        store.key_values = bucket_values(store.keys, store.relative_accuracy)
+        store.sources = np.asarray(state["sources"], dtype=object)
+        store.dimensions = list(state["labels"])
+        store._labels = {dim: pd.Index(labels, name=dim) for dim, labels in state["labels"].items()}
+        store._partitions = state["partitions"]
+        return store
+
+
+def get_sketch_store(df):
+    """Returns the SketchStore of a loaded dataset, building it on first use."""
+    key = df.attrs.get(DATASET_FINGERPRINT_ATTR) or frame_fingerprint(df)
+    return _store_cache.get_or_compute(key, lambda: SketchStore(df))
+
+
+def prime_sketch_store(df, store):
+    """Registers an already built SketchStore for a loaded dataset (e.g. one attached from a shared snapshot)."""
+    key = df.attrs.get(DATASET_FINGERPRINT_ATTR) or frame_fingerprint(df)
+    _store_cache.put(key, store)
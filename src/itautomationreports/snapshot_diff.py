@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+from .caching import LRUCache, frame_key
+
+# Fields compared between snapshots (lower-case comparison columns, when present in both)
+DIFF_FIELDS = [
+    "status", "priority", "urgency", "category", "sub-category", "process manager", "sla", "due date", "close_time",
+]
+
+# Ticket classes, in display order
+DIFF_CLASSES = ["New", "Closed", "Changed", "Unchanged", "Removed"]
+
+# Diffs per (old snapshot, new snapshot)
+_diff_cache = LRUCache(maxsize=8)
+
+
+def canonical_ticket_ids(tickets):
+    """
+    Canonical text form of ticket IDs, used as the join key.
+
+    Whole numbers lose any trailing ".0" and text is stripped and
+    upper-cased, so 1042, 1042.0, "1042 " and " 1042" join, as do "req-7"
+    and "REQ-7". Missing IDs become "" (masked out by the caller).
+    """
+    tickets = pd.Series(tickets).reset_index(drop=True)
+    text = tickets.astype(object).astype(str).str.strip().str.upper()
+    text = text.str.replace(r"^(\d+)\.0*$", r"\1", regex=True)  # Whole numbers stored as floats
+    text[tickets.isna().to_numpy()] = ""
+    return text.to_numpy(dtype=object)
+
+
+def _unique_keys(df):
+    """Join keys of a snapshot and the row position of each ticket (its last occurrence wins)."""
+    present = df["ticket"].notna().to_numpy()
+    positions = np.flatnonzero(present)
+    keys = canonical_ticket_ids(df["ticket"])[present]
+    last = ~pd.Index(keys).duplicated(keep="last")
+    return keys[last], positions[last]
+
+
+def _differs(old, new):
+    """Element-wise "value changed" for two aligned arrays (missing on both sides counts as equal)."""
+    old_missing, new_missing = pd.isna(old), pd.isna(new)
+    if old.dtype.kind == "M" or new.dtype.kind == "M":
+        old, new = pd.to_datetime(old, errors="coerce"), pd.to_datetime(new, errors="coerce")
+    with np.errstate(invalid="ignore"):
+        equal = np.asarray(old == new, dtype=bool)
+    return ~(equal | (old_missing & new_missing))
+
+
+class SnapshotDiff:
+    """
+    Ticket-level differences between two snapshots of the same queue.
+
+    Tickets are joined on their canonical ID with a hash join: the old
+    snapshot's IDs are loaded into a hash table (pandas' Index engine)
+    and probed with the new snapshot's IDs in one get_indexer call. Every
+    compared field is then diffed as a whole array over the matched pairs.
+
+    Classes: New (only in the new snapshot), Removed (only in the old one),
+    Closed (open before, closed now), Changed (any compared field differs)
+    and Unchanged.
+    """
+
+    def __init__(self, old, new, fields=DIFF_FIELDS):
+        self.fields = [field for field in fields if field in old.columns and field in new.columns]
+        old_keys, old_rows = _unique_keys(old)
+        new_keys, new_rows = _unique_keys(new)
+
+        matches = pd.Index(old_keys).get_indexer(new_keys)  # Hash join: probe the old snapshot's table
+        matched = matches >= 0
+        removed = np.ones(len(old_keys), dtype=bool)
+        removed[matches[matched]] = False
+
+        old_pos, new_pos = old_rows[matches[matched]], new_rows[matched]
+        self._matched_rows = (old_pos, new_pos)
+        self.changes = pd.DataFrame(
+            {field: _differs(old[field].to_numpy()[old_pos], new[field].to_numpy()[new_pos]) for field in self.fields},
+            dtype=bool,
+        )
+
+        closed = np.zeros(len(old_pos), dtype=bool)
+        if "close_time" in self.fields:
+            closed = old["close_time"].isna().to_numpy()[old_pos] & new["close_time"].notna().to_numpy()[new_pos]
+        changed = self.changes.to_numpy().any(axis=1) if self.fields else np.zeros(len(old_pos), dtype=bool)
+
+        matched_class = np.where(closed, "Closed", np.where(changed, "Changed", "Unchanged"))
+        self.tickets = pd.concat([
+            pd.DataFrame({"ticket": new["ticket"].to_numpy()[new_pos], "Change": matched_class,
+                          "_old": old_pos, "_new": new_pos}),
+            pd.DataFrame({"ticket": new["ticket"].to_numpy()[new_rows[~matched]], "Change": "New",
+                          "_old": -1, "_new": new_rows[~matched]}),
+            pd.DataFrame({"ticket": old["ticket"].to_numpy()[old_rows[removed]], "Change": "Removed",
+                          "_old": old_rows[removed], "_new": -1}),
+        ], ignore_index=True)
+        self.tickets["Change"] = pd.Categorical(self.tickets["Change"], categories=DIFF_CLASSES)
+        self._old, self._new = old, new
+
+    def summary(self):
+        """Number of tickets in every class."""
+        return self.tickets["Change"].value_counts(sort=False).rename("Tickets")
+
+    def field_changes(self):
+        """Matched tickets whose value changed, per compared field."""
+        return self.changes.sum().rename("Tickets Changed").sort_values(ascending=False, kind="stable")
+
+    def transitions(self, field, top_n=10):
+        """Most frequent old -> new value pairs of a field among the tickets where it changed."""
+        changed = self.changes[field].to_numpy()
+        old_pos, new_pos = self._matched_rows
+        pairs = pd.DataFrame({
+            "From": self._old[field].to_numpy()[old_pos[changed]],
+            "To": self._new[field].to_numpy()[new_pos[changed]],
+        })
+        return pairs.astype(str).value_counts().head(top_n).rename("Tickets").reset_index()
+
+    def details(self, change=None, fields=("status", "priority"), limit=None):
+        """Tickets of one class (all when None) with old/new values of `fields` and the list of changed fields."""
+        tickets = self.tickets if change is None else self.tickets[self.tickets["Change"] == change]
+        tickets = tickets.head(limit) if limit is not None else tickets
+        table = tickets[["ticket", "Change"]].reset_index(drop=True)
+        old_pos, new_pos = tickets["_old"].to_numpy(), tickets["_new"].to_numpy()
+        for field in [field for field in fields if field in self.fields]:
+            table[f"{field} (before)"] = np.where(old_pos >= 0, self._old[field].to_numpy()[np.maximum(old_pos, 0)], None)
+            table[f"{field} (after)"] = np.where(new_pos >= 0, self._new[field].to_numpy()[np.maximum(new_pos, 0)], None)
+
+        # Matched tickets are the first len(changes) rows of self.tickets
+        matched_rows = tickets.index.to_numpy()
+        is_matched = matched_rows < len(self.changes)
+        labels = np.full(len(tickets), "", dtype=object)
+        if self.fields and is_matched.any():
+            flags = self.changes.to_numpy()[matched_rows[is_matched]]
+            names = np.array(self.fields, dtype=object)
+            labels[is_matched] = [", ".join(names[row]) for row in flags]
+        table["Changed Fields"] = labels
+        return table
+
+
+class SnapshotChain:
+    """
+    Diffs of consecutive snapshots of a queue, oldest first.
+
+    Every step (a snapshot and the one after it) is a SnapshotDiff from the
+    diff cache, so adding a snapshot to the chain only joins the new pair.
+    """
+
+    def __init__(self, snapshots):
+        names = list(snapshots)
+        self.steps = [f"{old} → {new}" for old, new in zip(names, names[1:])]
+        self.diffs = [get_snapshot_diff(snapshots[old], snapshots[new]) for old, new in zip(names, names[1:])]
+
+    def summary(self):
+        """Number of tickets in every class, per step."""
+        return pd.DataFrame(
+            [diff.summary().reindex(DIFF_CLASSES).to_numpy() for diff in self.diffs],
+            index=pd.Index(self.steps, name="Step"), columns=DIFF_CLASSES,
+        )
+
+    def field_changes(self):
+        """Matched tickets whose value changed, per step and compared field (0 when a step lacks the field)."""
+        table = pd.DataFrame([diff.field_changes() for diff in self.diffs], index=pd.Index(self.steps, name="Step"))
+        columns = [field for field in DIFF_FIELDS if field in table.columns]
+        return table[columns].fillna(0).astype(int)
+
+
+def get_snapshot_diff(old, new):
+    """Returns the cached SnapshotDiff of two snapshots."""
+    key = (frame_key(old, ["ticket"] + DIFF_FIELDS), frame_key(new, ["ticket"] + DIFF_FIELDS))
+    return _diff_cache.get_or_compute(key, lambda: SnapshotDiff(old, new))
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+from .caching import LRUCache, fingerprint
+
+# MinHash / LSH parameters: 16 bands x 4 rows puts the LSH candidate threshold near a Jaccard
+# similarity of 0.5; candidates are then kept only above SIMILARITY_THRESHOLD
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 16
+SIMILARITY_THRESHOLD = 0.6
+
+# Words that carry no meaning about the issue itself
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "am", "be", "to", "for", "of", "on", "in", "at", "and", "or",
+    "my", "me", "i", "it", "its", "with", "from", "please", "pls", "request", "issue", "help",
+    "problem",
+}
+
+# Words that turn a title into its opposite ("t" is what normalisation leaves of "can't", "won't");
+# titles with and without one are never clustered together, however similar the other words are
+NEGATIONS = {"not", "no", "never", "cannot", "unable", "t"}
+
+_PRIME = np.uint64(4_294_967_311)  # Smallest prime above 2**32
+_MAX_HASH = np.uint64(np.iinfo(np.uint64).max)
+
+# Cluster assignments per dataset (keyed by the fingerprint of its distinct titles)
+_cluster_cache = LRUCache(maxsize=16)
+
+
+def normalize_titles(titles):
+    """Lower-cases titles, strips punctuation and collapses whitespace."""
+    return (
+        titles.fillna("").astype(str).str.lower()
+        .str.replace(r"[^\w\s]", " ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+
+
+def _permutations(num_perm, seed=42):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**32, size=num_perm, dtype=np.uint64)  # Keeps a * hash + b below 2**64
+    b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def title_tokens(normalized, stopwords=STOPWORDS):
+    """Splits normalised titles into a flat Series of distinct words (minus `stopwords`), indexed by title position."""
+    words = normalized.reset_index(drop=True).str.split().explode().dropna()
+    words = words[~words.isin(stopwords) & (words != "")]
+    return words[~pd.MultiIndex.from_arrays([words.index, words]).duplicated()]
+
+
+def minhash_signatures(tokens, n, num_perm=NUM_PERMUTATIONS):
+    """
+    Computes MinHash signatures for `n` titles from their flat token Series.
+
+    All tokens are hashed once. Each permutation is then applied to the whole
+    token array and reduced per title with np.minimum.reduceat, so there is
+    no Python loop over titles. Titles without tokens get a signature of all
+    max values.
+    """
+    signatures = np.full((n, num_perm), _MAX_HASH, dtype=np.uint64)
+    if tokens.empty:
+        return signatures
+
+    owners = tokens.index.to_numpy()
+    hashes = pd.util.hash_array(tokens.to_numpy(dtype=object)) & np.uint64(0xFFFFFFFF)
+
+    # Tokens of a title are contiguous, so every owner is one run of the flat array
+    starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+    a, b = _permutations(num_perm)
+    for j in range(num_perm):
+        permuted = (a[j] * hashes + b[j]) % _PRIME
+        signatures[owners[starts], j] = np.minimum.reduceat(permuted, starts)
+    return signatures
+
+
+def _connected_components(n, left, right):
+    """Labels connected components of an edge list by min-label propagation with pointer jumping."""
+    labels = np.arange(n)
+    if len(left) == 0:
+        return labels
+    while True:
+        lowest = np.minimum(labels[left], labels[right])
+        previous = labels.copy()
+        np.minimum.at(labels, left, lowest)
+        np.minimum.at(labels, right, lowest)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def lsh_clusters(signatures, num_bands=NUM_BANDS, threshold=SIMILARITY_THRESHOLD):
+    """
+    Groups near-duplicate signatures with banded locality-sensitive hashing.
+
+    Within each band, rows hashing to the same bucket are compared with the
+    first row of that bucket only, and kept when their estimated Jaccard
+    similarity reaches `threshold`. This is O(n) work per band instead of
+    comparing every pair. Returns a cluster label per row.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // num_bands
+    has_tokens = signatures[:, 0] != _MAX_HASH
+
+    left, right = [], []
+    candidates = np.flatnonzero(has_tokens)
+    for band in range(num_bands):
+        band_values = signatures[candidates, band * rows:(band + 1) * rows]
+        bucket_ids, _ = pd.factorize(pd.util.hash_pandas_object(pd.DataFrame(band_values), index=False))
+
+        # First member of every bucket acts as the bucket's representative
+        _, first_seen = np.unique(bucket_ids, return_index=True)
+        anchor = candidates[first_seen[bucket_ids]]
+        member = candidates
+        pairs = anchor != member
+        anchor, member = anchor[pairs], member[pairs]
+
+        similarity = (signatures[anchor] == signatures[member]).mean(axis=1)
+        keep = similarity >= threshold
+        left.append(anchor[keep])
+        right.append(member[keep])
+
+    left = np.concatenate(left) if left else np.array([], dtype=np.int64)
+    right = np.concatenate(right) if right else np.array([], dtype=np.int64)
+    return _connected_components(n, left, right)
+
+
+def cluster_titles(titles):
+    """
+    Maps every raw title to the label of its near-duplicate cluster.
+
+    Titles are normalised, de-duplicated, MinHashed and grouped with LSH.
+    Each cluster is labelled with its most frequent raw title. Results are
+    cached per dataset, keyed by the distinct titles and their counts.
+    Returns a Series of cluster labels aligned with `titles`.
+    """
+    counts = titles.dropna().astype(str).value_counts()
+    key = fingerprint(counts.index.to_numpy(dtype=object), counts.to_numpy())
+
+    mapping = _cluster_cache.get_or_compute(key, lambda: _cluster_mapping(counts))
+    return titles.astype(object).map(mapping)
+
+
+def _cluster_mapping(counts):
+    """Builds a raw title -> cluster label dictionary from title frequencies."""
+    if counts.empty:
+        return {}
+
+    normalized = normalize_titles(pd.Series(counts.index))
+    title_codes, unique_normalized = pd.factorize(normalized)
+
+    tokens = title_tokens(pd.Series(unique_normalized))
+    labels = lsh_clusters(minhash_signatures(tokens, len(unique_normalized)))
+
+    # Split every cluster into its negated and plain titles
+    negated = np.zeros(len(unique_normalized), dtype=np.int64)
+    negated[tokens.index[tokens.isin(NEGATIONS)]] = 1
+    labels = labels * 2 + negated
+
+    # Label each cluster with its most frequent raw title
+    raw = pd.DataFrame({"Title": counts.index, "Count": counts.to_numpy(), "Cluster": labels[title_codes]})
+    representative = raw.sort_values("Count", ascending=False, kind="stable").drop_duplicates("Cluster")
+    cluster_label = dict(zip(representative["Cluster"], representative["Title"]))
+    return dict(zip(raw["Title"], raw["Cluster"].map(cluster_label)))
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from .caching import LRUCache, frame_key
+
+OTHER_LABEL = "Other"
+
+# Rankers per filtered frame, reused across reruns with the same dataset and filters
+_ranker_cache = LRUCache(maxsize=8)
+
+
+def select_top_k(counts, k):
+    """
+    Returns the positions of the `k` largest counts, largest first.
+
+    Uses np.argpartition so only the selected k entries are sorted
+    (ties are broken by position to keep the order stable).
+    """
+    k = min(k, len(counts))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    top = np.argpartition(-counts, k - 1)[:k]
+    return top[np.lexsort((top, -counts[top]))]
+
+
+class TopKRanker:
+    """
+    Keeps per-dimension count arrays for one filtered frame.
+
+    Each dimension (a column name or a tuple of column names) is encoded
+    once into integer codes. Counts are then a single np.bincount, and
+    top-K selections read from those arrays without a full sort.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._codes = {}
+        self._counts = {}
+        self._results = {}
+
+    def encode(self, dim):
+        """Returns (codes, labels) for a dimension; missing values get code -1."""
+        if dim not in self._codes:
+            if isinstance(dim, tuple):
+                index = pd.MultiIndex.from_frame(self.df[list(dim)])
+                codes, labels = pd.factorize(index)
+                codes[self.df[list(dim)].isna().any(axis=1).to_numpy()] = -1
+            else:
+                codes, labels = pd.factorize(self.df[dim])
+            self._codes[dim] = (codes, labels)
+        return self._codes[dim]
+
+    def counts(self, dim):
+        """Number of rows per label of the dimension."""
+        if dim not in self._counts:
+            codes, labels = self.encode(dim)
+            self._counts[dim] = np.bincount(codes[codes >= 0], minlength=len(labels))
+        return self._counts[dim]
+
+    def top_k(self, dim, k, other=False):
+        """
+        Returns a Series of the `k` most frequent labels and their counts.
+
+        With `other=True` the remaining labels are summed into an "Other"
+        bucket, so the result still adds up to the dimension's total (a
+        top label that is itself "Other" absorbs them).
+        """
+        key = ("top_k", dim, k, other)
+        if key not in self._results:
+            counts = self.counts(dim)
+            _, labels = self.encode(dim)
+            top = select_top_k(counts, k)
+            result = pd.Series(counts[top], index=labels[top], name="Count")
+            if other and len(top) < len(counts):
+                result[OTHER_LABEL] = result.get(OTHER_LABEL, 0) + counts.sum() - result.sum()
+            self._results[key] = result
+        return self._results[key]
+
+    def top_k_per(self, dim, k, per="Source", other=False):
+        """
+        Returns the `k` most frequent labels of `dim` within every group of `per`.
+
+        Counts for all groups come from one bincount over the combined codes,
+        and np.argpartition selects the top K of every group at once.
+        """
+        key = ("top_k_per", dim, k, per, other)
+        if key not in self._results:
+            codes, labels = self.encode(dim)
+            group_codes, groups = self.encode(per)
+            valid = (codes >= 0) & (group_codes >= 0)
+            matrix = np.bincount(
+                group_codes[valid] * len(labels) + codes[valid],
+                minlength=len(groups) * len(labels),
+            ).reshape(len(groups), len(labels))
+
+            k_eff = min(k, len(labels))
+            rows = []
+            if k_eff > 0:
+                top = np.argpartition(-matrix, k_eff - 1, axis=1)[:, :k_eff]
+                top_counts = np.take_along_axis(matrix, top, axis=1)
+                order = np.argsort(-top_counts, axis=1, kind="stable")
+                top = np.take_along_axis(top, order, axis=1)
+                top_counts = np.take_along_axis(top_counts, order, axis=1)
+                for g, group in enumerate(groups):
+                    keep = top_counts[g] > 0
+                    group_top = pd.DataFrame({per: group, dim: labels[top[g][keep]], "Count": top_counts[g][keep]})
+                    rows.append(group_top)
+                    rest = matrix[g].sum() - top_counts[g].sum() if other else 0
+                    is_other = group_top[dim] == OTHER_LABEL
+                    if rest > 0 and is_other.any():
+                        group_top.loc[is_other, "Count"] += rest
+                    elif rest > 0:
+                        rows.append(pd.DataFrame({per: [group], dim: [OTHER_LABEL], "Count": [rest]}))
+
+            columns = [per, dim, "Count"]
+            self._results[key] = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(columns=columns)
+        return self._results[key]
+
+    def group_mean(self, dim, values):
+        """Mean of `values` per label of the dimension (NaN values ignored), computed with bincount."""
+        codes, labels = self.encode(dim)
+        values = np.asarray(values, dtype=float)
+        valid = (codes >= 0) & ~np.isnan(values)
+        sums = np.bincount(codes[valid], weights=values[valid], minlength=len(labels))
+        counts = np.bincount(codes[valid], minlength=len(labels))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.Series(sums / counts, index=labels)
+
+
+def get_ranker(df):
+    """Returns the cached TopKRanker for this frame (same dataset + filter state)."""
+    return _ranker_cache.get_or_compute(frame_key(df), lambda: TopKRanker(df))
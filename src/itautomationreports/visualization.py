@@ -1,7 +1,24 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
-import streamlit as st
+import numpy as np
 import pandas as pd
+import streamlit as st
+
+from .lazy import lazy_import
+from .chart_renderers import ChartSpec, render_chart
+from .backlog import BACKLOG_FREQUENCIES, backlog_series, limit_groups
+from .reopen import REOPEN_KEY_COLUMNS, detect_reopens, reopen_chains, reopen_rates
+from .title_clusters import cluster_titles
+from .topk import TopKRanker, get_ranker, select_top_k
+from .business_calendar import get_business_durations
+from .calendar_bins import get_calendar_bins
+from .anomalies import ANOMALY_THRESHOLD, get_volume_anomalies
+from .resample import bin_codes, bin_labels, bin_starts, get_time_index
+from .aggregates import (
+    closed_response_times, completion_counts, priority_breakdown, response_time_stats, status_breakdown,
+    user_request_stats)
+
+# Plotly is imported when the first chart needs it (keeps the app's cold start fast);
+# matplotlib charts are drawn from ChartSpecs by chart_renderers
+px = lazy_import("plotly.express")
 
 def plot_sla_compliance(df):
     if "SLA" not in df.columns or df.empty:
@@ -32,72 +49,36 @@ def plot_sla_compliance(df):
     """, unsafe_allow_html=True)
 
 
-import matplotlib.pyplot as plt
-import matplotlib.patheffects as path_effects
-import pandas as pd
-import streamlit as st
-
-def plot_ticket_trends(df):
-    """Bar Chart: Monthly Ticket Trends with Numbers Inside Bars"""
+def plot_ticket_trends(df, granularity="Month"):
+    """Bar Chart: Ticket Trends per Day/Week/Month/Quarter with Numbers Inside Bars"""
     
     if "Request time" not in df.columns or df.empty:
         st.warning("⚠️ 'Request time' column is missing or dataset is empty.")
         return
 
-    # Convert to datetime
-    df["Request time"] = pd.to_datetime(df["Request time"], errors="coerce")
+    # Count tickets per period (empty periods included)
+    ticket_trends = get_time_index(df).counts(granularity)
+    labels = bin_labels(ticket_trends.index, granularity)
+
+    # Bar chart with numbers inside the bars
+    render_chart(ChartSpec("ticket_trends", (12, 6), {
+        "labels": list(labels), "counts": ticket_trends.to_numpy(), "granularity": granularity}))
 
-    # Count tickets per month
-    ticket_trends = df["Request time"].dt.to_period("M").value_counts().sort_index()
-
-    # Create figure
-    fig, ax = plt.subplots(figsize=(12, 6))
-    bars = ax.bar(ticket_trends.index.astype(str), ticket_trends.values, color="royalblue")
-
-    # Add numbers inside bars with a black border
-    for bar in bars:
-        height = bar.get_height()
-        if height > 0:
-            text = ax.text(
-                bar.get_x() + bar.get_width() / 2,  # X position
-                bar.get_height() / 2,  # Y position (middle of the bar)
-                str(int(height)),  # Convert count to integer
-                ha="center", va="center", fontsize=12, color="white", fontweight="bold"
-            )
-            text.set_path_effects([
-                path_effects.withStroke(linewidth=3, foreground="black")  # Black border for better visibility
-            ])
-
-    # Set labels and title
-    ax.set_title("📈 Ticket Trends Over Time", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Month", fontsize=12)
-    ax.set_ylabel("Ticket Count", fontsize=12)
-    ax.set_xticklabels(ticket_trends.index.astype(str), rotation=45, ha="right")
-
-    # Display plot in Streamlit
-    st.pyplot(fig)
-
-
-def plot_time_of_day_heatmap(df):
-    if "Request time" not in df.columns or "Ticket" not in df.columns or df.empty:
-        st.warning("Request time or Ticket column is missing or dataset is empty.")
+
+def plot_time_of_day_heatmap(df, layout="Weekday × Hour", metric="Ticket Count"):
+    """Heatmap: Ticket count, SLA breach rate or mean resolution time per calendar cell (e.g. weekday × hour)"""
+    if "Request time" not in df.columns or df.empty:
+        st.warning("Request time column is missing or dataset is empty.")
         return
 
-    df["Request time"] = pd.to_datetime(df["Request time"], errors="coerce")
-    df["Hour"] = df["Request time"].dt.hour
-
-    pivot = df.pivot_table(
-        values="Ticket",
-        index=df["Request time"].dt.day_name(),
-        columns="Hour",
-        aggfunc="count",
-        fill_value=0,
-    )
+    calendar = get_calendar_bins(df)
+    if not calendar.has_metric(metric):
+        st.warning(f"⚠️ '{metric}' needs a column that is missing from the dataset.")
+        return
+
+    matrix = calendar.matrix(layout, metric)
+    render_chart(ChartSpec("time_of_day_heatmap", (14, 8), {"matrix": matrix, "layout": layout, "metric": metric}))
 
-    fig, ax = plt.subplots(figsize=(14, 8))
-    sns.heatmap(pivot, cmap="YlGnBu", annot=True, fmt="g", ax=ax)
-    ax.set_title("Tickets Raised by Time of Day and Day of Week")
-    st.pyplot(fig)
 
 def plot_response_time(df, source_filter=None):
     if df.empty or "Response Time" not in df.columns:
@@ -108,14 +89,19 @@ def plot_response_time(df, source_filter=None):
     if source_filter:
         df = df[df["Source"] == source_filter]
 
-    fig, ax = plt.subplots(figsize=(8, 4))
-    sns.boxplot(x=df["Response Time"], ax=ax, color="lightcoral")
+    render_chart(ChartSpec("response_time", (8, 4), {"values": closed_response_times(df).to_numpy(dtype=float)}))
+
 
-    ax.set_title("📊 Response Time Distribution", fontsize=14)
-    ax.set_xlabel("Response Time (Minutes)", fontsize=12)
-    ax.grid(True, linestyle="--", alpha=0.6)
+def plot_response_time_stats(df, stats=None):
+    """Table: Count, Mean, Median, P90 and Max of Response Time and Ticket Aging (`stats` may be precomputed)."""
+    if stats is None:
+        stats = response_time_stats(df)
+
+    if stats.empty:
+        st.warning("No data available for response time statistics.")
+        return
 
-    st.pyplot(fig)
+    st.dataframe(stats.style.format("{:,.1f}"), use_container_width=True)
 
 
 def plot_ticket_aging(df, source_filter=None):
@@ -127,15 +113,7 @@ def plot_ticket_aging(df, source_filter=None):
     if source_filter:
         df = df[df["Source"] == source_filter]
 
-    fig, ax = plt.subplots(figsize=(8, 4))
-    sns.violinplot(x=df["Ticket Aging"], ax=ax, color="orange", inner="quartile")
-
-    ax.set_title("Ticket Aging Distribution", fontsize=14)
-    ax.set_xlabel("Ticket Age (Days)", fontsize=12)
-    ax.grid(True, linestyle="--", alpha=0.6)
-
-    st.pyplot(fig)
-
+    render_chart(ChartSpec("ticket_aging", (8, 4), {"values": df["Ticket Aging"].to_numpy(dtype=float)}))
 
 
 def plot_total_requests(df):
@@ -164,10 +142,6 @@ def plot_total_requests(df):
     """, unsafe_allow_html=True)
 
 
-import plotly.express as px
-import streamlit as st
-import pandas as pd
-
 def plot_requests_by_category(df):
     """Displays a Bubble Chart showing the number of requests by Category & Sub-Category."""
     
@@ -196,52 +170,36 @@ def plot_requests_by_category(df):
     # Display in Streamlit
     st.plotly_chart(fig)
 
-import matplotlib.pyplot as plt
-import matplotlib.patheffects as path_effects
-import streamlit as st
 
-def plot_sla_performance(df):
-    """Stacked Column Chart: Requests Meeting SLA vs. SLA Breached with Labeled Counts Inside Bars (Black Border)"""
+def plot_sla_performance(df, calendar=None):
+    """
+    Stacked Column Chart: Requests Meeting SLA vs. SLA Breached with Labeled Counts Inside Bars (Black Border)
 
-    if "SLA" not in df.columns or df.empty:
-        st.warning("⚠️ 'SLA' column is missing or dataset is empty.")
-        return
+    With a BusinessCalendar, a closed ticket meets its SLA when it was closed
+    by its due date on the business clock (instead of the exported 'SLA' flag).
+    """
 
-    # Count occurrences of SLA Met vs SLA Breached
-    sla_counts = df["SLA"].value_counts()
+    if calendar is not None:
+        if "Due Date" not in df.columns or df.empty:
+            st.warning("⚠️ 'Due Date' column is missing or dataset is empty.")
+            return
+        due_delta = get_business_durations(df, calendar)["Business Due Delta"].dropna()
+        sla_counts = pd.Series(np.where(due_delta <= 0, "Met", "Fail")).value_counts()
+    else:
+        if "SLA" not in df.columns or df.empty:
+            st.warning("⚠️ 'SLA' column is missing or dataset is empty.")
+            return
 
-    # Create bar chart
-    fig, ax = plt.subplots(figsize=(6, 4))
-    bars = sla_counts.plot(kind="bar", stacked=True, color=["green", "red"], ax=ax)
+        # Count occurrences of SLA Met vs SLA Breached
+        sla_counts = df["SLA"].value_counts()
 
-    # Add data labels inside bars with black-bordered text
-    for bar in bars.patches:
-        height = bar.get_height()
-        if height > 0:
-            text = ax.text(
-                bar.get_x() + bar.get_width() / 2,  # X position
-                bar.get_height() / 2,  # Y position (middle of the bar)
-                str(int(height)),  # Convert count to integer
-                ha="center", va="center", fontsize=12, color="white", fontweight="bold"
-            )
-            text.set_path_effects([
-                path_effects.withStroke(linewidth=3, foreground="black")  # Black border for better visibility
-            ])
+    # Bar chart with labeled counts inside the bars
+    render_chart(ChartSpec("sla_performance", (6, 4), {
+        "sla_counts": sla_counts, "business_hours": calendar is not None}))
 
-    # Labels and title
-    ax.set_title("Requests Meeting SLA vs. SLA Breached", fontsize=14, fontweight="bold")
-    ax.set_xlabel("SLA Status", fontsize=12)
-    ax.set_ylabel("Number of Requests", fontsize=12)
-    ax.set_xticklabels(sla_counts.index, rotation=0)  # Keep labels horizontal
 
-    # Show plot in Streamlit
-    st.pyplot(fig)
-
-
-
-
-def plot_avg_closure_time(df):
-    """Displays the Average Time to Close Requests as a styled metric card with centered value."""
+def plot_avg_closure_time(df, calendar=None):
+    """Displays the Average Time to Close Requests (calendar days, or business days with a BusinessCalendar) as a styled metric card."""
     
     if df.empty or "Close time" not in df.columns or "Request time" not in df.columns:
         st.warning("⚠️ Required columns missing or dataset is empty.")
@@ -256,6 +214,11 @@ def plot_avg_closure_time(df):
 
     # Compute average resolution time
     avg_resolution_time = df["Resolution Time"].mean()
+    unit = "Days"
+    if calendar is not None:
+        business_minutes = get_business_durations(df, calendar)["Business Response Time"]
+        avg_resolution_time = business_minutes.mean() * 60 / calendar.day_seconds
+        unit = "Business Days"
 
     # Custom HTML & CSS for a bordered card with centered value
     st.markdown(f"""
@@ -272,18 +235,18 @@ def plot_avg_closure_time(df):
             align-items: center;
             justify-content: center;">
             <h3 style="color: #2196F3; margin-bottom: 10px;">Avg Time to Close Requests</h3>
-            <h2 style="color: black; font-size: 28px; font-weight: bold; margin: 0;">{avg_resolution_time:.1f} Days</h2>
+            <h2 style="color: black; font-size: 28px; font-weight: bold; margin: 0;">{avg_resolution_time:.1f} {unit}</h2>
         </div>
     """, unsafe_allow_html=True)
 
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import streamlit as st
+def plot_due_date_analysis(df, calendar=None):
+    """
+    Bar Chart: Requests Closed Before, On, or After the Due Date with Labeled Counts Inside Bars (Black Border)
 
-def plot_due_date_analysis(df):
-    """Bar Chart: Requests Closed Before, On, or After the Due Date with Labeled Counts Inside Bars (Black Border)"""
+    With a BusinessCalendar, closing after the due date but with no business
+    time in between (e.g. the same evening) counts as "On Due Date".
+    """
     
     if "Close time" not in df.columns or "Due Date" not in df.columns or df.empty:
         st.warning("⚠️ 'Close time' or 'Due Date' column is missing.")
@@ -293,125 +256,49 @@ def plot_due_date_analysis(df):
     df["Close time"] = pd.to_datetime(df["Close time"], errors="coerce")
     df["Due Date"] = pd.to_datetime(df["Due Date"], errors="coerce")
 
-    # Classify closure status
-    df["Closure Status"] = df.apply(
-        lambda row: "Before Due Date" if row["Close time"] < row["Due Date"]
-        else "On Due Date" if row["Close time"] == row["Due Date"]
-        else "After Due Date", axis=1
-    )
+    # Classify closure status (vectorised; missing dates count as "After Due Date")
+    if calendar is not None:
+        due_delta = get_business_durations(df, calendar)["Business Due Delta"]
+        before, on_time = due_delta < 0, due_delta == 0
+    else:
+        before, on_time = df["Close time"] < df["Due Date"], df["Close time"] == df["Due Date"]
+    df["Closure Status"] = np.select([before, on_time], ["Before Due Date", "On Due Date"], default="After Due Date")
 
     # Count occurrences
     closure_counts = df["Closure Status"].value_counts()
 
-    # Create bar chart
-    fig, ax = plt.subplots(figsize=(6, 4))
-    bars = sns.barplot(x=closure_counts.index, y=closure_counts.values, palette=["green", "blue", "red"], ax=ax)
-
-    # Add data labels inside bars with black-bordered text
-    for bar in bars.patches:
-        height = bar.get_height()
-        if height > 0:
-            ax.text(
-                bar.get_x() + bar.get_width() / 2,  # X position
-                bar.get_height() / 2,  # Y position (middle of the bar)
-                str(int(height)),  # Convert count to integer
-                ha="center", va="center", fontsize=12, 
-                color="white", fontweight="bold", path_effects=[
-                    plt.matplotlib.patheffects.withStroke(linewidth=3, foreground="black")  # Black border
-                ]
-            )
-
-    # Labels and title
-    ax.set_title("Requests Closed Before, On, or After the Due Date", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Closure Status", fontsize=12)
-    ax.set_ylabel("Number of Requests", fontsize=12)
-    ax.set_xticklabels(closure_counts.index, rotation=0)  # Keep labels horizontal
-
-    # Show plot in Streamlit
-    st.pyplot(fig)
-
-
-def plot_request_completion_status(df):
-    """Displays a donut chart for Pending vs. Completed Requests."""
+    # Bar chart with labeled counts inside the bars
+    render_chart(ChartSpec("due_date_analysis", (6, 4), {"closure_counts": closure_counts}))
+
+
+def plot_request_completion_status(df, counts=None):
+    """Displays a donut chart for Pending vs. Completed Requests (`counts` may be precomputed)."""
     
     if "Status" not in df.columns or df.empty:
         st.warning("⚠️ 'Status' column is missing or dataset is empty.")
         return
 
-    # Define status categories
-    completed_statuses = ["Closed", "Resolved", "Completed"]
-    pending_statuses = ["Open", "In Progress", "Pending"]
-
     # Count requests in each category
-    completed_count = df[df["Status"].isin(completed_statuses)].shape[0]
-    pending_count = df[df["Status"].isin(pending_statuses)].shape[0]
-
-    # Data for the pie chart
-    labels = ["Completed", "Pending"]
-    sizes = [completed_count, pending_count]
-    colors = ["#4CAF50", "#FFC107"]  # Green for completed, Yellow for pending
-
-    # Create the figure with smaller size (reduced to half)
-    fig, ax = plt.subplots(figsize=(3, 3))  # Shrinking the figure
-
-    ax.pie(sizes, labels=labels, autopct="%1.1f%%", colors=colors, 
-           startangle=140, wedgeprops={"edgecolor": "black"})
-    ax.set_title("Pending vs. Completed Requests", fontsize=10)  # Reduce title size
+    if counts is None:
+        counts = completion_counts(df)
 
-    # Add a circle at the center to make it a donut chart
-    center_circle = plt.Circle((0, 0), 0.70, fc="white")
-    fig.gca().add_artist(center_circle)
+    # Donut chart with a smaller figure (reduced to half)
+    sizes = [counts["Completed"], counts["Pending"]]
+    render_chart(ChartSpec("request_completion_status", (3, 3), {"sizes": sizes}))
 
-    # Display the plot
-    st.pyplot(fig)
-
-def plot_requests_by_status(df):
-    """Displays a stacked bar chart of Requests by Status."""
+def plot_requests_by_status(df, status_counts=None):
+    """Displays a stacked bar chart of Requests by Status (`status_counts` may be precomputed)."""
     
     if "Status" not in df.columns or "Category" not in df.columns or df.empty:
         st.warning("⚠️ 'Status' or 'Category' column is missing or dataset is empty.")
         return
 
     # Group by Category & Status
-    status_counts = df.groupby(["Category", "Status"]).size().reset_index(name="Request Count")
-
-    # Create figure
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.barplot(data=status_counts, x="Category", y="Request Count", hue="Status", ax=ax)
+    if status_counts is None:
+        status_counts = status_breakdown(df)
 
-    # Rotate x-axis labels if too many categories exist
-    if status_counts["Category"].nunique() > 8:
-        ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha="right")
+    render_chart(ChartSpec("requests_by_status", (12, 6), {"status_counts": status_counts}))
 
-    ax.set_title("Requests by Status")
-    ax.set_xlabel("Category")
-    ax.set_ylabel("Number of Requests")
-
-    st.pyplot(fig)
-
-import matplotlib.pyplot as plt
-import matplotlib.patheffects as path_effects
-import numpy as np
-import streamlit as st
-
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import mplfinance as mpf
-import streamlit as st
-
-import streamlit as st
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import mplfinance as mpf
-
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import streamlit as st
-import matplotlib.patches as patches
-import matplotlib.patheffects as path_effects  # For text outline effect
 
 def plot_aging_report_table(df):
     """Displays a table summarizing requests open for different aging brackets in minutes and a candlestick-style chart."""
@@ -443,61 +330,11 @@ def plot_aging_report_table(df):
     st.subheader("📋 Aging Report (Minutes)")
     st.table(aging_summary)
 
-    # Prepare Candlestick Chart Data (OHLC Format)
-    aging_summary["Open"] = aging_summary["Request Count"].shift(1, fill_value=aging_summary["Request Count"].iloc[0])
-    aging_summary["High"] = aging_summary["Request Count"]
-    aging_summary["Low"] = aging_summary["Request Count"].rolling(2).min().fillna(aging_summary["Request Count"])
-    aging_summary["Close"] = aging_summary["Request Count"]
-
-    # Plot Custom Candlestick Chart using Matplotlib
-    fig, ax = plt.subplots(figsize=(6, 4))
-
-    for i, row in aging_summary.iterrows():
-        x = i  # X-axis index (0,1,2,3 for categories)
-        open_ = row["Open"]
-        high = row["High"]
-        low = row["Low"]
-        close = row["Close"]
-
-        # Draw candlestick wick (vertical line)
-        ax.vlines(x, low, high, color="black", linewidth=2)
-
-        # Determine candle color (green if Close > Open, red otherwise)
-        color = "green" if close >= open_ else "red"
-
-        # Draw candlestick body (rectangle)
-        body = patches.Rectangle(
-            (x - 0.2, min(open_, close)),  # X position & bottom Y
-            0.4,  # Width
-            abs(close - open_),  # Height (absolute difference)
-            color=color,
-            alpha=0.8
-        )
-        ax.add_patch(body)
-
-        # Add text inside the candle with a black border
-        text = ax.text(
-            x, (open_ + close) / 2, str(int(row["Request Count"])), 
-            ha="center", va="center", fontsize=12, color="white", fontweight="bold"
-        )
-
-        # Apply black outline effect to text
-        text.set_path_effects([
-            path_effects.Stroke(linewidth=2, foreground="black"),  # Black border
-            path_effects.Normal()  # Normal text rendering
-        ])
-
-    # Set labels
-    ax.set_xticks(range(len(aging_brackets)))
-    ax.set_xticklabels(aging_brackets, rotation=0)
-    ax.set_ylabel("Number of Requests", fontsize=12)
-    ax.set_title("Request Aging Distribution (Minutes)", fontsize=14, fontweight="bold")
-
-    # Display in Streamlit
-    st.pyplot(fig)
+    # Custom candlestick chart (OHLC computed from the bracket counts)
+    render_chart(ChartSpec("aging_report_table", (6, 4), {"aging_summary": aging_summary}))
 
 
-def plot_requests_by_priority(df):
+def plot_requests_by_priority(df, priority_counts=None):
     """Bar Chart: Requests by Priority (High, Medium, Low) with numbers inside bars."""
     
     if "Priority" not in df.columns or df.empty:
@@ -505,28 +342,11 @@ def plot_requests_by_priority(df):
         return
 
     # Count requests by priority
-    priority_counts = df["Priority"].value_counts()
+    if priority_counts is None:
+        priority_counts = priority_breakdown(df)["counts"]
 
     # Plot bar chart
-    fig, ax = plt.subplots(figsize=(6, 4))
-    bars = sns.barplot(x=priority_counts.index, y=priority_counts.values, palette=["red", "orange", "green"], ax=ax)
-
-    # Add numbers inside bars
-    for bar in bars.patches:
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width() / 2,  # X position
-            height / 2,  # Y position (middle of the bar)
-            str(int(height)),  # Convert count to integer
-            ha="center", va="center", fontsize=12, color="black", fontweight="bold",
-            bbox=dict(facecolor="white", edgecolor="black", boxstyle="round,pad=0.3")
-        )
-
-    ax.set_title("Requests by Priority", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Priority", fontsize=12)
-    ax.set_ylabel("Number of Requests", fontsize=12)
-
-    st.pyplot(fig)
+    render_chart(ChartSpec("requests_by_priority", (6, 4), {"priority_counts": priority_counts}))
 
 def plot_urgent_requests(df):
     """Pie Chart: Urgent vs. Non-Urgent Requests"""
@@ -539,21 +359,9 @@ def plot_urgent_requests(df):
     urgency_counts = df["Urgency"].value_counts()
 
     # Plot pie chart
-    fig, ax = plt.subplots(figsize=(5, 5))
-    wedges, texts, autotexts = ax.pie(
-        urgency_counts.values, labels=urgency_counts.index, autopct="%1.1f%%",
-        colors=["red", "gray"], startangle=90, textprops={"fontsize": 12, "fontweight": "bold"}
-    )
-
-    # Add black border to text
-    for text in autotexts:
-        text.set_bbox(dict(facecolor="white", edgecolor="black", boxstyle="round,pad=0.3"))
-
-    ax.set_title("Urgent Requests Breakdown", fontsize=14, fontweight="bold")
-    
-    st.pyplot(fig)
+    render_chart(ChartSpec("urgent_requests", (5, 5), {"urgency_counts": urgency_counts}))
 
-def plot_priority_vs_resolution_time(df):
+def plot_priority_vs_resolution_time(df, avg_resolution_time=None):
     """Line Chart: Average Resolution Time by Priority"""
 
     if "Priority" not in df.columns or "Response Time" not in df.columns or df.empty:
@@ -561,86 +369,74 @@ def plot_priority_vs_resolution_time(df):
         return
 
     # Compute average response time for each priority
-    avg_resolution_time = df.groupby("Priority")["Response Time"].mean().sort_index()
+    if avg_resolution_time is None:
+        avg_resolution_time = priority_breakdown(df)["avg_response_time"]
 
     # Plot line chart
-    fig, ax = plt.subplots(figsize=(6, 4))
-    ax.plot(avg_resolution_time.index, avg_resolution_time.values, marker="o", linestyle="-", color="blue")
+    render_chart(ChartSpec("priority_vs_resolution_time", (6, 4), {"avg_resolution_time": avg_resolution_time}))
+
+def plot_resolution_percentiles(store, dimension="Priority", sources=None, since=None, top_n=15):
+    """Table + Grouped Bar Chart: P50/P90/P99 Resolution Time per group, merged from the dataset's quantile sketches"""
+
+    table = store.percentiles(dimension, sources=sources, since=since)
+    if table.empty:
+        st.warning(f"⚠️ No resolution times available by '{dimension}' for the selected filters.")
+        return
 
-    # Add data labels
-    for i, value in enumerate(avg_resolution_time.values):
-        ax.text(i, value, f"{int(value)} min", ha="center", va="bottom", fontsize=12,
-                bbox=dict(facecolor="white", edgecolor="black", boxstyle="round,pad=0.3"))
+    # Largest groups only (Process manager can have hundreds of values)
+    table = table.iloc[select_top_k(table["Count"].to_numpy(), top_n)]
+    percentile_columns = [col for col in table.columns if col != "Count"]
 
-    ax.set_title("Impact of Priority on Resolution Time", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Priority", fontsize=12)
-    ax.set_ylabel("Avg. Resolution Time (minutes)", fontsize=12)
+    chart_data = table[percentile_columns].reset_index().melt(
+        id_vars=dimension, var_name="Percentile", value_name="Resolution Time (Minutes)")
+    fig = px.bar(
+        chart_data, x=dimension, y="Resolution Time (Minutes)", color="Percentile", barmode="group",
+        title=f"📐 Resolution Time Percentiles by {dimension}",
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
-    st.pyplot(fig)
+    st.dataframe(table.round(1), use_container_width=True)
 
-def plot_requests_by_process_manager(df):
-    """Column Chart: Number of Requests Handled by Each Process Manager"""
+def plot_requests_by_process_manager(df, top_n=15):
+    """Column Chart: Number of Requests Handled by the Top Process Managers (remaining managers grouped as "Other")"""
     
     if "Process manager" not in df.columns or df.empty:
         st.warning("⚠️ 'Process manager' column is missing or dataset is empty.")
         return
     
-    manager_counts = df["Process manager"].value_counts()
-
-    fig, ax = plt.subplots(figsize=(8, 5))
-    bars = ax.bar(manager_counts.index, manager_counts.values, color="royalblue")
-
-    # Add data labels with black borders
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width() / 2, height, str(int(height)), 
-                ha='center', va='bottom', fontsize=12, color='black', 
-                bbox=dict(facecolor='white', edgecolor='black', boxstyle='round,pad=0.3'))
+    manager_counts = get_ranker(df).top_k("Process manager", top_n, other=True)
 
-    ax.set_title("Requests Handled by Each Process Manager", fontsize=14, fontweight="bold")
-    ax.set_xlabel("Process Manager", fontsize=12)
-    ax.set_ylabel("Number of Requests", fontsize=12)
-    ax.set_xticklabels(manager_counts.index, rotation=45, ha="right")
-
-    st.pyplot(fig)
+    render_chart(ChartSpec("requests_by_process_manager", (8, 5), {"manager_counts": manager_counts}))
     
-def plot_request_volume_trend(df):
+def plot_request_volume_trend(df, granularity="Month"):
     if "Request time" not in df.columns or df.empty:
         st.warning("⚠️ 'Request time' column is missing or dataset is empty.")
         return
 
-    df["Request time"] = pd.to_datetime(df["Request time"], errors="coerce")
+    # Aggregate data per period from the shared sorted time index
+    time_index = get_time_index(df)
+    request_trend = time_index.counts(granularity)
 
-    # Aggregate data by month
-    request_trend = df["Request time"].dt.to_period("M").value_counts().sort_index()
+    # Average resolution time per period on a secondary axis
+    resolution = None
+    if "Response Time" in df.columns:
+        resolution = time_index.aggregate(closed_response_times(df).to_numpy(dtype=float) / 60, granularity)
 
-    fig, ax = plt.subplots(figsize=(12, 5))
-    request_trend.plot(kind="line", marker="o", color="blue", ax=ax)
-    ax.set_title("📈 Request Volume Trend Over Time")
-    ax.set_xlabel("Month")
-    ax.set_ylabel("Number of Requests")
-    ax.grid(True)
-    
-    st.pyplot(fig)
+    render_chart(ChartSpec("request_volume_trend", (12, 5), {
+        "request_trend": request_trend, "granularity": granularity, "resolution": resolution}))
 
-def plot_peak_request_times(df):
-    """Plots a bar chart showing peak request times (most active days/months)."""
+def plot_peak_request_times(df, granularity="Month", top_n=12):
+    """Plots a bar chart showing peak request times (most active days/weeks/months/quarters)."""
     if "Request time" not in df.columns or df.empty:
         st.warning("⚠️ 'Request time' column is missing or dataset is empty.")
         return
 
-    df["Request time"] = pd.to_datetime(df["Request time"], errors="coerce")
-
-    # Group by month and get the highest request counts
-    peak_times = df["Request time"].dt.strftime("%B").value_counts()
+    # Busiest periods (each period keeps its year, so January 2024 and January 2025 stay apart)
+    counts = get_time_index(df).counts(granularity, fill_gaps=False)
+    top = select_top_k(counts.to_numpy(), top_n)
+    peak_times = pd.Series(counts.to_numpy()[top], index=bin_labels(counts.index[top], granularity))
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    peak_times.sort_values(ascending=True).plot(kind="barh", color="orange", ax=ax)
-    ax.set_title("📊 Peak Request Times (Most Active Months)")
-    ax.set_xlabel("Number of Requests")
-    ax.set_ylabel("Month")
-    
-    st.pyplot(fig)
+    render_chart(ChartSpec("peak_request_times", (10, 5), {"peak_times": peak_times, "granularity": granularity}))
 
 def plot_most_common_request_categories(df):
     """Plots a pie chart showing the most common request categories and subcategories."""
@@ -648,41 +444,30 @@ def plot_most_common_request_categories(df):
         st.warning("⚠️ 'Category' or 'Sub-Category' column is missing or dataset is empty.")
         return
 
-    category_counts = df["Category"].value_counts().head(5)  # Top 5 categories
-    subcategory_counts = df["Sub-Category"].value_counts().head(5)  # Top 5 subcategories
+    ranker = get_ranker(df)
+    category_counts = ranker.top_k("Category", 5, other=True)  # Top 5 categories + "Other"
 
-    fig, ax = plt.subplots(figsize=(6, 6))
-    category_counts.plot(kind="pie", autopct="%1.1f%%", colors=plt.cm.Paired.colors, ax=ax)
-    ax.set_title("📊 Most Common Request Categories")
-    ax.set_ylabel("")  # Hide y-axis label
-    
-    st.pyplot(fig)
+    render_chart(ChartSpec("most_common_request_categories", (6, 6), {"category_counts": category_counts}))
 
 def plot_recurring_issues(df, top_n=10):
-    """Plots a heatmap showing the most common recurring issues based on Title and Category."""
+    """Plots a heatmap showing the most common recurring issues based on near-duplicate Title clusters and Category."""
     if "Category" not in df.columns or "Title" not in df.columns or df.empty:
         st.warning("⚠️ 'Category' or 'Title' column is missing or dataset is empty.")
         return
 
-    # Count occurrences of each (Category, Title) pair
-    issue_counts = df.groupby(["Category", "Title"]).size().reset_index(name="Count")
+    # Group near-duplicate titles ("VPN not working", "vpn not working!") into one issue cluster
+    issues = pd.DataFrame({"Category": df["Category"], "Issue": cluster_titles(df["Title"])})
 
-    # Select top N most frequent issues
-    top_issues = issue_counts.nlargest(top_n, "Count")
+    # Select the top N most frequent (Category, Issue) pairs without sorting every pair
+    issue_counts = TopKRanker(issues).top_k(("Category", "Issue"), top_n)
+    top_issues = pd.DataFrame(list(issue_counts.index), columns=["Category", "Issue"])
+    top_issues["Count"] = issue_counts.to_numpy()
 
     # Pivot for heatmap format
-    heatmap_data = top_issues.pivot(index="Category", columns="Title", values="Count").fillna(0)
+    heatmap_data = top_issues.pivot(index="Category", columns="Issue", values="Count").fillna(0)
 
     # Plot heatmap
-    fig, ax = plt.subplots(figsize=(10, 5))
-    sns.heatmap(heatmap_data, annot=True, fmt="g", cmap="Blues", linewidths=0.5, ax=ax)
-
-    ax.set_title("🔥 Top Recurring Issues (Category vs. Title)")
-    ax.set_xlabel("Issue Title")
-    ax.set_ylabel("Category")
-
-    st.pyplot(fig)
-
+    render_chart(ChartSpec("recurring_issues", (10, 5), {"heatmap_data": heatmap_data}))
 
 
 def plot_time_taken_box_plot(df):
@@ -715,73 +500,113 @@ def plot_time_taken_box_plot(df):
 
     st.plotly_chart(fig)
 
-import pandas as pd
-import streamlit as st
 
 # ✅ Detect Reopened Requests
-def detect_reopened_requests(df):
-    """Identify reopened requests based on duplicate (Request user, Category, Sub-Category, Title)."""
-    required_columns = {"Request user", "Category", "Sub-Category", "Title"}
+def detect_reopened_requests(df, window_days=7):
+    """Identify requests reopened within `window_days` after the previous matching (Request user, Category, Sub-Category, Title) ticket was closed."""
+    required_columns = set(REOPEN_KEY_COLUMNS)
 
     # Ensure all required columns exist
     if not required_columns.issubset(df.columns):
         st.error(f"🚨 Missing columns: {required_columns - set(df.columns)}")
         return df
 
-    # ✅ Identify duplicates that indicate a reopened request
-    df["Reopened"] = df.duplicated(subset=["Request user", "Category", "Sub-Category", "Title"], keep=False)
-    
-    return df
+    # ✅ Link each ticket to the previous ticket with the same key
+    return detect_reopens(df, window_days=window_days)
 
-# File: src/itautomationreports/visualization.py
-# File: src/itautomationreports/visualization.py
-import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+def plot_reopened_requests(df, window_days=7, top_n=10):
+    """Bar Charts + Table: Reopen rates by Category and Process Manager, and the longest reopen chains."""
+
+    if not set(REOPEN_KEY_COLUMNS).issubset(df.columns) or "Request time" not in df.columns or df.empty:
+        st.warning(f"⚠️ Reopen detection needs the columns {REOPEN_KEY_COLUMNS} and 'Request time'.")
+        return
+
+    reopens = detect_reopened_requests(df, window_days=window_days)
+
+    total_reopened = int(reopens["Reopened"].sum())
+    st.markdown(f"🔁 **Reopened Requests:** `{total_reopened:,}` "
+                f"({total_reopened / len(reopens) * 100:.1f}% of tickets, window: {window_days} days)")
+
+    col1, col2 = st.columns(2)
+    for col, by in ((col1, "Category"), (col2, "Process manager")):
+        with col:
+            rates = reopen_rates(reopens, by).head(top_n)
+            if rates.empty:
+                st.warning(f"⚠️ '{by}' column is missing from the dataset.")
+                continue
+
+            render_chart(ChartSpec("reopened_requests", (6, 4), {"rates": rates[[by, "Reopen Rate (%)"]], "by": by}))
+
+    chains = reopen_chains(reopens)
+    st.subheader("🔗 Longest Reopen Chains")
+    if chains.empty:
+        st.info("No reopen chains found for the selected window.")
+    else:
+        st.dataframe(chains.head(top_n), use_container_width=True)
 
-def plot_user_request_analysis(df):
-    """Visualize the top 10 users with the most requests and their average resolution time."""
+
+def plot_user_request_analysis(df, top_n=10, stats=None):
+    """Visualize the top users with the most requests and their average resolution time (`stats` may be precomputed)."""
     
     if "Request user" not in df.columns or "Close time" not in df.columns or "Request time" not in df.columns:
         st.warning("⚠️ Required columns ('Request user', 'Request time', 'Close time') are missing.")
         return
-    
-    # Convert to datetime
-    df["Request time"] = pd.to_datetime(df["Request time"], errors="coerce")
-    df["Close time"] = pd.to_datetime(df["Close time"], errors="coerce")
 
-    # Calculate Resolution Time (in hours)
-    df["Resolution Time"] = (df["Close time"] - df["Request time"]).dt.total_seconds() / 3600
+    # Top users and their average resolution time (in hours)
+    top_users, per_source = stats if stats is not None else user_request_stats(df, top_n)
 
-    # Group by user
-    user_stats = df.groupby("Request user").agg(
-        Total_Requests=("Request user", "count"),
-        Avg_Resolution_Time=("Resolution Time", "mean")
-    ).reset_index()
+    # ✅ Visualization: total requests (bars) and avg resolution time (dots, secondary axis)
+    render_chart(ChartSpec("user_request_analysis", (10, 5), {"top_users": top_users}))
 
-    # Sort by total requests & select top 10 users
-    top_users = user_stats.sort_values(by="Total_Requests", ascending=False).head(10)
+    # Top users within each report source
+    if per_source is not None:
+        with st.expander("📂 Top Users per Report Source"):
+            st.dataframe(per_source, use_container_width=True)
 
-    # ✅ Visualization
-    fig, ax1 = plt.subplots(figsize=(10, 5))
 
-    # Bar chart for Total Requests (Primary Y-Axis)
-    sns.barplot(x="Request user", y="Total_Requests", data=top_users, palette="Blues_r", ax=ax1)
-    ax1.set_xlabel("User")
-    ax1.set_ylabel("Total Requests", color="blue")
-    ax1.tick_params(axis="y", labelcolor="blue")
-    ax1.set_xticklabels(ax1.get_xticklabels(), rotation=45, ha="right")
+def plot_open_backlog(df, freq="Daily", by=None, since=None, top_n=8):
+    """Area/Line Chart: Open tickets at the end of each hour, day or week, optionally broken down by a column."""
 
-    # Scatter plot for Avg Resolution Time (Secondary Y-Axis, Dots Only)
-    ax2 = ax1.twinx()
-    ax2.scatter(top_users["Request user"], top_users["Avg_Resolution_Time"], color="red", label="Avg Resolution Time")
-    ax2.set_ylabel("Avg Resolution Time (hrs)", color="red")
-    ax2.tick_params(axis="y", labelcolor="red")
+    if "Request time" not in df.columns or df.empty:
+        st.warning("⚠️ 'Request time' column is missing or dataset is empty.")
+        return
 
-    # Display Plot
-    st.pyplot(fig)
+    granularity = BACKLOG_FREQUENCIES[freq]
+    backlog = backlog_series(df, freq=freq, by=by)
+    if since is not None:
+        # Keep the period containing `since` so the window starts with a full bin
+        since_start = bin_starts(bin_codes(np.array([pd.Timestamp(since).value]), granularity), granularity)[0]
+        backlog = backlog[backlog.index >= since_start]
+
+    if backlog.empty:
+        st.warning("⚠️ No open-backlog data available for the selected period.")
+        return
+
+    if by is not None:
+        backlog = limit_groups(backlog, top_n=top_n)
+    render_chart(ChartSpec("open_backlog", (12, 5), {"backlog": backlog, "granularity": granularity, "by": by}))
 
 
+def plot_volume_anomalies(df, by="Category", method="Rolling median / MAD", since=None,
+                          threshold=ANOMALY_THRESHOLD, top_n=20):
+    """Table + Line Chart: Days where a category's ticket volume spiked above its own baseline."""
+    if "Request time" not in df.columns or by not in df.columns or df.empty:
+        st.warning(f"⚠️ 'Request time' or '{by}' column is missing or dataset is empty.")
+        return
+
+    anomalies = get_volume_anomalies(df, by, method)
+    top = anomalies.top(since=since, threshold=threshold, top_n=top_n)
+    if top.empty:
+        st.info(f"✅ No {by} volume anomalies (score ≥ {threshold:g}) in the selected period.")
+        return
 
+    st.dataframe(top, use_container_width=True, hide_index=True)
 
+    # Daily volume of the most anomalous groups against their baselines
+    groups = []
+    for group in top[by].drop_duplicates().head(3):
+        series = anomalies.series(group)
+        if since is not None:
+            series = series[series.index >= pd.Timestamp(since).floor("D")]
+        groups.append((group, series, top.loc[top[by] == group, ["Day", "Tickets"]]))
+    render_chart(ChartSpec("volume_anomalies", (12, 5), {"groups": groups, "by": by}))
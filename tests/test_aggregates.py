@@ -0,0 +1,17 @@
+import pandas as pd
+from itautomationreports.aggregates import closed_response_times, priority_breakdown, response_time_stats
+
+def test_open_tickets_do_not_count_as_instant_resolutions():
+    df = pd.DataFrame({
+        "Priority": ["High", "High", "Low", "Low"],
+        "Close time": pd.to_datetime(["2025-01-02", None, "2025-01-03", None]),
+        "Response Time": [60.0, 0.0, 120.0, 0.0],  # clean_data fills open tickets with 0
+    })
+    assert closed_response_times(df).isna().tolist() == [False, True, False, True]
+
+    stats = response_time_stats(df).loc["Response Time (Minutes)"]
+    assert stats["Count"] == 2 and stats["Mean"] == 90
+
+    breakdown = priority_breakdown(df)
+    assert breakdown["avg_response_time"].to_dict() == {"High": 60.0, "Low": 120.0}
+    assert breakdown["counts"].to_dict() == {"High": 2, "Low": 2}
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.anomalies import VolumeAnomalies, daily_counts, rolling_median_baseline
+
+def make_frame():
+    days = pd.date_range("2025-01-01", periods=60, freq="D")
+    rows = [(day + pd.Timedelta(hours=9), category) for day in days for category in ["Access"] * 5 + ["Network"] * 2]
+    rows += [(pd.Timestamp("2025-02-20 10:00"), "Access")] * 35  # 40 password resets against a baseline of 5
+    return pd.DataFrame(rows, columns=["Request time", "Category"])
+
+def test_daily_counts_matrix():
+    counts, labels, days = daily_counts(make_frame(), "Category")
+    assert list(labels) == ["Access", "Network"] and len(days) == 60
+    assert counts[0, days.get_loc(pd.Timestamp("2025-02-20"))] == 40
+    assert counts[1].sum() == 120
+
+def test_rolling_median_matches_pandas():
+    counts = np.random.default_rng(0).poisson(4, size=(3, 50))
+    median, _ = rolling_median_baseline(counts, window=7)
+    expected = pd.DataFrame(counts.T).rolling(7).median().shift(1).to_numpy().T
+    assert np.allclose(median, expected, equal_nan=True)
+
+def test_spike_is_the_top_anomaly():
+    for method in ["Rolling median / MAD", "EWMA"]:
+        top = VolumeAnomalies(make_frame(), "Category", method).top()
+        assert len(top) == 1
+        assert top.loc[0, "Category"] == "Access" and top.loc[0, "Day"] == pd.Timestamp("2025-02-20")
+        assert top.loc[0, "Tickets"] == 40
+    assert VolumeAnomalies(make_frame(), "Category").top(since="2025-02-21").empty
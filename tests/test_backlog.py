@@ -0,0 +1,26 @@
+import pandas as pd
+from itautomationreports.backlog import backlog_series, limit_groups
+
+def test_backlog_series_counts_open_tickets():
+    df = pd.DataFrame({
+        "Request time": pd.to_datetime(["2025-01-01 09:00", "2025-01-02 10:00", "2025-01-02 11:00"]),
+        "Close time": pd.to_datetime(["2025-01-03 08:00", None, "2025-01-02 15:00"]),
+    })
+    backlog = backlog_series(df, freq="Daily")
+    assert list(backlog["Open Tickets"]) == [1, 2, 1]
+
+def test_backlog_series_breakdown():
+    df = pd.DataFrame({
+        "Request time": pd.to_datetime(["2025-01-01", "2025-01-01", "2025-01-02"]),
+        "Close time": pd.to_datetime(["2025-01-02", None, None]),
+        "Priority": ["High", "Low", None],
+    })
+    backlog = backlog_series(df, freq="Daily", by="Priority")
+    assert set(backlog.columns) == {"High", "Low", "Unassigned"}
+    assert backlog.sum(axis=1).tolist() == [2, 2]
+
+def test_limit_groups_merges_a_real_other_group():
+    backlog = pd.DataFrame({"A": [5, 1], "Other": [4, 4], "B": [1, 2], "C": [0, 3]})
+    limited = limit_groups(backlog, top_n=2)
+    assert list(limited.columns) == ["A", "Other"]
+    assert limited["Other"].tolist() == [5, 9]
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.business_calendar import BusinessCalendar, business_durations
+
+CALENDAR = BusinessCalendar.from_settings("09:00-17:00", "Mon Tue Wed Thu Fri", "2025-01-01")
+
+def test_business_seconds_skip_nights_weekends_and_holidays():
+    start = pd.to_datetime(["2024-12-31 16:00", "2025-01-03 16:30", "2025-01-04 10:00", "2025-01-06 07:00", None])
+    end = pd.to_datetime(["2025-01-02 10:00", "2025-01-06 09:30", "2025-01-05 23:00", "2025-01-06 20:00", "2025-01-06 12:00"])
+    hours = CALENDAR.business_seconds(start, end) / 3600
+    assert hours[:4].tolist() == [2.0, 1.0, 0.0, 8.0]
+    assert np.isnan(hours[4])
+
+def test_business_durations_and_due_delta():
+    df = pd.DataFrame({
+        "Request time": pd.to_datetime(["2025-01-06 09:00", "2025-01-06 09:00"]),
+        "Close time": pd.to_datetime(["2025-01-07 18:00", None]),
+        "Due Date": pd.to_datetime(["2025-01-07 17:00", "2025-01-07 17:00"]),
+    })
+    durations = business_durations(df, CALENDAR, now="2025-01-08 13:00")
+    assert durations["Business Response Time"].iloc[0] == 16 * 60
+    assert np.isnan(durations["Business Response Time"].iloc[1])
+    assert durations["Business Ticket Aging"].tolist() == [2.0, 2.5]
+    assert durations["Business Due Delta"].iloc[0] == 0  # Closed after hours on the due day
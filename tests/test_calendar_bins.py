@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.calendar_bins import CalendarBins, calendar_fields
+from itautomationreports.resample import to_int64
+
+def test_calendar_fields_match_pandas():
+    times = pd.Series(pd.date_range("2020-12-25", "2026-01-10", freq="37h"))
+    fields = calendar_fields(to_int64(times))
+    assert np.array_equal(fields["hour"], times.dt.hour)
+    assert np.array_equal(fields["weekday"], times.dt.weekday)
+    assert np.array_equal(fields["day_of_month"] + 1, times.dt.day)
+    assert np.array_equal(fields["week_of_year"] + 1, times.dt.isocalendar().week.astype(int))
+
+def test_matrices_for_every_metric():
+    df = pd.DataFrame({
+        "Request time": pd.to_datetime(["2025-01-06 09:15", "2025-01-13 09:45", "2025-01-07 14:00", None]),
+        "SLA": ["Met", "Fail", np.nan, "Fail"],
+        "Response Time": [60.0, 180.0, np.nan, 30.0],
+    })
+    calendar = CalendarBins(df)
+    counts = calendar.matrix("Weekday × Hour")
+    assert counts.loc["Monday", 9] == 2 and counts.loc["Tuesday", 14] == 1 and counts.to_numpy().sum() == 3
+    assert calendar.matrix("Weekday × Hour", "SLA Breach Rate (%)").loc["Monday", 9] == 50
+    assert np.isnan(calendar.matrix("Weekday × Hour", "SLA Breach Rate (%)").loc["Tuesday", 14])
+    assert calendar.matrix("Weekday × Hour", "Mean Resolution (Hours)").loc["Monday", 9] == 2
+    assert calendar.matrix("Week of Year × Weekday").loc[3, "Monday"] == 1
+
+def test_mean_resolution_skips_open_tickets():
+    df = pd.DataFrame({
+        "Request time": pd.to_datetime(["2025-01-06 09:15", "2025-01-06 09:30"]),
+        "Close time": pd.to_datetime(["2025-01-06 13:15", None]),
+        "Response Time": [240.0, 0.0],  # clean_data fills open tickets with 0
+    })
+    assert CalendarBins(df).matrix("Weekday × Hour", "Mean Resolution (Hours)").loc["Monday", 9] == 4
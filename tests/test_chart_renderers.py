@@ -0,0 +1,23 @@
+import pandas as pd
+import numpy as np
+from itautomationreports.chart_renderers import ChartSpec, draw_chart, recorded_charts
+from itautomationreports.figures import get_figure_pool
+from itautomationreports.visualization import plot_ticket_trends
+
+def make_frame():
+    requested = pd.Timestamp("2025-01-01") + pd.to_timedelta(np.arange(0, 90 * 86_400, 7_200), unit="s")
+    return pd.DataFrame({"Request time": requested})
+
+def test_chart_functions_produce_specs_of_aggregates():
+    with recorded_charts() as specs:
+        plot_ticket_trends(make_frame(), granularity="Month")
+    assert [spec.chart for spec in specs] == ["ticket_trends"]
+    assert list(specs[0].data["counts"]) == [372, 336, 372] and specs[0].data["labels"][0] == "2025-01"
+
+def test_draw_chart_uses_the_registered_renderer():
+    spec = ChartSpec("priority_vs_resolution_time", (3, 2), {"avg_resolution_time": pd.Series([30.0, 90.0], index=["High", "Low"])})
+    fig = draw_chart(spec)
+    try:
+        assert fig.axes[0].get_title()
+    finally:
+        get_figure_pool().release(fig)
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.comparision import build_comparison_frame, comparison_summary
+
+def make_report(resolutions, sla):
+    return pd.DataFrame({
+        "ticket": range(len(resolutions)),
+        "resolution_time": resolutions,
+        "sla": sla,
+    })
+
+def test_comparison_summary_matches_per_report_metrics():
+    reports = {
+        "week1.xlsx": make_report([10.0, 20.0, 30.0, np.nan], ["Met", "Fail", "Met", None]),
+        "week2.xlsx": make_report([2000.0, 50000.0], ["Met", "Met"]),
+        "empty.xlsx": make_report([], []),
+    }
+    long_df = build_comparison_frame(reports)
+    assert list(long_df["Report"].cat.categories) == list(reports)
+
+    summary = comparison_summary(long_df)
+    assert summary["Total Requests"].tolist() == [4, 2, 0]
+    assert summary.loc["week1.xlsx", "P50 Resolution (Min)"] == 20.0
+    assert summary.loc["week1.xlsx", "P25 Resolution (Min)"] == np.percentile([10, 20, 30], 25)
+    assert np.isnan(summary.loc["empty.xlsx", "P50 Resolution (Min)"])
+    assert round(summary.loc["week1.xlsx", "SLA Met (%)"], 1) == 66.7
+    assert summary.loc["week1.xlsx", ["0-1 Days", "Open"]].tolist() == [3, 1]
+    assert summary.loc["week2.xlsx", ["1-7 Days", "30+ Days"]].tolist() == [1, 1]
@@ -0,0 +1,34 @@
+import io
+import pandas as pd
+from itautomationreports.dataset_cache import DatasetCache, frame_nbytes, load_cached_dataset
+
+def make_upload(name, data):
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    return buffer
+
+def test_dataset_cache_evicts_least_recently_used():
+    frame = pd.DataFrame({"x": range(1000)})
+    cache = DatasetCache(budget_bytes=frame_nbytes(frame) * 2)
+    cache.put("a", frame, ["a.xlsx"])
+    cache.put("b", frame, ["b.xlsx"])
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", frame, ["c.xlsx"])
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.evictions == 1
+
+def test_load_cached_dataset_shares_one_parse():
+    calls = []
+
+    def loader(files):
+        calls.append(files)
+        return pd.DataFrame({"Ticket": [1, 2]}), [f.name for f in files]
+
+    cache = DatasetCache()
+    first, names = load_cached_dataset([make_upload("a.xlsx", b"data")], loader, cache=cache)
+    first["Extra"] = 1  # Session-local column must not leak into the shared frame
+    second, _ = load_cached_dataset([make_upload("a.xlsx", b"data")], loader, cache=cache)
+
+    assert len(calls) == 1
+    assert names == ["a.xlsx"]
+    assert "Extra" not in second.columns
@@ -0,0 +1,24 @@
+import numpy as np
+from itautomationreports.decimation import minmax_decimate, ticket_axis
+
+def test_minmax_decimate_keeps_extremes_per_bin_and_group():
+    rng = np.random.default_rng(0)
+    x = np.arange(100_000, dtype=float)
+    y = rng.normal(100, 10, len(x))
+    y[12_345] = 10_000  # Spike must survive
+    groups = (x % 2).astype(int)
+    kept = minmax_decimate(x, y, n_bins=500, groups=groups)
+    assert len(kept) <= 2 * 500 * 2
+    assert 12_345 in kept
+    assert y[groups == 0].argmin() * 2 in kept
+
+def test_minmax_decimate_respects_range():
+    x = np.arange(1_000, dtype=float)
+    kept = minmax_decimate(x, x[::-1], n_bins=10, x_range=(100, 199))
+    assert kept.min() >= 100 and kept.max() <= 199
+    assert len(kept) == 20
+
+def test_ticket_axis_uses_digits_of_ticket_ids():
+    assert ticket_axis(["REQ0042", "REQ0007"]).tolist() == [42.0, 7.0]
+    assert ticket_axis([5, 3]).tolist() == [5.0, 3.0]
+    assert ticket_axis(["b", "a"]).tolist() == [1.0, 0.0]
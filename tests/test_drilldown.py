@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.drilldown import DrillDownIndex
+
+def make_frame():
+    return pd.DataFrame({
+        "Ticket": [10, 11, 12, 13, 14],
+        "Request time": pd.to_datetime(["2025-01-06 09:15", "2025-01-07 14:00", None, "2025-01-13 09:45", "2025-01-06 10:00"]),
+        "Priority": ["High", "Low", "High", None, "High"],
+    }, index=[100, 101, 102, 103, 104])
+
+def test_segment_positions_match_masks():
+    df = make_frame()
+    index = DrillDownIndex(df)
+    segments = index.segments("Priority")
+    assert segments.to_dict() == {"High": 3, "Low": 1, "Unassigned": 1}
+    assert list(index.tickets(index.positions("Priority", "High"))["Ticket"]) == [10, 12, 14]
+    assert list(index.tickets(index.positions("Priority", "Unassigned"))["Ticket"]) == [13]
+    assert len(index.positions("Priority", "Medium")) == 0
+
+def test_heatmap_cell_positions():
+    index = DrillDownIndex(make_frame())
+    assert np.array_equal(index.cell_positions("Weekday × Hour", "Monday", 9), [0, 3])
+    assert np.array_equal(index.cell_positions("Week of Year × Weekday", 2, "Monday"), [0, 4])
+    assert len(index.cell_positions("Weekday × Hour", "Sunday", 0)) == 0
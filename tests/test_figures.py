@@ -0,0 +1,43 @@
+import gc
+
+import matplotlib.figure
+import matplotlib.pyplot as plt
+from itautomationreports.figures import FigurePool, get_figure_pool, new_figure, show_figure
+
+def live_figures():
+    gc.collect()
+    return sum(isinstance(obj, matplotlib.figure.Figure) for obj in gc.get_objects())
+
+def test_released_figures_are_cleared_and_reused():
+    pool = FigurePool(per_chart=1)
+    fig, ax = pool.acquire("trends", (4, 3))
+    ax.bar(["a", "b"], [1, 2])
+    ax.twinx()
+    fig.subplots_adjust(bottom=0.4)
+    pool.release(fig)
+    again, ax = pool.acquire("trends", (6, 2))
+    assert again is fig and len(fig.axes) == 1 and not ax.patches
+    assert tuple(fig.get_size_inches()) == (6, 2)
+    assert fig.subplotpars.bottom == matplotlib.rcParams["figure.subplot.bottom"]
+    assert pool.created == 1 and pool.reused == 1
+
+def test_soak_keeps_figure_count_flat():
+    pool = FigurePool(per_chart=2)
+    for _ in range(20):
+        fig, ax = pool.acquire("soak", (2, 2))
+        pool.release(fig)
+    baseline = live_figures()
+    for i in range(60):
+        figs = [pool.acquire("soak", (2, 2)) for _ in range(1 + i % 3)]  # Concurrent renders of one chart
+        for fig, ax in figs:
+            ax.plot([0, 1], [i, i + 1])
+            pool.release(fig)
+    del figs, fig, ax
+    assert live_figures() <= baseline + 1
+    assert pool.idle_count() == 2 and plt.get_fignums() == []
+
+def test_show_figure_returns_the_figure_to_the_pool():
+    fig, ax = new_figure("show_figure_test", figsize=(2, 2))
+    ax.plot([0, 1], [0, 1])
+    show_figure(fig)  # Streamlit bare mode: renders and discards
+    assert not fig.axes and get_figure_pool().acquire("show_figure_test", (2, 2))[0] is fig
@@ -0,0 +1,64 @@
+import pandas as pd
+from itautomationreports.dataset_cache import DatasetCache
+from itautomationreports.ingest import WatchFolderIngestor
+
+def write_export(path, n):
+    data = pd.DataFrame({
+        "#": range(1, n + 1),
+        "Request Date": pd.date_range("2025-01-01", periods=n, freq="h"),
+        "Resolved Time": pd.date_range("2025-01-01 02:00", periods=n, freq="h"),
+        "Category": ["Access", "Hardware"] * (n // 2),
+        "Priority": ["High", "Low"] * (n // 2),
+    })
+    with pd.ExcelWriter(path) as writer:
+        data.to_excel(writer, sheet_name="Data", index=False)
+
+def test_new_and_changed_exports_are_ingested_once(tmp_path):
+    write_export(tmp_path / "nightly.xlsx", 4)
+    cache = DatasetCache()
+    ingestor = WatchFolderIngestor(str(tmp_path), cache=cache, settle_seconds=0)
+
+    first = ingestor.poll_once()
+    assert [entry.file_name for entry in first] == ["nightly.xlsx"]
+    assert first[0].key in cache
+    assert ingestor.poll_once() == []  # Unchanged file is not parsed again
+
+    df, names = ingestor.open(first[0])
+    assert names == ["nightly.xlsx"] and len(df) == 4
+
+    write_export(tmp_path / "nightly.xlsx", 6)
+    second = ingestor.poll_once()
+    assert second[0].rows == 6 and first[0].key not in cache
+    assert not (tmp_path / ".snapshots" / first[0].snapshot).exists()
+
+def test_snapshot_is_read_when_not_cached(tmp_path):
+    write_export(tmp_path / "nightly.xlsx", 4)
+    WatchFolderIngestor(str(tmp_path), cache=DatasetCache(), settle_seconds=0).poll_once()
+
+    restarted = WatchFolderIngestor(str(tmp_path), cache=DatasetCache(), settle_seconds=0)
+    entry, = restarted.datasets()
+    df, _ = restarted.open(entry)
+    assert len(df) == 4
+    assert df["Request time"].dtype.kind == "M"
+    assert df["Response Time"].tolist() == [120.0] * 4
+
+def test_cached_and_restarted_snapshots_serve_the_same_frame(tmp_path):
+    write_export(tmp_path / "nightly.xlsx", 4)
+    data = pd.read_excel(tmp_path / "nightly.xlsx")
+    data["#"] = pd.Series([1001, "REQ-7", 20, "REQ-9"], dtype=object)  # Mixed numeric and text IDs
+    data.to_excel(tmp_path / "nightly.xlsx", sheet_name="Data", index=False)
+
+    ingestor = WatchFolderIngestor(str(tmp_path), cache=DatasetCache(), settle_seconds=0)
+    entry, = ingestor.poll_once()
+    warmed, _ = ingestor.open(entry)
+    restarted, _ = WatchFolderIngestor(str(tmp_path), cache=DatasetCache(), settle_seconds=0).open(entry)
+    pd.testing.assert_frame_equal(restarted, warmed, check_dtype=False)
+
+def test_failed_exports_are_skipped_until_they_change(tmp_path):
+    (tmp_path / "broken.xlsx").write_bytes(b"not a workbook")
+    ingestor = WatchFolderIngestor(str(tmp_path), cache=DatasetCache(), settle_seconds=0)
+    assert ingestor.poll_once() == []
+    assert ingestor.pending() == []  # Not re-read on every poll
+
+    write_export(tmp_path / "broken.xlsx", 4)
+    assert [entry.rows for entry in ingestor.poll_once()] == [4]
@@ -0,0 +1,24 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from itautomationreports.lazy import lazy_import
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+def test_lazy_import_loads_on_first_attribute():
+    json_module = lazy_import("json")
+    assert "not loaded" in repr(json_module)
+    assert json_module.dumps([1]) == "[1]"
+    assert repr(json_module).endswith("(loaded)>")
+
+def test_visualization_import_does_not_load_plotting_stack():
+    code = (
+        "import sys, itautomationreports.visualization, itautomationreports.comparision; "
+        "print([m for m in ('matplotlib.pyplot', 'seaborn', 'plotly.express') if m in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={"PYTHONPATH": str(SRC)},
+    ).stdout.strip().splitlines()[-1]
+    assert output == "[]"
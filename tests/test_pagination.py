@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.pagination import TicketPager, page_count
+
+def make_frame():
+    return pd.DataFrame({
+        "Ticket": [5, "REQ-2", 3, 1, 4],
+        "Priority": ["P2", None, "P1", "P2", "P3"],
+        "Close time": [pd.NaT, pd.Timestamp("2025-01-02"), pd.NaT, pd.NaT, pd.Timestamp("2025-01-03")],
+        "Ticket Aging": [45, 2, 95, 10, 1],
+    })
+
+def test_sort_order_matches_pandas():
+    df = make_frame()
+    pager = TicketPager(df)
+    for ascending in (True, False):
+        expected = df.reset_index(drop=True).sort_values("Priority", ascending=ascending, kind="stable", na_position="last").index
+        assert list(pager.order("Priority", ascending)) == list(expected)
+    assert pager.order("Priority") is pager.order("Priority")  # Cached
+    assert len(pager.order("Ticket")) == 5  # Mixed IDs sort as text
+
+def test_aging_views_keep_the_sort():
+    pager = TicketPager(make_frame())
+    assert list(pager.rows("Ticket Aging", False, "Open tickets")) == [2, 0, 3]
+    assert list(pager.rows("Ticket Aging", False, "Open > 30 days")) == [2, 0]
+
+def test_page_projection():
+    pager = TicketPager(make_frame())
+    rows = pager.rows("Ticket Aging", True)
+    page = pager.page(rows, 1, 2, ["Ticket", "Ticket Aging", "Missing"])
+    assert list(page.columns) == ["Ticket", "Ticket Aging"] and list(page["Ticket Aging"]) == [10, 45]
+    assert page_count(0, 50) == 1 and page_count(101, 50) == 3
@@ -0,0 +1,61 @@
+import pandas as pd
+from io import BytesIO
+from itautomationreports.data_loader import read_sheet
+from itautomationreports.readers import (
+    READER_BACKENDS, candidate_backends, file_extension, normalize_timestamps, open_workbook)
+from itautomationreports.schema_registry import get_schema_registry
+
+def make_export():
+    data = pd.DataFrame({
+        "#": [1, 2, 3, 4],
+        "Request Date": [pd.Timestamp(2025, 1, 1, 8, 0, 0, 666700), pd.Timestamp(2025, 1, 2), pd.Timestamp(2025, 1, 3, 17, 30), pd.NaT],
+        "Category": ["Access", None, "Network", "Email"],
+        "Priority": ["High", "Low", "High", "Low"],
+    })
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        pd.DataFrame([["Exported report"]]).to_excel(writer, sheet_name="Data", header=False, index=False)
+        data.to_excel(writer, sheet_name="Data", startrow=2, index=False)
+    return buffer.getvalue()
+
+def xlsx_backends():
+    return [name for name, backend in READER_BACKENDS.items() if ".xlsx" in backend.extensions and backend.available()]
+
+def test_backends_return_identical_frames():
+    data = make_export()
+    frames = []
+    for name in xlsx_backends():
+        get_schema_registry().clear()
+        learned = read_sheet(open_workbook(BytesIO(data), backend=name), "Data")
+        projected = read_sheet(open_workbook(BytesIO(data), backend=name), "Data")  # Known layout
+        pd.testing.assert_frame_equal(learned, projected)
+        frames.append(learned)
+
+    assert len(frames) >= 2
+    for frame in frames[1:]:
+        pd.testing.assert_frame_equal(frames[0], frame)
+    assert frames[0].loc[0, "Request time"] == pd.Timestamp("2025-01-01 08:00:01")
+
+def test_backend_is_picked_from_file_contents():
+    upload = BytesIO(make_export())
+    upload.name = "export.xls"  # Misnamed upload: the bytes say .xlsx
+    assert file_extension(upload) == ".xlsx"
+    assert upload.tell() == 0
+
+    names = [backend.name for backend in candidate_backends(upload)]
+    assert names[0] == xlsx_backends()[0]
+    assert [backend.name for backend in candidate_backends(upload, forced="openpyxl")][0] == "openpyxl"
+
+def test_mixed_columns_round_only_timestamp_cells():
+    df = pd.DataFrame({"Closed": pd.Series(
+        [pd.Timestamp(2025, 1, 1, 8, 0, 0, 666700).to_pydatetime(), "N/A", "Pending", None], dtype=object)})
+    values = normalize_timestamps(df)["Closed"].tolist()
+    assert values[0] == pd.Timestamp("2025-01-01 08:00:01")
+    assert values[1:3] == ["N/A", "Pending"] and values[3] is None
+
+def test_mixed_columns_keep_numbers_and_digit_strings():
+    cells = [pd.Timestamp(2025, 1, 1, 8, 0, 0, 666700).to_pydatetime(), 2024, 20250101, "2024", "20250101"]
+    values = normalize_timestamps(pd.DataFrame({"Ref": pd.Series(cells, dtype=object)}))["Ref"].tolist()
+    assert values[0] == pd.Timestamp("2025-01-01 08:00:01")
+    assert values[1:] == [2024, 20250101, "2024", "20250101"]
+    assert [type(value) for value in values[1:]] == [int, int, str, str]
@@ -0,0 +1,26 @@
+import pandas as pd
+from itautomationreports.reopen import detect_reopens, reopen_chains, reopen_rates
+
+def sample_tickets():
+    return pd.DataFrame({
+        "Ticket": [1, 2, 3, 4],
+        "Request user": ["ann", "Ann ", "ann", "bob"],
+        "Category": ["Network"] * 4,
+        "Sub-Category": ["VPN"] * 4,
+        "Title": ["VPN down"] * 4,
+        "Request time": pd.to_datetime(["2025-01-01", "2025-01-05", "2025-03-01", "2025-01-02"]),
+        "Close time": pd.to_datetime(["2025-01-03", "2025-01-06", None, "2025-01-03"]),
+    })
+
+def test_detect_reopens_links_within_window():
+    reopens = detect_reopens(sample_tickets(), window_days=7)
+    assert reopens["Reopened"].tolist() == [False, True, False, False]
+    assert reopens["Reopen Chain"][0] == reopens["Reopen Chain"][1]
+    assert reopens["Chain Position"].tolist() == [0, 1, 0, 0]
+
+def test_reopen_chains_and_rates():
+    reopens = detect_reopens(sample_tickets(), window_days=90)
+    chains = reopen_chains(reopens)
+    assert chains["Tickets"].tolist() == [3]
+    rates = reopen_rates(reopens, "Category")
+    assert rates["Reopened"].tolist() == [2]
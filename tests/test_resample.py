@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.resample import TimeSeriesIndex, bin_codes, bin_labels, bin_starts, to_int64
+
+def test_bins_match_pandas_periods():
+    times = pd.Series(pd.date_range("2024-12-28", "2025-04-03", freq="7h"))
+    ns = to_int64(times)
+    for granularity, freq in (("Day", "D"), ("Week", "W-SUN"), ("Month", "M"), ("Quarter", "Q")):
+        starts = bin_starts(bin_codes(ns, granularity), granularity)
+        expected = times.dt.to_period(freq).dt.start_time
+        assert (starts == pd.DatetimeIndex(expected)).all(), granularity
+
+def test_counts_fill_gaps_and_skip_missing():
+    index = TimeSeriesIndex(pd.to_datetime(["2025-03-02", None, "2025-01-15", "2025-01-20"]))
+    counts = index.counts("Month")
+    assert counts.tolist() == [2, 0, 1]
+    assert bin_labels(counts.index, "Month").tolist() == ["2025-01", "2025-02", "2025-03"]
+    assert bin_labels(index.counts("Quarter").index, "Quarter") == ["2025Q1"]
+
+def test_aggregate_mean_ignores_nan():
+    index = TimeSeriesIndex(pd.to_datetime(["2025-01-02", "2025-01-01", "2025-01-01", "2025-01-03"]))
+    means = index.aggregate(np.array([10.0, 2.0, 4.0, np.nan]), "Day")
+    assert means.iloc[:2].tolist() == [3.0, 10.0]
+    assert np.isnan(means.iloc[2])
@@ -0,0 +1,32 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itautomationreports.scheduler import BackgroundScheduler
+
+def test_scheduler_returns_background_result():
+    scheduler = BackgroundScheduler(ThreadPoolExecutor(max_workers=1))
+    scheduler.schedule("filters-a", {"total": (sum, [1, 2, 3])})
+    assert scheduler.result("total", lambda: -1) == 6
+    assert scheduler.is_ready("total")
+
+def test_scheduler_cancels_stale_jobs():
+    release = threading.Event()
+    scheduler = BackgroundScheduler(ThreadPoolExecutor(max_workers=1))
+    scheduler.schedule("filters-a", {"blocker": (release.wait,), "stale": (sum, [1])})
+    scheduler.schedule("filters-b", {"fresh": (sum, [2])})
+    release.set()
+
+    assert scheduler.generation == "filters-b"
+    assert not scheduler.is_ready("stale")
+    assert scheduler.result("stale", lambda: "inline") == "inline"
+    assert scheduler.result("fresh", sum, [2]) == 2
+
+def test_inline_result_of_cancelled_job_is_kept():
+    release = threading.Event()
+    scheduler = BackgroundScheduler(ThreadPoolExecutor(max_workers=1))
+    calls = []
+    scheduler.schedule("filters-a", {"blocker": (release.wait,), "total": (lambda: calls.append(1) or len(calls),)})
+
+    assert scheduler.result("total", lambda: calls.append(1) or len(calls)) == 1  # Pending: cancelled, computed inline
+    release.set()
+    assert scheduler.result("total", lambda: -1) == 1
+    assert scheduler.is_ready("total") and calls == [1]
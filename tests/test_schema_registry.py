@@ -0,0 +1,31 @@
+import pandas as pd
+from io import BytesIO
+from itautomationreports.data_loader import read_sheet
+from itautomationreports.schema_registry import get_schema_registry
+
+def make_export(n):
+    data = pd.DataFrame({
+        "#": range(1, n + 1),
+        "Request Date": pd.date_range("2025-01-01", periods=n, freq="h"),
+        "Internal Notes": ["x"] * n,
+        "Priority": ["High", "Low"] * (n // 2),
+    })
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        pd.DataFrame([["Exported report"]]).to_excel(writer, sheet_name="Data", header=False, index=False)
+        data.to_excel(writer, sheet_name="Data", startrow=2, index=False)
+    buffer.seek(0)
+    return pd.ExcelFile(buffer)
+
+def test_known_layout_is_read_projected():
+    registry = get_schema_registry()
+    registry.clear()
+
+    first = read_sheet(make_export(4), "Data")
+    assert len(registry) == 1
+    assert list(first.columns) == ["Ticket", "Request time", "Priority"]
+
+    second = read_sheet(make_export(6), "Data")
+    entry = next(iter(registry._entries.values()))
+    assert entry.hits == 1 and entry.usecols == [0, 1, 3]
+    pd.testing.assert_frame_equal(second.head(4), first)
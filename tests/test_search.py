@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.search import SearchIndex, parse_query
+
+def make_frame():
+    return pd.DataFrame({
+        "Title": ["VPN not working", "Outlook crash", None, "vpn drops on srv-0142.corp", "Outlook slow", "VPN not working"],
+        "Description": [None, "Outlook crashes on srv-0142", "Printer jam", None, None, "since Monday"],
+    })
+
+def test_parse_query():
+    assert parse_query("VPN  outlook*") == [("vpn", False), ("outlook", True)]
+    assert parse_query("srv-01*") == [("srv", False), ("01", True)]
+    assert parse_query("  ") == []
+
+def test_and_and_prefix_queries_match_a_scan():
+    df = make_frame()
+    index = SearchIndex(df)
+    assert index.search("") is None
+    assert np.array_equal(index.search("vpn"), [0, 3, 5])
+    assert np.array_equal(index.search("outlook*"), [1, 4])
+    assert np.array_equal(index.search("crash*"), [1])
+    assert np.array_equal(index.search("srv-0142"), [1, 3])  # Title in one row, Description in the other
+    assert np.array_equal(index.search("vpn monday"), [5])  # Terms may match in different columns
+    assert len(index.search("vpn outlook")) == 0
+    assert len(index.search("zebra*")) == 0
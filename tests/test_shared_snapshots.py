@@ -0,0 +1,79 @@
+import os
+import numpy as np
+from io import BytesIO
+import pandas as pd
+from itautomationreports.dataset_cache import DatasetCache
+from itautomationreports.shared_snapshots import SharedSnapshotStore, load_shared_dataset
+from itautomationreports.sketches import SketchStore
+
+def make_frame(n=200):
+    rng = np.random.default_rng(0)
+    request = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 30 * 86_400, n), unit="s")
+    close = pd.Series(request + pd.to_timedelta(rng.exponential(86_400, n), unit="s"))
+    close[::7] = pd.NaT
+    return pd.DataFrame({
+        "Ticket": np.arange(n),
+        "Request time": request,
+        "Close time": close,
+        "Response Time": (close - request).dt.total_seconds().fillna(0).to_numpy() / 60,
+        "Priority": rng.choice(["High", "Low"], n),
+        "Category": rng.choice(["Access", "Network"], n),
+        "Source": "a.xlsx",
+    })
+
+def test_attached_snapshot_matches_the_published_dataset(tmp_path):
+    df = make_frame()
+    store = SharedSnapshotStore(str(tmp_path))
+    sketches = SketchStore(df)
+
+    assert store.publish("k1", df, ["a.xlsx"], sketches)
+    assert not store.publish("k1", df, ["a.xlsx"], sketches)  # Already published
+    assert store.published() == ["k1"]
+
+    attached, names, attached_sketches = store.attach("k1")
+    assert names == ["a.xlsx"]
+    pd.testing.assert_frame_equal(attached, df, check_dtype=False)
+    pd.testing.assert_frame_equal(attached_sketches.percentiles("Priority"), sketches.percentiles("Priority"))
+
+def test_second_process_attaches_instead_of_parsing(tmp_path):
+    calls = []
+
+    def loader(files):
+        calls.append(files)
+        return make_frame(), ["a.xlsx"]
+
+    upload = BytesIO(b"export")
+    upload.name = "a.xlsx"
+    load_shared_dataset([upload], loader, cache=DatasetCache(), store=SharedSnapshotStore(str(tmp_path)))
+    # A fresh cache stands in for another server process
+    df, _ = load_shared_dataset([upload], loader, cache=DatasetCache(), store=SharedSnapshotStore(str(tmp_path)))
+
+    assert len(calls) == 1
+    assert len(df) == 200 and df.attrs["dataset_fingerprint"]
+
+def test_publish_evicts_old_and_least_recently_used_snapshots(tmp_path):
+    df = make_frame(20)
+    store = SharedSnapshotStore(str(tmp_path), max_snapshots=0, max_age_hours=0)  # No eviction while seeding
+    for age_hours, key in [(48, "stale"), (3, "k1"), (2, "k2")]:
+        store.publish(key, df, ["a.xlsx"])
+        then = store.last_used(key) - age_hours * 3600
+        os.utime(os.path.join(store.path(key), "meta.json"), (then, then))
+
+    store.max_snapshots, store.max_age_hours = 2, 24
+    store.attach("k1")  # Now the most recently used
+    store.publish("k3", df, ["a.xlsx"])
+    assert store.published() == ["k1", "k3"]
+
+def test_parsing_and_attaching_processes_serve_the_same_frame(tmp_path):
+    def loader(files):
+        df = make_frame(3)
+        df["Ticket"] = pd.Series([1001, "REQ-7", 20], dtype=object)  # Mixed numeric and text IDs
+        return df, ["a.xlsx"]
+
+    upload = BytesIO(b"export")
+    upload.name = "a.xlsx"
+    parsed, _ = load_shared_dataset([upload], loader, cache=DatasetCache(), store=SharedSnapshotStore(str(tmp_path)))
+    attached, _ = load_shared_dataset([upload], loader, cache=DatasetCache(), store=SharedSnapshotStore(str(tmp_path)))
+
+    assert parsed["Ticket"].tolist() == attached["Ticket"].tolist() == ["1001", "REQ-7", "20"]
+    pd.testing.assert_frame_equal(attached, parsed, check_dtype=False)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.sketches import QuantileSketch, SketchStore
+
+def test_sketch_quantiles_within_relative_accuracy():
+    values = np.random.default_rng(0).lognormal(5, 1.5, 20_000)
+    estimates = QuantileSketch.from_values(values).quantile([0.5, 0.9, 0.99])
+    exact = np.quantile(values, [0.5, 0.9, 0.99], method="lower")
+    assert np.all(np.abs(estimates - exact) <= 0.01 * exact + 1e-9)
+
+def test_merge_matches_sketch_of_all_values():
+    rng = np.random.default_rng(1)
+    a, b = rng.exponential(60, 500), rng.exponential(600, 300)
+    merged = QuantileSketch.from_values(a).merge(QuantileSketch.from_values(b))
+    combined = QuantileSketch.from_values(np.concatenate([a, b]))
+    assert merged.count == 800
+    assert np.array_equal(merged.quantile([0.1, 0.5, 0.99]), combined.quantile([0.1, 0.5, 0.99]))
+
+def test_store_percentiles_follow_filters():
+    df = pd.DataFrame({
+        "Response Time": [10.0, 20.0, 30.0, 1000.0, np.nan, 0.0],
+        "Priority": ["High", "High", "Low", "Low", "Low", None],
+        "Source": ["a.xlsx", "a.xlsx", "a.xlsx", "b.xlsx", "b.xlsx", "a.xlsx"],
+        "Request time": pd.to_datetime(["2025-01-01", "2025-01-05", "2025-01-05", "2025-01-06", "2025-01-06", "2025-01-07"]),
+    })
+    store = SketchStore(df)
+    table = store.percentiles("Priority")
+    assert table["Count"].to_dict() == {"High": 2, "Low": 2, "Unassigned": 1}
+    assert table.loc["Unassigned", "P50"] == 0
+
+    only_a = store.percentiles("Priority", sources=["a.xlsx"], since=pd.Timestamp("2025-01-03 12:00"))
+    assert only_a["Count"].to_dict() == {"High": 1, "Low": 1, "Unassigned": 1}
+    assert abs(only_a.loc["Low", "P99"] - 30) <= 0.3
+
+def test_store_skips_open_tickets():
+    df = pd.DataFrame({
+        "Response Time": [10.0, 20.0, 0.0, 0.0],  # clean_data fills open tickets with 0
+        "Priority": ["High", "High", "High", "Low"],
+        "Close time": pd.to_datetime(["2025-01-02", "2025-01-03", None, None]),
+        "Request time": pd.to_datetime(["2025-01-01"] * 4),
+    })
+    table = SketchStore(df).percentiles("Priority")
+    assert table["Count"].to_dict() == {"High": 2}
+    assert abs(table.loc["High", "P50"] - 10) <= 0.1
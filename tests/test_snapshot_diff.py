@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.snapshot_diff import SnapshotChain, SnapshotDiff, canonical_ticket_ids
+
+def make_snapshots():
+    old = pd.DataFrame({
+        "ticket": [1042.0, "REQ-7", 3, 4, 5],
+        "status": ["Open", "Open", "Open", "Pending", "Open"],
+        "priority": ["P2", "P3", "P3", "P1", "P4"],
+        "close_time": [pd.NaT, pd.NaT, pd.NaT, pd.NaT, pd.NaT],
+    })
+    new = pd.DataFrame({
+        "ticket": [" 1042", "req-7", 3, 4, 6],
+        "status": ["Open", "Closed", "Open", "In Progress", "Open"],
+        "priority": ["P2", "P3", "P3", "P1", "P2"],
+        "close_time": [pd.NaT, pd.Timestamp("2025-03-01 10:00"), pd.NaT, pd.NaT, pd.NaT],
+    })
+    return old, new
+
+def test_canonical_ticket_ids():
+    ids = canonical_ticket_ids([1042.0, " 1042", "req-7", np.nan, "10.5"])
+    assert list(ids) == ["1042", "1042", "REQ-7", "", "10.5"]
+
+def test_diff_classes():
+    diff = SnapshotDiff(*make_snapshots())
+    assert diff.summary().to_dict() == {"New": 1, "Closed": 1, "Changed": 1, "Unchanged": 2, "Removed": 1}
+    changed = diff.details("Changed")
+    assert changed.loc[0, "ticket"] == 4 and changed.loc[0, "Changed Fields"] == "status"
+    assert changed.loc[0, "status (before)"] == "Pending" and changed.loc[0, "status (after)"] == "In Progress"
+    assert diff.details("Removed").loc[0, "status (after)"] is None
+
+def test_field_changes_and_transitions():
+    diff = SnapshotDiff(*make_snapshots())
+    assert diff.field_changes().to_dict() == {"status": 2, "close_time": 1, "priority": 0}
+    transitions = diff.transitions("status")
+    assert set(zip(transitions["From"], transitions["To"])) == {("Open", "Closed"), ("Pending", "In Progress")}
+
+def test_chain_counts_every_step():
+    old, new = make_snapshots()
+    newest = new.assign(status=["Closed", "Closed", "Open", "In Progress", "Open"])
+    chain = SnapshotChain({"w1": old, "w2": new, "w3": newest})
+    assert chain.steps == ["w1 → w2", "w2 → w3"]
+
+    summary = chain.summary()
+    assert summary.loc["w1 → w2"].to_dict() == {"New": 1, "Closed": 1, "Changed": 1, "Unchanged": 2, "Removed": 1}
+    assert summary.loc["w2 → w3"].to_dict() == {"New": 0, "Closed": 0, "Changed": 1, "Unchanged": 4, "Removed": 0}
+    assert chain.field_changes()["status"].tolist() == [2, 1]
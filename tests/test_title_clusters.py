@@ -0,0 +1,27 @@
+import pandas as pd
+from itautomationreports.title_clusters import cluster_titles, normalize_titles
+
+def test_normalize_titles():
+    titles = pd.Series(["VPN  not working!", None])
+    assert normalize_titles(titles).tolist() == ["vpn not working", ""]
+
+def test_cluster_titles_groups_near_duplicates():
+    titles = pd.Series([
+        "VPN not working", "VPN not working", "vpn not working!",
+        "Password reset", "password reset request", "Printer jammed",
+    ])
+    clusters = cluster_titles(titles)
+    assert clusters.iloc[:3].tolist() == ["VPN not working"] * 3
+    assert clusters.iloc[3] == clusters.iloc[4]
+    assert clusters.iloc[5] == "Printer jammed"
+
+def test_negated_titles_stay_apart():
+    titles = pd.Series([
+        "Outlook can send email", "Outlook cannot send email", "Outlook can't send email",
+        "Printer working on floor 3", "Printer not working on floor 3", "Printer not working on floor 3!",
+    ])
+    clusters = cluster_titles(titles)
+    assert clusters.iloc[0] == "Outlook can send email"
+    assert clusters.iloc[1] != clusters.iloc[0] and clusters.iloc[2] != clusters.iloc[0]
+    assert clusters.iloc[3] == "Printer working on floor 3"
+    assert clusters.iloc[4] == clusters.iloc[5] == "Printer not working on floor 3"
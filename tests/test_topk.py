@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from itautomationreports.topk import TopKRanker, select_top_k
+
+def test_select_top_k_orders_largest_first():
+    counts = np.array([5, 1, 9, 3, 9])
+    assert select_top_k(counts, 3).tolist() == [2, 4, 0]
+    assert select_top_k(counts, 10).tolist() == [2, 4, 0, 3, 1]
+
+def test_top_k_with_other_bucket_and_per_source():
+    df = pd.DataFrame({
+        "Category": ["A", "A", "A", "B", "B", "C", None],
+        "Source": ["x", "x", "y", "y", "y", "x", "x"],
+    })
+    ranker = TopKRanker(df)
+    top = ranker.top_k("Category", 2, other=True)
+    assert top.to_dict() == {"A": 3, "B": 2, "Other": 1}
+
+    per_source = ranker.top_k_per("Category", 1, per="Source", other=True)
+    assert per_source.values.tolist() == [["x", "A", 2], ["x", "Other", 1], ["y", "B", 2], ["y", "Other", 1]]
+
+def test_other_bucket_merges_a_real_other_label():
+    df = pd.DataFrame({
+        "Category": ["Other", "Other", "Other", "A", "A", "B", "C"],
+        "Source": ["x", "x", "x", "x", "x", "x", "x"],
+    })
+    ranker = TopKRanker(df)
+    assert ranker.top_k("Category", 2, other=True).to_dict() == {"Other": 5, "A": 2}
+
+    per_source = ranker.top_k_per("Category", 2, per="Source", other=True)
+    assert per_source.values.tolist() == [["x", "Other", 5], ["x", "A", 2]]